@@ -0,0 +1,55 @@
+"""
+Memory benchmark for the grade layouts.
+
+Compares the resident size of N grades stored as:
+    1. plain objects with a per-instance __dict__ (the layout Grade used before __slots__),
+    2. the current __slots__-based Grade,
+    3. the columnar GradeTable.
+
+Usage:
+    python -m benchmarks.bench_memory [N]
+"""
+
+import sys
+import tracemalloc
+from src.grade import Grade
+from src.grade_table import GradeTable
+
+class DictGrade:
+    """Grade layout with a per-instance __dict__, for comparison."""
+
+    def __init__(self, student_id, course_code, grade, semester):
+        self.student_id = student_id
+        self.course_code = course_code
+        self.grade = grade.upper()
+        self.semester = semester
+
+def make_rows(n):
+    """Generates n synthetic grade rows as fresh strings, the way a CSV reader produces them."""
+    for i in range(n):
+        yield (f"{i % 40000:06d}", f"CSC{i % 300:03d}", "ABCDEF"[i % 6], f"20{20 + i % 5}/20{21 + i % 5} Semester {i % 2 + 1}")
+
+def measure(build, n):
+    """Returns the bytes allocated by build(rows) and still held afterwards."""
+    tracemalloc.start()
+    result = build(make_rows(n))
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return current
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+    layouts = [
+        ("dict objects", lambda rows: [DictGrade(*row) for row in rows]),
+        ("__slots__ Grade", lambda rows: [Grade(*row) for row in rows]),
+        ("GradeTable", lambda rows: GradeTable.from_grades(Grade(*row) for row in rows)),
+    ]
+    print(f"{n} grades")
+    print(f"{'layout':<18}{'total MB':>10}{'bytes/grade':>14}")
+    for name, build in layouts:
+        size = measure(build, n)
+        print(f"{name:<18}{size / 1e6:>10.1f}{size / n:>14.1f}")
+
+if __name__ == "__main__":
+    main()
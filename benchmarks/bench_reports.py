@@ -0,0 +1,91 @@
+"""
+PDF report throughput benchmark.
+
+Compares reports/second for:
+    1. the original per-call report builder (new stylesheet, TableStyle and a linear course
+       scan per grade for every report),
+    2. one ReportRenderer reused across all reports.
+
+Reports are rendered into memory so disk speed does not affect the result.
+
+Usage:
+    python -m benchmarks.bench_reports [N ...]    (default: 1 100 10000)
+"""
+
+import io
+import sys
+import time
+from reportlab.lib.pagesizes import letter
+from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle
+from reportlab.lib import colors
+from src.course import Course
+from src.grade import Grade
+from src.gpa_calculator import calculate_cgpa
+from src.pdf_report import ReportRenderer
+from src.student import Student
+
+def legacy_report(student, grades, courses, output):
+    """The report builder as it was before ReportRenderer, for comparison."""
+    doc = SimpleDocTemplate(output, pagesize=letter)
+    styles = getSampleStyleSheet()
+    story = []
+    title_style = ParagraphStyle(name='Title', fontSize=18, alignment=1, spaceAfter=20)
+    story.append(Paragraph("Student Grade Report", title_style))
+    story.append(Spacer(1, 12))
+    story.append(Paragraph(f"Student ID: {student.student_id}", styles['Normal']))
+    story.append(Paragraph(f"Name: {student.name}", styles['Normal']))
+    story.append(Paragraph(f"Email: {student.email}", styles['Normal']))
+    story.append(Spacer(1, 12))
+    data = [["Course Code", "Course Name", "Grade", "Points", "Credits", "Semester"]]
+    for grade in grades:
+        course = next((c for c in courses if c.code == grade.course_code), None)
+        if course:
+            data.append([grade.course_code, course.name, grade.grade, str(grade.get_points()),
+                         str(course.credit_units), grade.semester])
+    table = Table(data)
+    table.setStyle(TableStyle([
+        ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
+        ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+        ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+        ('FONTSIZE', (0, 0), (-1, 0), 14),
+        ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+        ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
+        ('GRID', (0, 0), (-1, -1), 1, colors.black)
+    ]))
+    story.append(table)
+    story.append(Spacer(1, 12))
+    story.append(Paragraph(f"Cumulative GPA (CGPA): {calculate_cgpa(grades, courses)}", styles['Normal']))
+    doc.build(story)
+
+def make_cohort(n, num_courses=300, grades_per_student=12):
+    """Builds n students, a course catalogue and each student's grades."""
+    courses = [Course(f"CSC{i:03d}", f"Course {i}", i % 4 + 1, "Sem1") for i in range(num_courses)]
+    cohort = []
+    for i in range(n):
+        student = Student(f"{i:06d}", f"Student {i}", f"s{i}@example.com")
+        grades = [Grade(student.student_id, courses[(i + j * 7) % num_courses].code, "ABCDEF"[(i + j) % 6],
+                        f"2023/2024 Semester {j % 2 + 1}") for j in range(grades_per_student)]
+        cohort.append((student, grades))
+    return courses, cohort
+
+def rate(render, cohort):
+    """Returns reports/second for render(student, grades) over the cohort."""
+    start = time.perf_counter()
+    for student, grades in cohort:
+        render(student, grades)
+    return len(cohort) / (time.perf_counter() - start)
+
+def main():
+    sizes = [int(arg) for arg in sys.argv[1:]] or [1, 100, 10000]
+    print(f"{'students':>9}{'before rep/s':>14}{'after rep/s':>13}{'speedup':>9}")
+    for n in sizes:
+        courses, cohort = make_cohort(n)
+        before = rate(lambda student, grades: legacy_report(student, grades, courses, io.BytesIO()), cohort)
+        renderer = ReportRenderer(courses)
+        after = rate(renderer.render_bytes, cohort)
+        print(f"{n:>9}{before:>14.1f}{after:>13.1f}{after / before:>8.2f}x")
+
+if __name__ == "__main__":
+    main()
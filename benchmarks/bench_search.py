@@ -0,0 +1,54 @@
+"""
+Search index benchmark.
+
+Times building the student search index and each keystroke of typing queries into the
+student management search box, compared with the old substring scan over every student.
+
+Usage:
+    python -m benchmarks.bench_search [N]
+"""
+
+import random
+import sys
+import time
+from src.repository import Repository
+from src.student import Student
+
+FIRST_NAMES = ["Adebayo", "Chioma", "Emeka", "Funmilayo", "Ibrahim", "Ngozi", "Oluwaseun", "Tunde",
+               "Yetunde", "Zainab", "Kelechi", "Amaka", "Segun", "Halima", "Obinna", "Aisha"]
+LAST_NAMES = ["Okafor", "Adeyemi", "Balogun", "Eze", "Nwosu", "Okonkwo", "Bello", "Danjuma",
+              "Ogunleye", "Uche", "Abubakar", "Olawale", "Afolabi", "Chukwu", "Lawal", "Mohammed"]
+QUERIES = ["oluwaseun ogun", "2024", "chukwu", "zz"]
+
+def make_students(n, seed=1):
+    """Builds synthetic students with realistic-looking IDs and names."""
+    rng = random.Random(seed)
+    return [Student(f"{2018 + i % 7}{i:07d}", f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}",
+                    f"s{i}@example.com") for i in range(n)]
+
+def scan(students, query):
+    """The previous search: lower-cases every name and ID for every keystroke."""
+    query = query.lower()
+    return [s for s in students if query in s.name.lower() or query in s.student_id.lower()]
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    repo = Repository(make_students(n))
+    start = time.perf_counter()
+    repo.search_students("")
+    print(f"{n} students, index built in {time.perf_counter() - start:.3f} s")
+    print(f"{'query':<16}{'worst ms':>9}{'scan ms':>9}{'matches':>9}")
+    for query in QUERIES:
+        worst = worst_scan = 0.0
+        for end in range(1, len(query) + 1):
+            start = time.perf_counter()
+            results = repo.search_students(query[:end])
+            worst = max(worst, time.perf_counter() - start)
+            start = time.perf_counter()
+            scan(repo.students, query[:end])
+            worst_scan = max(worst_scan, time.perf_counter() - start)
+        repo.search_students("")
+        print(f"{query:<16}{worst * 1000:>9.1f}{worst_scan * 1000:>9.1f}{len(results):>9}")
+
+if __name__ == "__main__":
+    main()
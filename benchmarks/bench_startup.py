@@ -0,0 +1,55 @@
+"""
+Startup import-time benchmark.
+
+Runs a fresh interpreter with python -X importtime, importing main.py (everything needed
+before the login window appears), and reports the total import time and the slowest
+top-level imports. Pass module names to measure those instead, e.g. src.charts_window.
+
+Usage:
+    python -m benchmarks.bench_startup [MODULE ...] [--top N]
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def import_times(module):
+    """
+    Imports a module in a fresh interpreter and parses the -X importtime report.
+
+    Args:
+        module (str): Module to import.
+
+    Returns:
+        list of tuple: (cumulative microseconds, nesting depth, module name) per imported module.
+    """
+    completed = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                               cwd=ROOT, capture_output=True, text=True, check=True)
+    rows = []
+    for line in completed.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        depth = (len(name) - len(name.lstrip())) // 2
+        rows.append((int(cumulative), depth, name.strip()))
+    return rows
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure import time with python -X importtime.")
+    parser.add_argument("modules", nargs="*", default=["main"], help="modules to import (default: main)")
+    parser.add_argument("--top", type=int, default=10, help="number of slowest top-level imports to list")
+    args = parser.parse_args()
+
+    for module in args.modules:
+        rows = import_times(module)
+        total = next(us for us, depth, name in reversed(rows) if name == module)
+        print(f"import {module}: {total / 1000:.1f} ms")
+        top_level = sorted((row for row in rows if row[1] == 1), reverse=True)[:args.top]
+        for us, _, name in top_level:
+            print(f"  {us / 1000:>8.1f} ms  {name}")
+
+if __name__ == "__main__":
+    main()
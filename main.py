@@ -2,21 +2,45 @@
 Main Entry Point for Student Grade Management System
 
 This script initializes the application, loads data, and starts the GUI.
+
+Data is loaded on a worker thread so the login window is usable straight away; the worker posts
+progress and the finished Repository through a queue that the Tk main loop polls with
+root.after. Windows that need the data wait behind a progress splash until it arrives.
+
+Edits are saved by an AutoSaver: save_data only schedules a background write, and pending
+changes are flushed on logout and exit.
+
+The charts and PDF windows pull in matplotlib and reportlab, so they are imported when first
+opened rather than at startup. After login the heavy modules are optionally pre-imported on
+a background thread (set GRADE_PREWARM=0 to disable).
 """
 
+import importlib
+import os
+import queue
+import threading
 import customtkinter as ctk
-from src.storage import load_students, load_courses, load_grades, save_students, save_courses, save_grades
+from tkinter import messagebox
+from src.storage import get_backend
 from src.student import Student
 from src.course import Course
 from src.grade import Grade
+from src.repository import Repository
+from src.chart_cache import ChartCache
+from src.autosave import AutoSaver
 from src.login_window import LoginWindow
 from src.dashboard_window import DashboardWindow
 from src.student_management_window import StudentManagementWindow
 from src.course_management_window import CourseManagementWindow
 from src.grade_entry_window import GradeEntryWindow
 from src.gpa_display_window import GPADisplayWindow
-from src.charts_window import ChartsWindow
-from src.pdf_export_dialog import PDFExportDialog
+from src.loading_splash import LoadingSplash
+
+LOAD_POLL_MS = 50
+
+# Modules imported on first use; pre-warmed after login
+HEAVY_MODULES = ("src.charts", "src.charts_window", "src.pdf_report", "src.pdf_export_dialog")
+_prewarm_thread = None  # Started by the first login; later logins reuse it
 
 class App:
     """
@@ -32,56 +56,204 @@ class App:
         self.root.title("Student Grade Management System")
         self.root.geometry("800x600")
         self.root.withdraw()  # Hide main window initially
+        self.root.protocol("WM_DELETE_WINDOW", self.exit)
 
-        # Load data
-        self.students = load_students()
-        self.courses = load_courses()
-        self.grades = load_grades()
+        # Load data in the background; self.repo is None until it arrives
+        self.storage = get_backend()
+        self.repo = None
+        self.autosaver = None  # Created once the data is loaded
+        self.chart_cache = ChartCache()
+        self._load_queue = queue.Queue()
+        self._load_status = "Loading data..."
+        self._waiting = []  # Callbacks to run once the data is loaded
+        self._splash = None
+        threading.Thread(target=self._load_data, daemon=True).start()
+        self.root.after(LOAD_POLL_MS, self._poll_loading)
 
         # Show login on start
         self.show_login()
 
+    def _load_data(self):
+        """Loads the data on the worker thread and posts progress and the result to the queue."""
+        try:
+            self._load_queue.put(("progress", "Loading students..."))
+            students = self.storage.load_students()
+            self._load_queue.put(("progress", "Loading courses..."))
+            courses = self.storage.load_courses()
+            self._load_queue.put(("progress", "Loading grades..."))
+            grades = self.storage.load_grades()
+            self._load_queue.put(("progress", f"Indexing {len(grades)} grades..."))
+            repo = Repository(students, courses, grades)
+            self._load_queue.put(("progress", "Building search index..."))
+            repo.search_students("")
+            repo.search_courses("")
+            self._load_queue.put(("done", repo))
+        except Exception as e:
+            self._load_queue.put(("error", e))
+
+    def _poll_loading(self):
+        """Handles messages from the loader on the Tk main loop until loading finishes."""
+        while True:
+            try:
+                kind, value = self._load_queue.get_nowait()
+            except queue.Empty:
+                self.root.after(LOAD_POLL_MS, self._poll_loading)
+                return
+            if kind == "progress":
+                self._load_status = value
+                if self._splash:
+                    self._splash.set_message(value)
+            elif kind == "done":
+                self.repo = value
+                self.autosaver = AutoSaver(self.root, self.storage, value, on_error=self._report_save_error)
+                self._close_splash()
+                waiting, self._waiting = self._waiting, []
+                for callback in waiting:
+                    callback()
+                return
+            else:
+                self._close_splash()
+                messagebox.showerror("Error", f"Could not load data: {value}")
+                self.root.destroy()
+                return
+
+    def _close_splash(self):
+        """Closes the progress splash if it is shown."""
+        if self._splash:
+            self._splash.close()
+            self._splash = None
+
+    def when_loaded(self, callback):
+        """
+        Runs callback once the data is loaded, showing a progress splash until then.
+
+        Args:
+            callback (callable): Called with no arguments on the Tk main loop.
+        """
+        if self.repo is not None:
+            callback()
+            return
+        self._waiting.append(callback)
+        if self._splash is None:
+            self._splash = LoadingSplash(self.root, self._load_status)
+
     def show_login(self):
         """Shows the login window."""
         LoginWindow(self.root, self)
 
     def show_dashboard(self):
         """Shows the dashboard window."""
-        DashboardWindow(self.root, self)
+        self.when_loaded(lambda: DashboardWindow(self.root, self))
+        if os.environ.get("GRADE_PREWARM", "1") != "0":
+            self.prewarm_imports()
+
+    def prewarm_imports(self):
+        """
+        Imports the chart and PDF modules on a background thread so their windows open quickly.
+
+        Only the first call starts the thread; later logins in the same process return it.
+
+        Returns:
+            threading.Thread: The pre-warming thread.
+        """
+        global _prewarm_thread
+        if _prewarm_thread is not None:
+            return _prewarm_thread
+
+        def prewarm():
+            for name in HEAVY_MODULES:
+                importlib.import_module(name)
+
+        _prewarm_thread = threading.Thread(target=prewarm, daemon=True)
+        _prewarm_thread.start()
+        return _prewarm_thread
 
     def show_student_management(self):
         """Shows the student management window."""
-        StudentManagementWindow(self.root, self)
+        self.when_loaded(lambda: StudentManagementWindow(self.root, self))
 
     def show_course_management(self):
         """Shows the course management window."""
-        CourseManagementWindow(self.root, self)
+        self.when_loaded(lambda: CourseManagementWindow(self.root, self))
 
     def show_grade_entry(self):
         """Shows the grade entry window."""
-        GradeEntryWindow(self.root, self)
+        self.when_loaded(lambda: GradeEntryWindow(self.root, self))
 
     def show_gpa_display(self):
         """Shows the GPA display window."""
-        GPADisplayWindow(self.root, self)
+        self.when_loaded(lambda: GPADisplayWindow(self.root, self))
 
     def show_charts(self):
         """Shows the charts window."""
-        ChartsWindow(self.root, self)
+        from src.charts_window import ChartsWindow
+        self.when_loaded(lambda: ChartsWindow(self.root, self))
 
     def show_pdf_export(self):
         """Shows the PDF export dialog."""
-        PDFExportDialog(self.root, self)
+        from src.pdf_export_dialog import PDFExportDialog
+        self.when_loaded(lambda: PDFExportDialog(self.root, self))
 
     def save_data(self):
-        """Saves all data to CSV files."""
-        save_students(self.students)
-        save_courses(self.courses)
-        save_grades(self.grades)
+        """
+        Schedules a save of the records changed since the last save.
+
+        Edits in quick succession are written together on a background thread once editing
+        pauses; call flush_data to write immediately.
+        """
+        if self.autosaver is not None:
+            self.autosaver.schedule()
+
+    def flush_data(self):
+        """
+        Writes all pending changes now.
+
+        Returns:
+            bool: True if everything was written; a failure is reported to the user.
+        """
+        if self.autosaver is None:
+            return True
+        try:
+            self.autosaver.flush()
+        except Exception as e:
+            self._report_save_error(e)
+            return False
+        return True
+
+    def _report_save_error(self, error):
+        """Tells the user that saving failed; the changes stay pending."""
+        messagebox.showerror("Error", f"Could not save data: {error}\nYour changes are kept and will be "
+                                      "written again with the next save.")
+
+    def exit(self):
+        """
+        Writes pending changes and closes the application.
+
+        If saving fails the user can retry, discard the unsaved changes and exit, or cancel
+        and keep the application open.
+        """
+        while self.autosaver is not None:
+            try:
+                self.autosaver.flush()
+                break
+            except Exception as e:
+                choice = messagebox.askyesnocancel(
+                    "Save Failed", f"Could not save data: {e}\n\nYes: try again\n"
+                                   "No: discard the unsaved changes and exit\nCancel: keep the application open")
+                if choice is None:
+                    return
+                if not choice:
+                    self.autosaver.discard()
+                    break
+        self.root.destroy()
 
     def run(self):
-        """Starts the main event loop."""
-        self.root.mainloop()
+        """Starts the main event loop and writes any pending changes when it ends."""
+        try:
+            self.root.mainloop()
+        finally:
+            if self.autosaver is not None and self.autosaver.pending:
+                self.autosaver.flush()
 
 if __name__ == "__main__":
     app = App()
@@ -0,0 +1,155 @@
+"""
+Autosave Module
+
+This module defines AutoSaver, which replaces synchronous saves after every edit. Edits only
+schedule a save; a burst of edits is coalesced into one write once no edit has happened for
+a short quiet period.
+
+The repository already records which records changed in which collection. When the timer
+fires, the pending changes are taken on the Tk thread (StorageBackend.take_changes) and
+written on a background thread (StorageBackend.write_changes), so collections without
+changes are not touched. Writes go through the backend's usual durable path: fsynced journal
+appends with atomic file replacement on compaction for CSV, one transaction for SQLite.
+
+Only one write runs at a time. A failed write keeps its changes and they are written again
+with the next save. flush() writes everything synchronously and is called on logout and exit;
+on exit a failed flush lets the user retry or discard the changes. flush() and discard() also
+work after the Tk root has been destroyed, so changes still pending when the main loop ends
+are written.
+"""
+
+import threading
+import tkinter as tk
+
+AUTOSAVE_DELAY_MS = 1000  # Quiet period before pending edits are written
+AUTOSAVE_POLL_MS = 50
+
+class AutoSaver:
+    """
+    Debounced background writer of a repository's pending changes.
+
+    Attributes:
+        writes (int): Number of completed writes.
+        last_error (Exception or None): Error of the most recent failed write.
+    """
+
+    def __init__(self, widget, storage, repository, delay_ms=AUTOSAVE_DELAY_MS, on_error=None):
+        """
+        Initializes the saver.
+
+        Args:
+            widget: Tk widget whose after method schedules the timers.
+            storage (StorageBackend): Backend the changes are written to.
+            repository (Repository): Repository whose changes are saved.
+            delay_ms (int): Quiet period in milliseconds.
+            on_error (callable, optional): Called with the exception on the Tk thread when a
+                background write fails.
+        """
+        self.widget = widget
+        self.storage = storage
+        self.repository = repository
+        self.delay_ms = delay_ms
+        self.on_error = on_error
+        self.writes = 0
+        self.last_error = None
+        self._job = None
+        self._writer = None
+        self._lock = threading.Lock()  # Serializes writes to the backend
+        self._retry = None  # (changes, records) of a failed write
+
+    @property
+    def pending(self):
+        """bool: True while a save is scheduled or being written, or a failed write awaits retry."""
+        return self._job is not None or self._writer is not None or self._retry is not None
+
+    def schedule(self):
+        """Schedules a save after the quiet period, restarting it if one is already scheduled."""
+        if self._job is not None:
+            self.widget.after_cancel(self._job)
+        self._job = self.widget.after(self.delay_ms, self._start_write)
+
+    def flush(self):
+        """
+        Writes all pending changes now, on the calling thread, waiting for any write in flight.
+
+        Raises:
+            Exception: Whatever the backend raises; the changes are kept for the next attempt.
+        """
+        self._cancel_job()
+        if self._writer is not None:
+            self._writer.join()
+            self._writer = None
+        changes, records = self._take()
+        if any(changes.values()):
+            self._write(changes, records)
+        if self._retry is not None:
+            raise self.last_error
+
+    def discard(self):
+        """Drops every unsaved change, including those of failed writes."""
+        self._cancel_job()
+        if self._writer is not None:
+            self._writer.join()
+            self._writer = None
+        self.repository.pop_changes()
+        self._retry = None
+        self.last_error = None
+
+    def _cancel_job(self):
+        """Cancels the scheduled save, if any; once the Tk root is destroyed it can never run anyway."""
+        if self._job is None:
+            return
+        try:
+            self.widget.after_cancel(self._job)
+        except tk.TclError:
+            pass  # The application has been destroyed
+        self._job = None
+
+    def _take(self):
+        """Takes the repository's pending changes, merged after any that failed to write."""
+        changes, records = self.storage.take_changes(self.repository)
+        if self._retry is not None:
+            old_changes, old_records = self._retry
+            self._retry = None
+            # An older copy of a collection that has changed since is stale; drop it
+            stale = {collection for collection, entries in changes.items() if entries}
+            records = {**{collection: items for collection, items in old_records.items() if collection not in stale},
+                       **records}
+            changes = {collection: old_changes.get(collection, []) + entries
+                       for collection, entries in changes.items()}
+        return changes, records
+
+    def _write(self, changes, records):
+        """Writes changes; on failure keeps them for the next write and records the error."""
+        with self._lock:
+            try:
+                self.storage.write_changes(changes, records)
+                self.writes += 1
+                self.last_error = None
+            except Exception as e:
+                self._retry = (changes, records)
+                self.last_error = e
+
+    def _start_write(self):
+        """Starts a background write of the pending changes when the quiet period ends."""
+        self._job = None
+        if self._writer is not None:
+            self.schedule()  # A write is still running; try again after another quiet period
+            return
+        changes, records = self._take()
+        if not any(changes.values()):
+            return
+        self._writer = threading.Thread(target=self._write, args=(changes, records), daemon=True)
+        self._writer.start()
+        self.widget.after(AUTOSAVE_POLL_MS, self._poll_writer)
+
+    def _poll_writer(self):
+        """Waits for the background write and reports a failure on the Tk thread."""
+        if self._writer is None:
+            return  # flush() already joined it
+        if self._writer.is_alive():
+            self.widget.after(AUTOSAVE_POLL_MS, self._poll_writer)
+            return
+        self._writer = None
+        if self._retry is not None and self.on_error:
+            self.on_error(self.last_error)  # The changes are retried with the next save
@@ -0,0 +1,405 @@
+"""
+Batch Reports Module
+
+This module generates PDF transcripts for a whole cohort in parallel. Students are spread
+across a ProcessPoolExecutor; each task receives a pre-joined payload holding only that
+student's grades and the courses they reference, never the full grades list.
+
+Reports are written as <out_dir>/<department>/<student_id>.pdf. IDs that are not safe file
+names get a short hash of the ID appended, so two IDs never share a file. Each file is
+rendered to a temporary name and renamed into place when complete. A manifest
+(report_manifest.json in the output directory) records a content hash of every report's
+data, so after a crash or a data change a rerun skips only the reports that exist and are up
+to date.
+
+generate_combined_report writes a department (or the whole cohort) into a single PDF instead,
+streaming students in student ID order with a table of contents.
+
+Command-line usage:
+
+    python -m src.batch_reports reports/ [--workers 8] [--no-resume] [--department "Mathematics"]
+    python -m src.batch_reports board.pdf --combined [--department "Mathematics"]
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import re
+import sys
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+
+UNASSIGNED_DEPARTMENT = "Unassigned"
+MANIFEST_NAME = "manifest.json"
+REPORT_MANIFEST_NAME = "report_manifest.json"
+
+class BatchResult:
+    """
+    Outcome of a batch run.
+
+    Attributes:
+        generated (list of str): Student IDs whose output was written.
+        skipped (list of str): Student IDs whose output was already up to date.
+        failed (list of tuple): (student_id, error message) for students that failed.
+        cancelled (list of str): Student IDs not processed because the run was cancelled.
+        noun (str): What was generated, used in the summary.
+    """
+
+    def __init__(self, noun="reports"):
+        self.generated = []
+        self.skipped = []
+        self.failed = []
+        self.cancelled = []
+        self.noun = noun
+
+    def __str__(self):
+        """
+        Returns a summary of the batch run.
+
+        Returns:
+            str: Generated, skipped and failed counts.
+        """
+        summary = (f"{len(self.generated)} {self.noun} generated, {len(self.skipped)} skipped, "
+                   f"{len(self.failed)} failed.")
+        if self.cancelled:
+            summary += f" Cancelled before {len(self.cancelled)} more."
+        return summary
+
+def safe_filename(value):
+    """
+    Makes a value safe to use as a file or directory name.
+
+    Args:
+        value (str): Any string, e.g. a student ID or department.
+
+    Returns:
+        str: The value with runs of other characters than letters, digits, ".", "_" and "-"
+            replaced by "_".
+    """
+    return re.sub(r'[^A-Za-z0-9._-]+', '_', value).strip('._') or "_"
+
+def unique_filename(value):
+    """
+    Makes a value safe to use as a file name without mapping two values to the same name.
+
+    Args:
+        value (str): Any string, e.g. a student ID.
+
+    Returns:
+        str: safe_filename(value), followed by a short hash of the value if safe_filename
+            had to change it.
+    """
+    name = safe_filename(value)
+    if name != value:
+        name += "-" + hashlib.sha1(value.encode()).hexdigest()[:8]
+    return name
+
+def report_path(out_dir, student):
+    """
+    Returns the output path of a student's report.
+
+    Args:
+        out_dir (str): Root output directory.
+        student (Student): Student object.
+
+    Returns:
+        str: <out_dir>/<department>/<student_id>.pdf
+    """
+    department = student.department or UNASSIGNED_DEPARTMENT
+    return os.path.join(out_dir, safe_filename(department), f"{unique_filename(student.student_id)}.pdf")
+
+def load_manifest(out_dir, name=MANIFEST_NAME):
+    """
+    Reads the export manifest of a directory.
+
+    Args:
+        out_dir (str): Output directory.
+        name (str): Manifest file name.
+
+    Returns:
+        dict: Student ID -> content hash; empty if there is no readable manifest.
+    """
+    try:
+        with open(os.path.join(out_dir, name), 'r') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def save_manifest(out_dir, manifest, name=MANIFEST_NAME):
+    """
+    Writes the export manifest atomically.
+
+    Args:
+        out_dir (str): Output directory.
+        manifest (dict): Student ID -> content hash.
+        name (str): Manifest file name.
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    path = os.path.join(out_dir, name)
+    with open(path + ".tmp", 'w') as f:
+        json.dump(manifest, f, indent=0, sort_keys=True)
+    os.replace(path + ".tmp", path)
+
+def build_payload(repository, student):
+    """
+    Joins a student's grades with the courses they reference.
+
+    Args:
+        repository (Repository): Indexed data store.
+        student (Student): Student object.
+
+    Returns:
+        tuple: (student, grades, courses, cgpa) with only this student's data.
+    """
+    grades = repository.grades_for_student(student.student_id)
+    courses = {}
+    for grade in grades:
+        course = repository.get_course(grade.course_code)
+        if course is not None:
+            courses[course.code] = course
+    return (student, grades, list(courses.values()), repository.aggregates.cgpa(student.student_id))
+
+def payload_hash(payload):
+    """
+    Returns a content hash of everything a report is rendered from.
+
+    Args:
+        payload (tuple): Payload from build_payload.
+
+    Returns:
+        str: Hex digest.
+    """
+    student, grades, courses, cgpa = payload
+    data = [student.to_dict(), [grade.to_dict() for grade in grades], [course.to_dict() for course in courses], cgpa]
+    return hashlib.sha256(json.dumps(data, sort_keys=True).encode()).hexdigest()
+
+def render_payload(payload, path):
+    """
+    Renders one report to path, writing to a temporary file first.
+
+    Runs inside a worker process, which reuses one ReportRenderer for all its reports.
+
+    Args:
+        payload (tuple): Payload from build_payload.
+        path (str): Output path.
+
+    Returns:
+        str: The student ID.
+    """
+    from .pdf_report import get_renderer
+    student, grades, courses, cgpa = payload
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = path + ".part"
+    get_renderer(courses).render(student, grades, tmp_path, cgpa)
+    os.replace(tmp_path, path)
+    return student.student_id
+
+def build_jobs(repository, out_dir, student_ids=None, resume=True):
+    """
+    Snapshots everything the reports of many students need.
+
+    Call it on the thread that owns the repository; the jobs can then be rendered by
+    run_report_jobs on another thread while the repository keeps changing.
+
+    Args:
+        repository (Repository): Indexed data store.
+        out_dir (str): Root output directory.
+        student_ids (list of str, optional): Students to include; all students by default.
+        resume (bool): Skip students whose report exists and was rendered from their current data.
+
+    Returns:
+        tuple: (jobs, skipped), where jobs is a list of (payload, path, digest) triples and
+            skipped the IDs of students whose report is up to date.
+
+    Raises:
+        ValueError: If two students would be written to the same file.
+    """
+    if student_ids is None:
+        students = repository.students
+    else:
+        students = [repository.get_student(sid) for sid in student_ids if repository.has_student(sid)]
+    manifest = load_manifest(out_dir, REPORT_MANIFEST_NAME) if resume else {}
+    owners = {}
+    jobs = []
+    skipped = []
+    for student in students:
+        path = report_path(out_dir, student)
+        # Compare case-insensitively: "AB" and "ab" are one file on Windows and macOS
+        owner = owners.setdefault(os.path.normcase(path).casefold(), student.student_id)
+        if owner != student.student_id:
+            raise ValueError(f"Students {owner} and {student.student_id} would both be written to {path}.")
+        payload = build_payload(repository, student)
+        digest = payload_hash(payload)
+        if resume and manifest.get(student.student_id) == digest and os.path.exists(path):
+            skipped.append(student.student_id)
+        else:
+            jobs.append((payload, path, digest))
+    return jobs, skipped
+
+def run_report_jobs(out_dir, jobs, skipped=(), workers=None, progress=None, mp_context=None, cancel=None):
+    """
+    Renders report jobs across a process pool and records them in the output manifest.
+
+    Args:
+        out_dir (str): Root output directory the jobs were built for.
+        jobs (list of tuple): (payload, path, digest) triples from build_jobs.
+        skipped (list of str): Student IDs already skipped by build_jobs, for the result.
+        workers (int, optional): Number of worker processes; os.cpu_count() by default.
+        progress (callable, optional): Called as progress(done, total) after each student.
+        mp_context (multiprocessing context, optional): Start method of the workers, e.g.
+            multiprocessing.get_context("spawn") from a multi-threaded GUI process.
+        cancel (threading.Event, optional): Once set, no further reports are started.
+
+    Returns:
+        BatchResult: Generated, skipped, failed and cancelled students.
+    """
+    result = BatchResult()
+    result.skipped.extend(skipped)
+    total = len(jobs) + len(result.skipped)
+    done = len(result.skipped)
+    if progress and done:
+        progress(done, total)
+
+    manifest = load_manifest(out_dir, REPORT_MANIFEST_NAME)
+    workers = workers or os.cpu_count() or 1
+    max_in_flight = workers * 4
+    try:
+        with ProcessPoolExecutor(max_workers=workers, mp_context=mp_context) as executor:
+            in_flight = {}
+            queue = iter(jobs)
+            while True:
+                # Keep a bounded number of payloads in flight so memory stays flat
+                while len(in_flight) < max_in_flight and not (cancel and cancel.is_set()):
+                    item = next(queue, None)
+                    if item is None:
+                        break
+                    payload, path, digest = item
+                    in_flight[executor.submit(render_payload, payload, path)] = (payload[0].student_id, digest)
+                if not in_flight:
+                    break
+                finished, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    student_id, digest = in_flight.pop(future)
+                    try:
+                        future.result()
+                        manifest[student_id] = digest
+                        result.generated.append(student_id)
+                    except Exception as e:
+                        manifest.pop(student_id, None)
+                        result.failed.append((student_id, str(e)))
+                    done += 1
+                    if progress:
+                        progress(done, total)
+            result.cancelled.extend(payload[0].student_id for payload, _, _ in queue)
+    finally:
+        save_manifest(out_dir, manifest, REPORT_MANIFEST_NAME)
+    return result
+
+def generate_cohort_reports(repository, out_dir, student_ids=None, workers=None, resume=True, progress=None):
+    """
+    Generates reports for many students across a process pool.
+
+    Args:
+        repository (Repository): Indexed data store.
+        out_dir (str): Root output directory.
+        student_ids (list of str, optional): Students to include; all students by default.
+        workers (int, optional): Number of worker processes; os.cpu_count() by default.
+        resume (bool): Skip students whose report exists and is up to date.
+        progress (callable, optional): Called as progress(done, total) after each student.
+
+    Returns:
+        BatchResult: Generated, skipped and failed students.
+    """
+    jobs, skipped = build_jobs(repository, out_dir, student_ids, resume)
+    return run_report_jobs(out_dir, jobs, skipped, workers, progress)
+
+def select_students(repository, department=None):
+    """
+    Returns students sorted by student ID, optionally limited to one department.
+
+    Args:
+        repository (Repository): Indexed data store.
+        department (str, optional): Department name; "" selects students without one.
+
+    Returns:
+        list of Student: Selected students.
+    """
+    students = repository.students
+    if department is not None:
+        students = [s for s in students if s.department == department]
+    return sorted(students, key=lambda s: s.student_id)
+
+def generate_combined_report(repository, output, department=None, title=None):
+    """
+    Writes one PDF with a section per student, a table of contents and per-semester GPAs.
+
+    Students are streamed into the document in student ID order; see
+    pdf_report.write_combined_report.
+
+    Args:
+        repository (Repository): Indexed data store.
+        output (str or file-like): Output filename, or a binary stream.
+        department (str, optional): Only include this department.
+        title (str, optional): Document title.
+
+    Returns:
+        list of tuple: (label, page) for every student section.
+    """
+    from .pdf_report import ReportRenderer, write_combined_report
+    student_ids = [s.student_id for s in select_students(repository, department)]
+    aggregates = repository.aggregates
+
+    def sections():
+        for student_id in student_ids:
+            yield (repository.get_student(student_id), repository.grades_for_student(student_id),
+                   aggregates.cgpa(student_id), aggregates.semester_gpas(student_id))
+
+    if title is None:
+        title = "Student Grade Reports"
+        if department is not None:
+            title += f" - {department or UNASSIGNED_DEPARTMENT}"
+    return write_combined_report(sections, output, ReportRenderer(repository.courses), title)
+
+def main(argv=None):
+    """Command-line entry point for batch report generation."""
+    from .repository import Repository
+    from .storage import get_backend
+
+    parser = argparse.ArgumentParser(description="Generate PDF reports for every student.")
+    parser.add_argument("out_dir", help="output directory (one sub-directory per department), "
+                                        "or the output PDF with --combined")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: CPU count)")
+    parser.add_argument("--students", nargs="*", help="only these student IDs")
+    parser.add_argument("--no-resume", action="store_true", help="regenerate reports that are up to date")
+    parser.add_argument("--department", help="only students of this department")
+    parser.add_argument("--combined", action="store_true", help="write all students into one PDF")
+    args = parser.parse_args(argv)
+
+    backend = get_backend()
+    try:
+        repository = Repository(backend.load_students(), backend.load_courses(), backend.load_grades())
+    finally:
+        backend.close()
+
+    if args.combined:
+        contents = generate_combined_report(repository, args.out_dir, args.department)
+        print(f"{len(contents)} students written to {args.out_dir}")
+        return 0
+
+    student_ids = args.students
+    if student_ids is None and args.department is not None:
+        student_ids = [s.student_id for s in select_students(repository, args.department)]
+
+    def progress(done, total):
+        print(f"\r{done}/{total}", end="", flush=True)
+
+    result = generate_cohort_reports(repository, args.out_dir, student_ids, args.workers,
+                                     resume=not args.no_resume, progress=progress)
+    print()
+    for student_id, error in result.failed:
+        print(f"{student_id}: {error}")
+    print(result)
+    return 1 if result.failed else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
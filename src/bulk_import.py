@@ -0,0 +1,264 @@
+"""
+Bulk Import Module
+
+This module imports lecturers' result sheets (CSV or XLSX) into the repository. Rows are
+streamed from the sheet, validated against Grade.VALID_GRADES and the known students and
+courses, and checked for duplicates against existing (student_id, course_code, semester) keys
+with set lookups. All rejected rows are reported together and the accepted grades are added
+in one batch, so the caller saves once.
+
+Command-line usage:
+
+    python -m src.bulk_import results.csv [--course ICT323] [--semester "2023/2024 Semester 1"]
+"""
+
+import argparse
+import csv
+import os
+import re
+import sys
+import zipfile
+from .grade import Grade
+
+SHEET_COLUMNS = ("student_id", "course_code", "grade", "semester")
+
+class ImportResult:
+    """
+    Outcome of a bulk import.
+
+    Attributes:
+        accepted (list of Grade): Grades that passed validation.
+        rejects (list of tuple): (row_number, reason) for every rejected row. Row numbers
+            count the header as row 1, as spreadsheet programs do.
+        ignored_columns (list of str): Header columns that are not SHEET_COLUMNS.
+    """
+
+    def __init__(self):
+        self.accepted = []
+        self.rejects = []
+        self.ignored_columns = []
+
+    def __str__(self):
+        """
+        Returns a summary of the import.
+
+        Returns:
+            str: Accepted and rejected counts.
+        """
+        summary = f"{len(self.accepted)} grades imported, {len(self.rejects)} rows rejected."
+        if self.ignored_columns:
+            summary += f" Ignored columns: {', '.join(self.ignored_columns)}."
+        return summary
+
+def _normalize_header(name):
+    """Normalizes a column header, e.g. "Student ID" -> "student_id"."""
+    return str(name or "").strip().lower().replace(" ", "_")
+
+def check_header(header, course_code=None, semester=None):
+    """
+    Checks a result sheet's columns before any row is read.
+
+    Args:
+        header (list of str): Normalized column headers.
+        course_code (str, optional): Default course code; makes the course_code column optional.
+        semester (str, optional): Default semester; makes the semester column optional.
+
+    Returns:
+        list of str: Columns that are not used by the import.
+
+    Raises:
+        ValueError: If a required column is missing.
+    """
+    required = ["student_id", "grade"]
+    if not course_code:
+        required.append("course_code")
+    if not semester:
+        required.append("semester")
+    missing = [column for column in required if column not in header]
+    if missing:
+        raise ValueError(f"Result sheet is missing required columns: {', '.join(missing)}")
+    return [column for column in header if column and column not in SHEET_COLUMNS]
+
+def _cell_text(cell):
+    """
+    Returns the text of an XLSX cell as the lecturer sees it in the spreadsheet.
+
+    Numeric cells come back from openpyxl as int or float, so whole numbers are written without
+    a decimal point and zero-padded number formats such as "00000" keep their leading zeros;
+    student ID 00123 stays "00123" rather than becoming 123.
+
+    Args:
+        cell: openpyxl cell from a read-only worksheet.
+
+    Returns:
+        str: Cell text; "" for empty cells.
+    """
+    value = cell.value
+    if value is None:
+        return ""
+    if isinstance(value, float) and value.is_integer():
+        value = int(value)
+    if isinstance(value, int) and not isinstance(value, bool):
+        number_format = getattr(cell, "number_format", None) or ""
+        if re.fullmatch(r"0+", number_format):
+            return str(value).zfill(len(number_format))
+        return str(value)
+    return str(value).strip()
+
+def read_sheet_rows(path, on_header=None):
+    """
+    Streams the rows of a CSV or XLSX result sheet as dictionaries.
+
+    CSV files are read as UTF-8, with or without the byte-order mark Excel writes. XLSX cells
+    are converted to text with _cell_text.
+
+    Args:
+        path (str): Path of a .csv or .xlsx file. The first row holds the column headers.
+        on_header (callable, optional): Called with the normalized header before the first
+            row; an exception it raises stops the import.
+
+    Yields:
+        dict: Row values keyed by normalized header.
+
+    Raises:
+        ValueError: If the file type is not supported, or the file is not a readable CSV or
+            XLSX file.
+        ImportError: If an XLSX file is given and openpyxl is not installed.
+    """
+    extension = os.path.splitext(path)[1].lower()
+    if extension == ".csv":
+        with open(path, 'r', newline='', encoding='utf-8-sig') as f:
+            reader = csv.reader(f)
+            try:
+                header = [_normalize_header(name) for name in next(reader, [])]
+                if on_header:
+                    on_header(header)
+                for values in reader:
+                    yield dict(zip(header, values))
+            except csv.Error as e:
+                raise ValueError(f"Could not read {os.path.basename(path)} as CSV (line {reader.line_num}): {e}") from e
+    elif extension in (".xlsx", ".xlsm"):
+        try:
+            from openpyxl import load_workbook
+            from openpyxl.utils.exceptions import InvalidFileException
+        except ImportError as e:
+            raise ImportError("Reading XLSX result sheets requires openpyxl (pip install openpyxl).") from e
+        try:
+            workbook = load_workbook(path, read_only=True, data_only=True)
+        except (zipfile.BadZipFile, InvalidFileException, KeyError) as e:
+            raise ValueError(f"Could not read {os.path.basename(path)} as an XLSX workbook: {e}") from e
+        try:
+            rows = workbook.active.iter_rows()
+            header = [_normalize_header(_cell_text(cell)) for cell in next(rows, [])]
+            if on_header:
+                on_header(header)
+            for cells in rows:
+                yield {key: _cell_text(cell) for key, cell in zip(header, cells)}
+        finally:
+            workbook.close()
+    else:
+        raise ValueError(f"Unsupported result sheet type: {extension or path}")
+
+def validate_rows(rows, repository, course_code=None, semester=None):
+    """
+    Validates result sheet rows against the repository.
+
+    Args:
+        rows (iterable of dict): Rows keyed by column name.
+        repository (Repository): Known students, courses and existing grades.
+        course_code (str, optional): Course code for sheets without a course_code column.
+        semester (str, optional): Semester for sheets without a semester column.
+
+    Returns:
+        ImportResult: Accepted grades and rejected rows.
+    """
+    result = ImportResult()
+    seen = set()
+    for row_number, row in enumerate(rows, start=2):
+        if not any(str(value or "").strip() for value in row.values()):
+            continue  # Blank line
+        values = {
+            "student_id": (row.get("student_id") or "").strip(),
+            "course_code": (row.get("course_code") or course_code or "").strip(),
+            "grade": (row.get("grade") or "").strip(),
+            "semester": (row.get("semester") or semester or "").strip(),
+        }
+        try:
+            grade = Grade(values["student_id"], values["course_code"], values["grade"], values["semester"])
+            grade.validate()
+        except ValueError as e:
+            result.rejects.append((row_number, str(e)))
+            continue
+
+        key = (grade.student_id, grade.course_code, grade.semester)
+        if not repository.has_student(grade.student_id):
+            result.rejects.append((row_number, f"Unknown student ID: {grade.student_id}"))
+        elif not repository.has_course(grade.course_code):
+            result.rejects.append((row_number, f"Unknown course code: {grade.course_code}"))
+        elif repository.has_grade(*key):
+            result.rejects.append((row_number, "Grade already exists for this student, course, and semester."))
+        elif key in seen:
+            result.rejects.append((row_number, "Duplicate row in sheet for this student, course, and semester."))
+        else:
+            seen.add(key)
+            result.accepted.append(grade)
+    return result
+
+def import_grade_sheet(path, repository, course_code=None, semester=None, all_or_nothing=False):
+    """
+    Imports a result sheet into the repository.
+
+    The accepted grades are added to the repository in one batch; the caller persists them
+    with a single save (App.save_data or StorageBackend.save).
+
+    Args:
+        path (str): Path of a .csv or .xlsx result sheet.
+        repository (Repository): Repository to add the grades to.
+        course_code (str, optional): Course code for sheets without a course_code column.
+        semester (str, optional): Semester for sheets without a semester column.
+        all_or_nothing (bool): Add nothing if any row is rejected.
+
+    Returns:
+        ImportResult: Accepted grades and rejected rows.
+
+    Raises:
+        ValueError: If the sheet type is not supported, the file cannot be read, or a required
+            column is missing.
+    """
+    ignored = []
+    rows = read_sheet_rows(path, lambda header: ignored.extend(check_header(header, course_code, semester)))
+    result = validate_rows(rows, repository, course_code, semester)
+    result.ignored_columns = ignored
+    if result.rejects and all_or_nothing:
+        result.accepted = []
+    repository.add_grades(result.accepted)
+    return result
+
+def main(argv=None):
+    """Command-line entry point for importing a result sheet into the configured storage."""
+    from .repository import Repository
+    from .storage import get_backend
+
+    parser = argparse.ArgumentParser(description="Import a CSV/XLSX result sheet of grades.")
+    parser.add_argument("sheet", help="result sheet (.csv or .xlsx)")
+    parser.add_argument("--course", help="course code for sheets without a course_code column")
+    parser.add_argument("--semester", help="semester for sheets without a semester column")
+    parser.add_argument("--backend", choices=["csv", "sqlite"], help="storage backend (default: environment)")
+    parser.add_argument("--all-or-nothing", action="store_true", help="import nothing if any row is rejected")
+    args = parser.parse_args(argv)
+
+    backend = get_backend(args.backend)
+    try:
+        repository = Repository(backend.load_students(), backend.load_courses(), backend.load_grades())
+        result = import_grade_sheet(args.sheet, repository, args.course, args.semester, args.all_or_nothing)
+        backend.save(repository)
+    finally:
+        backend.close()
+
+    for row_number, reason in result.rejects:
+        print(f"Row {row_number}: {reason}")
+    print(result)
+    return 1 if result.rejects else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
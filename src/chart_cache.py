@@ -0,0 +1,113 @@
+"""
+Chart Cache Module
+
+This module defines ChartCache, a least-recently-used cache of rendered chart images. Entries
+are keyed by (student_id, chart kind) and stamped with the student's data version from
+Repository.student_version, so a cached image is only reused while the student's data is
+unchanged. Cohort-wide charts use None as the student ID and Repository.version. The total
+size of the cached images is kept under a byte budget.
+"""
+
+from collections import OrderedDict
+
+DEFAULT_MAX_BYTES = 32 * 1024 * 1024
+
+class ChartCache:
+    """
+    LRU cache of rendered chart images with a byte budget.
+
+    Attributes:
+        max_bytes (int): Budget for the total size of the cached images.
+        nbytes (int): Current total size of the cached images.
+        hits (int): Number of lookups answered from the cache.
+        misses (int): Number of lookups that found no current image.
+    """
+
+    def __init__(self, max_bytes=DEFAULT_MAX_BYTES):
+        """
+        Initializes an empty cache.
+
+        Args:
+            max_bytes (int): Budget for the total size of the cached images.
+        """
+        self.max_bytes = max_bytes
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()  # (student_id, kind) -> (version, data)
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, student_id, kind, version):
+        """
+        Returns a cached image if it was rendered from the given data version.
+
+        Args:
+            student_id (str or None): Student ID, or None for cohort-wide charts.
+            kind (str): Chart kind, e.g. "gpa_trend".
+            version (int): Current data version of the student.
+
+        Returns:
+            bytes or None: The image, or None if it is missing or stale.
+        """
+        key = (student_id, kind)
+        entry = self._entries.get(key)
+        if entry is None or entry[0] != version:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._entries.move_to_end(key)
+        return entry[1]
+
+    def put(self, student_id, kind, version, data):
+        """
+        Stores an image, replacing any older version, and evicts to stay within the budget.
+
+        Images larger than the whole budget are not stored.
+
+        Args:
+            student_id (str): Student ID.
+            kind (str): Chart kind.
+            version (int): Data version the image was rendered from.
+            data (bytes): Rendered image.
+        """
+        self._discard((student_id, kind))
+        if len(data) > self.max_bytes:
+            return
+        self._entries[(student_id, kind)] = (version, data)
+        self.nbytes += len(data)
+        while self.nbytes > self.max_bytes:
+            _, (_, evicted) = self._entries.popitem(last=False)
+            self.nbytes -= len(evicted)
+
+    def get_or_render(self, student_id, kind, version, render):
+        """
+        Returns a cached image, rendering and storing it on a miss.
+
+        Args:
+            student_id (str): Student ID.
+            kind (str): Chart kind.
+            version (int): Current data version of the student.
+            render (callable): Called with no arguments to produce the image bytes.
+
+        Returns:
+            bytes: The image.
+        """
+        data = self.get(student_id, kind, version)
+        if data is not None:
+            return data
+        data = render()
+        self.put(student_id, kind, version, data)
+        return data
+
+    def clear(self):
+        """Drops every cached image."""
+        self._entries.clear()
+        self.nbytes = 0
+
+    def _discard(self, key):
+        """Removes one entry if present."""
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self.nbytes -= len(entry[1])
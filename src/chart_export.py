@@ -0,0 +1,276 @@
+"""
+Chart Export Module
+
+This module renders the GPA trend and grade distribution charts of many students into image
+files in parallel. Each worker process receives a small payload with the student's
+precomputed semester GPA series and grade counts, and renders with the Agg backend.
+
+A manifest (manifest.json in the output directory) records a content hash of every exported
+student's chart data. Students whose hash is unchanged and whose files exist are skipped, so
+a nightly run only regenerates the charts of students whose data changed.
+
+With the CSV backend the command line builds the payloads straight from the pandas grade
+frame (storage.load_grades_frame) through the GPA engine, without creating a Grade object
+or a Repository.
+
+Command-line usage:
+
+    python -m src.chart_export charts/ [--format png svg] [--workers 8] [--students 1 2]
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from .batch_reports import BatchResult, load_manifest, save_manifest, unique_filename
+from .gpa_calculator import get_grade_distribution
+from .grade import Grade
+
+CHART_KINDS = ("gpa_trend", "distribution")
+
+def build_payload(repository, student):
+    """
+    Collects the data both charts of a student are drawn from.
+
+    Args:
+        repository (Repository): Indexed data store.
+        student (Student): Student object.
+
+    Returns:
+        tuple: (student_id, name, semester_gpas, distribution).
+    """
+    student_id = student.student_id
+    return (student_id, student.name, repository.aggregates.semester_gpas(student_id),
+            get_grade_distribution(repository.grades_for_student(student_id)))
+
+def payload_hash(payload, formats):
+    """
+    Returns a content hash of a payload and the requested formats.
+
+    Args:
+        payload (tuple): Payload from build_payload.
+        formats (tuple of str): Image formats.
+
+    Returns:
+        str: Hex digest.
+    """
+    return hashlib.sha256(json.dumps([payload, sorted(formats)]).encode()).hexdigest()
+
+def chart_paths(out_dir, student_id, formats):
+    """
+    Returns the output files of a student's charts.
+
+    Args:
+        out_dir (str): Output directory.
+        student_id (str): Student ID.
+        formats (tuple of str): Image formats.
+
+    Returns:
+        list of str: One path per chart kind and format.
+    """
+    name = unique_filename(student_id)
+    return [os.path.join(out_dir, f"{name}_{kind}.{fmt}") for kind in CHART_KINDS for fmt in formats]
+
+def render_payload(payload, out_dir, formats):
+    """
+    Renders and writes both charts of one student.
+
+    Runs inside a worker process. Each file is written under a temporary name and renamed
+    into place when complete.
+
+    Args:
+        payload (tuple): Payload from build_payload.
+        out_dir (str): Output directory.
+        formats (tuple of str): Image formats.
+
+    Returns:
+        str: The student ID.
+    """
+    from .charts import plot_gpa_series, plot_distribution_counts
+    student_id, name, semester_gpas, distribution = payload
+    figures = {
+        "gpa_trend": plot_gpa_series(semester_gpas, name),
+        "distribution": plot_distribution_counts(distribution, name),
+    }
+    base = unique_filename(student_id)
+    for kind, fig in figures.items():
+        for fmt in formats:
+            path = os.path.join(out_dir, f"{base}_{kind}.{fmt}")
+            fig.savefig(path + ".part", format=fmt)
+            os.replace(path + ".part", path)
+    return student_id
+
+def build_payloads(repository, student_ids=None):
+    """
+    Snapshots the chart data of many students.
+
+    Call it on the thread that owns the repository; the payloads can then be exported by
+    export_payloads on another thread while the repository keeps changing.
+
+    Args:
+        repository (Repository): Indexed data store.
+        student_ids (list of str, optional): Students to include; all students by default.
+
+    Returns:
+        list of tuple: One payload per student, see build_payload.
+    """
+    if student_ids is None:
+        students = repository.students
+    else:
+        students = [repository.get_student(sid) for sid in student_ids if repository.has_student(sid)]
+    return [build_payload(repository, student) for student in students]
+
+def build_frame_payloads(students, grades_frame, courses_frame, student_ids=None):
+    """
+    Builds the chart payloads of many students from grade and course DataFrames.
+
+    The payloads are equal to those of build_payloads, so the manifest hashes match whichever
+    way the data was loaded.
+
+    Args:
+        students (list of Student): Students, for their names.
+        grades_frame (pandas.DataFrame): Grades from storage.load_grades_frame.
+        courses_frame (pandas.DataFrame): Courses from storage.load_courses_frame.
+        student_ids (list of str, optional): Students to include; all students by default.
+
+    Returns:
+        list of tuple: One payload per student, see build_payload.
+    """
+    from .gpa_engine import EncodedGrades, compute_semester_gpas, student_grade_counts
+    encoded = EncodedGrades.from_frame(grades_frame, courses_frame)
+    semester_gpas = {}
+    for (student_id, semester), gpa in sorted(compute_semester_gpas(encoded).items()):
+        semester_gpas.setdefault(student_id, []).append((semester, gpa))
+    ids, counts = student_grade_counts(encoded)
+    distributions = {student_id: dict(zip(Grade.VALID_GRADES, row)) for student_id, row in zip(ids, counts.tolist())}
+    empty = {letter: 0 for letter in Grade.VALID_GRADES}
+    if student_ids is not None:
+        wanted = set(student_ids)
+        students = [student for student in students if student.student_id in wanted]
+    return [(student.student_id, student.name, semester_gpas.get(student.student_id, []),
+             distributions.get(student.student_id, empty)) for student in students]
+
+def export_payloads(payloads, out_dir, formats=("png",), workers=None, progress=None, mp_context=None,
+                    cancel=None):
+    """
+    Renders chart payloads across a process pool, skipping students whose charts are unchanged.
+
+    Args:
+        payloads (list of tuple): Payloads from build_payloads.
+        out_dir (str): Output directory.
+        formats (tuple of str): Image formats, e.g. ("png", "svg").
+        workers (int, optional): Number of worker processes; os.cpu_count() by default.
+        progress (callable, optional): Called as progress(done, total) after each student.
+        mp_context (multiprocessing context, optional): Start method of the workers, e.g.
+            multiprocessing.get_context("spawn") from a multi-threaded GUI process.
+        cancel (threading.Event, optional): Once set, no further students are started.
+
+    Returns:
+        BatchResult: Generated, skipped (unchanged), failed and cancelled students.
+    """
+    formats = tuple(formats)
+    os.makedirs(out_dir, exist_ok=True)
+    manifest = load_manifest(out_dir)
+
+    result = BatchResult("chart sets")
+    total = len(payloads)
+    done = 0
+    pending = []
+    for payload in payloads:
+        student_id = payload[0]
+        digest = payload_hash(payload, formats)
+        if manifest.get(student_id) == digest and \
+                all(os.path.exists(path) for path in chart_paths(out_dir, student_id, formats)):
+            result.skipped.append(student_id)
+            done += 1
+        else:
+            pending.append((payload, digest))
+    if progress and done:
+        progress(done, total)
+
+    workers = workers or os.cpu_count() or 1
+    try:
+        with ProcessPoolExecutor(max_workers=workers, mp_context=mp_context) as executor:
+            in_flight = {}
+            queue = iter(pending)
+            while True:
+                while len(in_flight) < workers * 4 and not (cancel and cancel.is_set()):
+                    item = next(queue, None)
+                    if item is None:
+                        break
+                    payload, digest = item
+                    in_flight[executor.submit(render_payload, payload, out_dir, formats)] = (payload[0], digest)
+                if not in_flight:
+                    break
+                finished, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    student_id, digest = in_flight.pop(future)
+                    try:
+                        future.result()
+                        manifest[student_id] = digest
+                        result.generated.append(student_id)
+                    except Exception as e:
+                        manifest.pop(student_id, None)
+                        result.failed.append((student_id, str(e)))
+                    done += 1
+                    if progress:
+                        progress(done, total)
+            result.cancelled.extend(payload[0] for payload, _ in queue)
+    finally:
+        save_manifest(out_dir, manifest)
+    return result
+
+def export_charts(repository, out_dir, student_ids=None, formats=("png",), workers=None, progress=None):
+    """
+    Exports the charts of many students across a process pool.
+
+    Args:
+        repository (Repository): Indexed data store.
+        out_dir (str): Output directory.
+        student_ids (list of str, optional): Students to include; all students by default.
+        formats (tuple of str): Image formats, e.g. ("png", "svg").
+        workers (int, optional): Number of worker processes; os.cpu_count() by default.
+        progress (callable, optional): Called as progress(done, total) after each student.
+
+    Returns:
+        BatchResult: Generated, skipped (unchanged) and failed students.
+    """
+    return export_payloads(build_payloads(repository, student_ids), out_dir, formats, workers, progress)
+
+def main(argv=None):
+    """Command-line entry point for bulk chart export."""
+    from .repository import Repository
+    from .storage import CSVBackend, get_backend, load_courses_frame, load_grades_frame
+
+    parser = argparse.ArgumentParser(description="Export GPA trend and grade distribution charts.")
+    parser.add_argument("out_dir", help="output directory")
+    parser.add_argument("--format", nargs="+", default=["png"], choices=["png", "svg"], help="image formats")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: CPU count)")
+    parser.add_argument("--students", nargs="*", help="only these student IDs")
+    args = parser.parse_args(argv)
+
+    backend = get_backend()
+    try:
+        if isinstance(backend, CSVBackend):
+            payloads = build_frame_payloads(backend.load_students(), load_grades_frame(backend.data_dir),
+                                            load_courses_frame(backend.data_dir), args.students)
+        else:
+            repository = Repository(backend.load_students(), backend.load_courses(), backend.load_grades())
+            payloads = build_payloads(repository, args.students)
+    finally:
+        backend.close()
+
+    def progress(done, total):
+        print(f"\r{done}/{total}", end="", flush=True)
+
+    result = export_payloads(payloads, args.out_dir, args.format, args.workers, progress)
+    print()
+    for student_id, error in result.failed:
+        print(f"{student_id}: {error}")
+    print(result)
+    return 1 if result.failed else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -2,13 +2,73 @@
 Charts Module
 
 This module provides functions to generate charts for GPA trends and grade distributions
-using matplotlib and seaborn.
+using matplotlib, per student and for a whole cohort.
+
+Charts are built on matplotlib.figure.Figure with an Agg canvas and never touch the global
+pyplot state, so they do not block and can be rendered from worker threads or processes.
+Each function returns the Figure; embed it with FigureCanvasTkAgg or write it with
+save_chart.
 """
 
-import matplotlib.pyplot as plt
-import seaborn as sns
-import pandas as pd
-from .gpa_calculator import calculate_semester_gpa, get_grade_distribution
+import io
+from matplotlib import colormaps
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+from .grade import Grade
+from .gpa_calculator import summarize_semesters, get_grade_distribution
+
+def new_figure(figsize=(8, 6)):
+    """
+    Creates a Figure attached to its own Agg canvas.
+
+    Args:
+        figsize (tuple): Width and height in inches.
+
+    Returns:
+        matplotlib.figure.Figure: Empty figure.
+    """
+    fig = Figure(figsize=figsize)
+    FigureCanvasAgg(fig)
+    return fig
+
+def _no_data_figure(title):
+    """Returns a figure with a "No grades available" message."""
+    fig = new_figure((8, 6))
+    ax = fig.add_subplot()
+    ax.text(0.5, 0.5, "No grades available", ha='center', va='center', fontsize=14)
+    ax.set_title(title)
+    return fig
+
+def plot_gpa_series(semester_gpas, student_name):
+    """
+    Plots a line chart of precomputed semester GPAs.
+
+    Args:
+        semester_gpas (list of tuple): (semester, gpa) pairs in semester order, e.g. from
+            GPAAggregates.semester_gpas.
+        student_name (str): Name of the student for the title.
+
+    Returns:
+        matplotlib.figure.Figure: The chart.
+    """
+    title = f"GPA Trend for {student_name}"
+    if not semester_gpas:
+        return _no_data_figure(title)
+
+    sem_list = [semester for semester, _ in semester_gpas]
+    gpas = [gpa for _, gpa in semester_gpas]
+
+    fig = new_figure((10, 6))
+    ax = fig.add_subplot()
+    ax.plot(sem_list, gpas, marker='o', linestyle='-', color='b')
+    ax.set_title(title)
+    ax.set_xlabel("Semester")
+    ax.set_ylabel("GPA")
+    ax.set_ylim(0, 5)
+    ax.grid(True)
+    ax.tick_params(axis='x', labelrotation=45)
+    fig.tight_layout()
+    return fig
 
 def plot_gpa_trend(student_grades, student_name, courses):
     """
@@ -17,38 +77,43 @@ def plot_gpa_trend(student_grades, student_name, courses):
     Args:
         student_grades (list of Grade): List of Grade objects for the student.
         student_name (str): Name of the student for the title.
-        courses (list of Course): List of Course objects for credit units.
-    """
-    if not student_grades:
-        plt.figure(figsize=(8, 6))
-        plt.text(0.5, 0.5, "No grades available", ha='center', va='center', fontsize=14)
-        plt.title(f"GPA Trend for {student_name}")
-        plt.show()
-        return
-
-    # Group grades by semester
-    semesters = {}
-    for grade in student_grades:
-        sem = grade.semester
-        if sem not in semesters:
-            semesters[sem] = []
-        semesters[sem].append(grade)
-
-    # Calculate GPA per semester
-    sem_list = sorted(semesters.keys())
-    gpas = [calculate_semester_gpa(semesters[sem], courses) for sem in sem_list]
-
-    # Plot
-    plt.figure(figsize=(10, 6))
-    plt.plot(sem_list, gpas, marker='o', linestyle='-', color='b')
-    plt.title(f"GPA Trend for {student_name}")
-    plt.xlabel("Semester")
-    plt.ylabel("GPA")
-    plt.ylim(0, 5)
-    plt.grid(True)
-    plt.xticks(rotation=45)
-    plt.tight_layout()
-    plt.show()
+        courses (list of Course or dict): List of Course objects, or a code -> credit_units
+            mapping.
+
+    Returns:
+        matplotlib.figure.Figure: The chart.
+    """
+    summary = summarize_semesters(student_grades, courses)
+    return plot_gpa_series([(entry["semester"], entry["gpa"]) for entry in summary], student_name)
+
+def plot_distribution_counts(distribution, student_name):
+    """
+    Plots a bar chart of precomputed grade counts.
+
+    Args:
+        distribution (dict): Grade letter -> count, e.g. from get_grade_distribution.
+        student_name (str): Name of the student for the title.
+
+    Returns:
+        matplotlib.figure.Figure: The chart.
+    """
+    title = f"Grade Distribution for {student_name}"
+    if not any(distribution.values()):
+        return _no_data_figure(title)
+
+    grades_list = list(distribution.keys())
+    counts = list(distribution.values())
+    cmap = colormaps["viridis"]
+    bar_colors = [cmap(i / max(len(grades_list) - 1, 1)) for i in range(len(grades_list))]
+
+    fig = new_figure((8, 6))
+    ax = fig.add_subplot()
+    ax.bar(grades_list, counts, color=bar_colors)
+    ax.set_title(title)
+    ax.set_xlabel("Grade")
+    ax.set_ylabel("Count")
+    fig.tight_layout()
+    return fig
 
 def plot_grade_distribution(grades, student_name):
     """
@@ -57,33 +122,135 @@ def plot_grade_distribution(grades, student_name):
     Args:
         grades (list of Grade): List of Grade objects.
         student_name (str): Name of the student for the title.
+
+    Returns:
+        matplotlib.figure.Figure: The chart.
     """
-    if not grades:
-        plt.figure(figsize=(8, 6))
-        plt.text(0.5, 0.5, "No grades available", ha='center', va='center', fontsize=14)
-        plt.title(f"Grade Distribution for {student_name}")
-        plt.show()
-        return
+    return plot_distribution_counts(get_grade_distribution(grades), student_name)
 
-    distribution = get_grade_distribution(grades)
-    grades_list = list(distribution.keys())
-    counts = list(distribution.values())
+def plot_cgpa_histogram(cgpas, bins=25):
+    """
+    Plots the CGPA distribution of a cohort.
+
+    Args:
+        cgpas (sequence of float): CGPA of every student, e.g. from gpa_engine.cgpa_values.
+        bins (int): Number of equal-width bins between 0 and 5.
+
+    Returns:
+        matplotlib.figure.Figure: The chart.
+    """
+    title = "CGPA Distribution"
+    if not len(cgpas):
+        return _no_data_figure(title)
+
+    fig = new_figure((10, 6))
+    ax = fig.add_subplot()
+    ax.hist(cgpas, bins=[5 * i / bins for i in range(bins + 1)], color=colormaps["viridis"](0.4),
+            edgecolor="white")
+    ax.set_title(f"{title} ({len(cgpas)} students)")
+    ax.set_xlabel("CGPA")
+    ax.set_ylabel("Students")
+    ax.set_xlim(0, 5)
+    fig.tight_layout()
+    return fig
+
+def plot_course_grade_heatmap(course_codes, counts, max_labels=60):
+    """
+    Plots the share of each grade letter per course as a heatmap.
+
+    Args:
+        course_codes (list of str): Course of each row, e.g. from gpa_engine.course_grade_counts.
+        counts (numpy.ndarray): Grade counts of shape (courses, letters), columns in
+            Grade.VALID_GRADES order.
+        max_labels (int): Courses are labelled only if there are at most this many.
+
+    Returns:
+        matplotlib.figure.Figure: The chart.
+    """
+    title = "Grade Distribution by Course"
+    if not len(course_codes):
+        return _no_data_figure(title)
 
-    # Plot
-    plt.figure(figsize=(8, 6))
-    sns.barplot(x=grades_list, y=counts, hue=grades_list, palette="viridis", legend=False)
-    plt.title(f"Grade Distribution for {student_name}")
-    plt.xlabel("Grade")
-    plt.ylabel("Count")
-    plt.tight_layout()
-    plt.show()
+    totals = counts.sum(axis=1, keepdims=True)
+    shares = counts / totals.clip(min=1)
+
+    fig = new_figure((10, 6))
+    ax = fig.add_subplot()
+    image = ax.imshow(shares, aspect="auto", cmap="viridis", vmin=0, vmax=1, interpolation="nearest")
+    fig.colorbar(image, ax=ax, label="Share of grades")
+    ax.set_title(title)
+    ax.set_xlabel("Grade")
+    ax.set_xticks(range(len(Grade.VALID_GRADES)), Grade.VALID_GRADES)
+    ax.set_ylabel("Course")
+    if len(course_codes) <= max_labels:
+        ax.set_yticks(range(len(course_codes)), course_codes)
+    else:
+        ax.set_yticks([])
+    fig.tight_layout()
+    return fig
+
+def plot_semester_percentile_bands(semesters, values, percentiles=(10, 25, 50, 75, 90)):
+    """
+    Plots per-semester GPA percentile bands of a cohort.
+
+    The outer band spans the first and last percentile, the inner band the second and
+    second-to-last, and the line is the middle percentile.
+
+    Args:
+        semesters (list of str): Semesters in order, e.g. from gpa_engine.semester_percentiles.
+        values (numpy.ndarray): Percentile values of shape (semesters, len(percentiles)).
+        percentiles (sequence of float): The percentiles in values; five by default.
+
+    Returns:
+        matplotlib.figure.Figure: The chart.
+    """
+    title = "Semester GPA Percentiles"
+    if not len(semesters):
+        return _no_data_figure(title)
+
+    n = len(percentiles)
+    x = range(len(semesters))
+    cmap = colormaps["viridis"]
+    fig = new_figure((10, 6))
+    ax = fig.add_subplot()
+    ax.fill_between(x, values[:, 0], values[:, n - 1], color=cmap(0.3), alpha=0.25,
+                    label=f"P{percentiles[0]}-P{percentiles[n - 1]}")
+    if n >= 4:
+        ax.fill_between(x, values[:, 1], values[:, n - 2], color=cmap(0.3), alpha=0.45,
+                        label=f"P{percentiles[1]}-P{percentiles[n - 2]}")
+    ax.plot(x, values[:, n // 2], marker='o', color=cmap(0.1), label=f"P{percentiles[n // 2]}")
+    ax.set_title(title)
+    ax.set_xticks(x, semesters)
+    ax.tick_params(axis='x', labelrotation=45)
+    ax.set_ylabel("GPA")
+    ax.set_ylim(0, 5)
+    ax.grid(True, alpha=0.3)
+    ax.legend()
+    fig.tight_layout()
+    return fig
+
+def figure_to_png(fig, dpi=None):
+    """
+    Renders a figure to PNG bytes.
+
+    Args:
+        fig (matplotlib.figure.Figure): Figure to render.
+        dpi (float, optional): Resolution; the figure's own dpi when omitted.
+
+    Returns:
+        bytes: PNG image.
+    """
+    buffer = io.BytesIO()
+    fig.savefig(buffer, format="png", dpi=dpi)
+    return buffer.getvalue()
 
-def save_chart(filename):
+def save_chart(fig, filename):
     """
-    Saves the current matplotlib figure to a file.
+    Saves a figure to a file.
 
     Args:
-        filename (str): Path to save the image.
+        fig (matplotlib.figure.Figure): Figure to save.
+        filename (str): Path to save the image; the extension selects the format (png, svg, ...).
     """
-    plt.savefig(filename)
+    fig.savefig(filename)
     print(f"Chart saved to {filename}")
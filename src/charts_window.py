@@ -4,11 +4,23 @@ Charts Window Module
 This module defines the ChartsWindow class for displaying charts.
 """
 
+import multiprocessing
+import threading
 import tkinter as tk
 import customtkinter as ctk
-from tkinter import ttk
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-from src.charts import plot_gpa_trend, plot_grade_distribution
+from tkinter import ttk, filedialog, messagebox
+from src.charts import (plot_gpa_series, plot_grade_distribution, plot_cgpa_histogram, plot_course_grade_heatmap,
+                        plot_semester_percentile_bands, figure_to_png, save_chart)
+from src.student_picker import StudentPicker
+from src.task_scheduler import TaskScheduler
+
+CHART_DPI = 70  # 10x6 inch figures fit the 750x450 tabs
+COHORT_DPI = 62  # Leaves room for the chart selector in the cohort tab
+COHORT_CHARTS = [
+    ("CGPA Distribution", "cohort_cgpa"),
+    ("Course Heatmap", "cohort_heatmap"),
+    ("Semester Percentiles", "cohort_percentiles"),
+]
 
 class ChartsWindow:
     """
@@ -25,6 +37,8 @@ class ChartsWindow:
         # Center the window
         self.window.transient(root)
         self.window.grab_set()
+        self.window.protocol("WM_DELETE_WINDOW", self.close)
+        self.tasks = TaskScheduler(self.window)
 
         # Title
         self.title_label = ctk.CTkLabel(self.window, text="Charts & Analytics",
@@ -36,11 +50,11 @@ class ChartsWindow:
         student_frame.pack(pady=10, padx=20, fill="x")
         self.student_label = ctk.CTkLabel(student_frame, text="Select Student:")
         self.student_label.pack(side="left", padx=(0, 10))
-        self.student_var = ctk.StringVar()
-        self.student_combo = ctk.CTkComboBox(student_frame, variable=self.student_var,
-                                            values=[f"{s.student_id} - {s.name}" for s in self.app.students],
-                                            command=self.update_charts)
-        self.student_combo.pack(side="left", fill="x", expand=True)
+        self.student_picker = StudentPicker(student_frame, self.app.repo, command=self.update_charts)
+        self.student_picker.pack(side="left", fill="x", expand=True)
+
+        # Spinner shown while charts render in the background
+        self.spinner = ctk.CTkProgressBar(self.window, mode="indeterminate", height=6)
 
         # Tabbed interface
         self.tab_control = ctk.CTkTabview(self.window, width=750, height=450)
@@ -49,51 +63,234 @@ class ChartsWindow:
         # GPA Trend Tab
         self.tab_control.add("GPA Trend")
         self.gpa_tab = self.tab_control.tab("GPA Trend")
-        self.gpa_canvas = None
+        self.gpa_image_label = tk.Label(self.gpa_tab)
+        self.gpa_image_label.pack(fill=tk.BOTH, expand=True)
 
         # Grade Distribution Tab
         self.tab_control.add("Grade Distribution")
         self.dist_tab = self.tab_control.tab("Grade Distribution")
-        self.dist_canvas = None
+        self.dist_image_label = tk.Label(self.dist_tab)
+        self.dist_image_label.pack(fill=tk.BOTH, expand=True)
+
+        # Cohort Tab
+        self.tab_control.add("Cohort")
+        self.cohort_tab = self.tab_control.tab("Cohort")
+        self.cohort_var = ctk.StringVar(value=COHORT_CHARTS[0][0])
+        self.cohort_selector = ctk.CTkSegmentedButton(self.cohort_tab, values=[title for title, _ in COHORT_CHARTS],
+                                                      variable=self.cohort_var, command=self.update_cohort_chart)
+        self.cohort_selector.pack(pady=(0, 5))
+        self.cohort_image_label = tk.Label(self.cohort_tab)
+        self.cohort_image_label.pack(fill=tk.BOTH, expand=True)
+        self.cohort_encoded = None
+        self.cohort_encoded_version = None
+        self.tab_control.configure(command=self.on_tab_changed)
+
+        self.images = {}
+        self.current_student = None
+        self._busy = set()
 
         # Export button
         self.export_btn = ctk.CTkButton(self.window, text="Export Chart", command=self.export_chart,
                                        height=35, font=ctk.CTkFont(size=12, weight="bold"))
-        self.export_btn.pack(pady=(10, 20), padx=20, fill="x")
+        self.export_btn.pack(pady=(10, 5), padx=20, fill="x")
+        self.export_all_btn = ctk.CTkButton(self.window, text="Export All Students' Charts...",
+                                           command=self.export_all_charts, height=35)
+        self.export_all_btn.pack(pady=(5, 20), padx=20, fill="x")
+        self._export_progress = None
+        self._export_result = None
+        self._export_cancel = None
+
+    def update_charts(self, student_id):
+        """
+        Updates the charts for the chosen student.
 
-    def update_charts(self, event):
-        """Updates the charts for the selected student."""
-        selected = self.student_var.get()
-        if not selected:
+        Args:
+            student_id (str): Student ID from the picker.
+        """
+        student = self.app.repo.get_student(student_id)
+        if not student:
             return
-        student_id = selected.split(" - ")[0]
-        student_name = selected.split(" - ")[1]
-
-        # Get student's grades
-        student_grades = [g for g in self.app.grades if g.student_id == student_id]
-
-        # GPA Trend Chart
-        if self.gpa_canvas:
-            self.gpa_canvas.get_tk_widget().destroy()
-        fig = plot_gpa_trend(student_grades, student_name, self.app.courses)
-        self.gpa_canvas = FigureCanvasTkAgg(fig, master=self.gpa_tab)
-        self.gpa_canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
-        self.gpa_canvas.draw()
-
-        # Grade Distribution Chart
-        if self.dist_canvas:
-            self.dist_canvas.get_tk_widget().destroy()
-        fig2 = plot_grade_distribution(student_grades, student_name)
-        self.dist_canvas = FigureCanvasTkAgg(fig2, master=self.dist_tab)
-        self.dist_canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
-        self.dist_canvas.draw()
+        self.current_student = (student_id, student.name)
+
+        # Charts are cached as PNG images until the student's data version changes; only
+        # missing images are rendered, on a worker thread
+        cache = self.app.chart_cache
+        version = self.app.repo.student_version(student_id)
+        images = {kind: cache.get(student_id, kind, version) for kind in ("gpa_trend", "distribution")}
+        missing = [kind for kind, png in images.items() if png is None]
+        if not missing:
+            self.tasks.cancel("student")
+            self.show_student_charts(images)
+            return
+
+        student = self.current_student
+
+        def render():
+            return {kind: figure_to_png(self.build_figure(kind, student), dpi=CHART_DPI) for kind in missing}
+
+        def done(rendered):
+            for kind, png in rendered.items():
+                cache.put(student_id, kind, version, png)
+            images.update(rendered)
+            self.show_student_charts(images)
+
+        self.set_busy("student", True)
+        self.tasks.submit("student", render, done, lambda error: self.show_error("student", error))
+
+    def show_student_charts(self, images):
+        """Shows the two student charts from their PNG images."""
+        self.set_busy("student", False)
+        for kind, label in (("gpa_trend", self.gpa_image_label), ("distribution", self.dist_image_label)):
+            self.images[kind] = tk.PhotoImage(data=images[kind])
+            label.configure(image=self.images[kind])
+
+    def on_tab_changed(self):
+        """Renders the cohort chart when its tab is opened."""
+        if self.tab_control.get() == "Cohort":
+            self.update_cohort_chart()
+
+    def update_cohort_chart(self, value=None):
+        """Shows the selected cohort chart, cached until any student's data changes."""
+        kind = dict(COHORT_CHARTS)[self.cohort_var.get()]
+        version = self.app.repo.version
+        png = self.app.chart_cache.get(None, kind, version)
+        if png is not None:
+            self.tasks.cancel("cohort")
+            self.show_cohort_chart(kind, png)
+            return
+
+        def done(png):
+            self.app.chart_cache.put(None, kind, version, png)
+            self.show_cohort_chart(kind, png)
+
+        self.set_busy("cohort", True)
+        self.tasks.submit("cohort", lambda: figure_to_png(self.build_figure(kind), dpi=COHORT_DPI),
+                          done, lambda error: self.show_error("cohort", error))
+
+    def show_cohort_chart(self, kind, png):
+        """Shows a cohort chart from its PNG image."""
+        self.set_busy("cohort", False)
+        self.images[kind] = tk.PhotoImage(data=png)
+        self.cohort_image_label.configure(image=self.images[kind])
+
+    def set_busy(self, key, busy):
+        """
+        Shows the spinner while any chart task runs.
+
+        Args:
+            key (str): Task key that started or finished.
+            busy (bool): Whether the task is starting.
+        """
+        self._busy = (self._busy | {key}) if busy else (self._busy - {key})
+        if self._busy:
+            self.spinner.pack(before=self.tab_control, padx=40, fill="x")
+            self.spinner.start()
+        else:
+            self.spinner.stop()
+            self.spinner.pack_forget()
+
+    def show_error(self, key, error):
+        """Reports a failed chart rendering."""
+        self.set_busy(key, False)
+        messagebox.showerror("Error", f"Could not render chart: {error}", parent=self.window)
+
+    def close(self):
+        """Stops background work and closes the window, cancelling a running chart export after confirmation."""
+        if self._export_cancel is not None and self._export_result is None:
+            if not messagebox.askyesno("Chart Export", "Charts are still being exported. Cancel the remaining "
+                                                       "students and close?", parent=self.window):
+                return
+            self._export_cancel.set()
+        self.tasks.shutdown()
+        self.window.destroy()
+
+    def encoded_cohort(self):
+        """Returns the cohort's grades encoded for the GPA engine, re-encoding after changes."""
+        from src.gpa_engine import EncodedGrades
+        if self.cohort_encoded_version != self.app.repo.version:
+            self.cohort_encoded = EncodedGrades.from_grades(self.app.repo.grades, self.app.repo.credit_map)
+            self.cohort_encoded_version = self.app.repo.version
+        return self.cohort_encoded
+
+    def build_figure(self, kind, student=None):
+        """
+        Builds a chart of a student or of the cohort.
+
+        Safe to call from a worker thread: it only reads the repository and builds a Figure.
+
+        Args:
+            kind (str): "gpa_trend", "distribution", or a cohort chart kind from COHORT_CHARTS.
+            student (tuple, optional): (student_id, name); the current student by default.
+
+        Returns:
+            matplotlib.figure.Figure: The chart.
+        """
+        if kind.startswith("cohort_"):
+            from src.gpa_engine import cgpa_values, course_grade_counts, semester_percentiles
+            encoded = self.encoded_cohort()
+            if kind == "cohort_cgpa":
+                return plot_cgpa_histogram(cgpa_values(encoded))
+            if kind == "cohort_heatmap":
+                return plot_course_grade_heatmap(*course_grade_counts(encoded))
+            return plot_semester_percentile_bands(*semester_percentiles(encoded))
+
+        student_id, student_name = student or self.current_student
+        if kind == "gpa_trend":
+            return plot_gpa_series(self.app.repo.aggregates.semester_gpas(student_id), student_name)
+        return plot_grade_distribution(self.app.repo.grades_for_student(student_id), student_name)
 
     def export_chart(self):
-        """Exports the current chart as PNG."""
-        # Placeholder: Export the active tab's chart
+        """Exports the active tab's chart as PNG or SVG."""
         current_tab = self.tab_control.get()
-        if current_tab == "GPA Trend" and self.gpa_canvas:
-            plot_gpa_trend([], "Exported")  # Re-plot to save
-        elif current_tab == "Grade Distribution" and self.dist_canvas:
-            plot_grade_distribution([], "Exported")  # Re-plot to save
-        # Note: Actual export logic in charts.py save_chart function
+        if current_tab == "Cohort":
+            kind = dict(COHORT_CHARTS)[self.cohort_var.get()]
+        elif self.current_student is None:
+            messagebox.showerror("Error", "Please select a student first.", parent=self.window)
+            return
+        else:
+            kind = "gpa_trend" if current_tab == "GPA Trend" else "distribution"
+        filename = filedialog.asksaveasfilename(parent=self.window, defaultextension=".png",
+                                                filetypes=[("PNG image", "*.png"), ("SVG image", "*.svg")])
+        if filename:
+            save_chart(self.build_figure(kind), filename)
+
+    def export_all_charts(self):
+        """Exports both charts of every student into a chosen directory in the background."""
+        from src.chart_export import build_payloads, export_payloads
+        out_dir = filedialog.askdirectory(parent=self.window, title="Select Output Directory")
+        if not out_dir:
+            return
+        self.export_all_btn.configure(state="disabled")
+        # Snapshot on the Tk thread; the workers are spawned so they do not inherit its threads
+        payloads = build_payloads(self.app.repo)
+        self._export_progress = (0, len(payloads))
+        self._export_result = None
+        self._export_cancel = cancel = threading.Event()
+
+        def progress(done, total):
+            self._export_progress = (done, total)
+
+        def run():
+            try:
+                self._export_result = export_payloads(payloads, out_dir, progress=progress, cancel=cancel,
+                                                      mp_context=multiprocessing.get_context("spawn"))
+            except Exception as e:
+                self._export_result = e
+
+        threading.Thread(target=run, daemon=True).start()
+        self._poll_export()
+
+    def _poll_export(self):
+        """Shows export progress and reports the outcome when the export finishes."""
+        if not self.window.winfo_exists():
+            return
+        done, total = self._export_progress
+        self.export_all_btn.configure(text=f"Exporting... {done}/{total}")
+        if self._export_result is None:
+            self.window.after(200, self._poll_export)
+            return
+        self.export_all_btn.configure(state="normal", text="Export All Students' Charts...")
+        if isinstance(self._export_result, Exception):
+            messagebox.showerror("Error", f"Chart export failed: {self._export_result}", parent=self.window)
+        else:
+            messagebox.showinfo("Chart Export", str(self._export_result), parent=self.window)
@@ -17,6 +17,8 @@ class Course:
         semester (str): Semester in which the course is offered.
     """
 
+    __slots__ = ("code", "name", "credit_units", "semester")
+
     def __init__(self, code, name, credit_units, semester):
         """
         Initializes a Course instance.
@@ -7,6 +7,9 @@ This module defines the CourseManagementWindow class for CRUD operations on cour
 import customtkinter as ctk
 from tkinter import messagebox, ttk
 from src.course import Course
+from src.virtual_list import VirtualCardList
+
+SEARCH_DELAY_MS = 150  # Search once typing pauses for this long
 
 class CourseManagementWindow:
     """
@@ -47,9 +50,10 @@ class CourseManagementWindow:
         self.search_entry.pack(side="left", fill="x", expand=True)
         self.search_entry.bind('<KeyRelease>', self.search_courses)
 
-        # Scrollable frame for courses
-        self.scrollable_frame = ctk.CTkScrollableFrame(self.scrollable_main, height=400)
-        self.scrollable_frame.pack(pady=10, padx=20, fill="both", expand=True)
+        # Virtualized list of course cards
+        self.course_list = VirtualCardList(self.scrollable_main, self.create_course_card, self.bind_course_card,
+                                           row_height=110, height=400)
+        self.course_list.pack(pady=10, padx=20, fill="both", expand=True)
 
         # Form frame (hidden initially)
         self.form_frame = ctk.CTkFrame(self.scrollable_main)
@@ -89,6 +93,9 @@ class CourseManagementWindow:
                                        font=ctk.CTkFont(size=12, weight="bold"))
         self.cancel_btn.pack(side="left", padx=10)
 
+        self._search_job = None
+        self._last_query = ""
+
         # Load courses
         self.load_courses()
 
@@ -96,36 +103,34 @@ class CourseManagementWindow:
         self.editing_course = None
 
     def load_courses(self):
-        """Loads courses into the scrollable frame as cards."""
-        # Clear existing cards
-        for widget in self.scrollable_frame.winfo_children():
-            widget.destroy()
-
-        for course in self.app.courses:
-            self.create_course_card(course)
+        """Loads all courses into the card list."""
+        self.course_list.set_items(self.app.repo.courses)
 
-    def create_course_card(self, course):
-        """Creates a card for a course."""
-        card_frame = ctk.CTkFrame(self.scrollable_frame, corner_radius=10, border_width=1)
-        card_frame.pack(pady=5, padx=10, fill="x")
+    def create_course_card(self, parent):
+        """Creates an empty card; bind_course_card fills it with a course."""
+        card_frame = ctk.CTkFrame(parent, corner_radius=10, border_width=1)
 
         # Course info
-        info_label = ctk.CTkLabel(card_frame, text=f"Code: {course.code}\nName: {course.name}\nCredits: {course.credit_units}\nSemester: {course.semester}",
-                                 font=ctk.CTkFont(size=12))
-        info_label.pack(side="left", padx=15, pady=10, fill="x", expand=True)
+        card_frame.info_label = ctk.CTkLabel(card_frame, text="", font=ctk.CTkFont(size=12))
+        card_frame.info_label.pack(side="left", padx=15, pady=10, fill="x", expand=True)
 
-        # Buttons
+        # Buttons act on whichever course the card currently shows
         button_frame = ctk.CTkFrame(card_frame, fg_color="transparent")
         button_frame.pack(side="right", padx=10, pady=10)
 
-        edit_btn = ctk.CTkButton(button_frame, text="Edit", command=lambda: self.show_edit_form(course),
+        edit_btn = ctk.CTkButton(button_frame, text="Edit", command=lambda: self.show_edit_form(card_frame.item),
                                 width=60, height=30, font=ctk.CTkFont(size=11))
         edit_btn.pack(pady=2)
 
-        delete_btn = ctk.CTkButton(button_frame, text="Delete", command=lambda: self.delete_course(course),
+        delete_btn = ctk.CTkButton(button_frame, text="Delete", command=lambda: self.delete_course(card_frame.item),
                                   width=60, height=30, fg_color="red", hover_color="darkred",
                                   font=ctk.CTkFont(size=11))
         delete_btn.pack(pady=2)
+        return card_frame
+
+    def bind_course_card(self, card, course):
+        """Shows a course on a card."""
+        card.info_label.configure(text=f"Code: {course.code}\nName: {course.name}\nCredits: {course.credit_units}\nSemester: {course.semester}")
 
     def show_add_form(self):
         """Shows the form for adding a new course."""
@@ -156,10 +161,9 @@ class CourseManagementWindow:
     def delete_course(self, course):
         """Deletes the selected course."""
         if messagebox.askyesno("Confirm", f"Are you sure you want to delete course {course.name}?"):
-            self.app.courses.remove(course)
-            self.app.grades = [g for g in self.app.grades if g.course_code != course.code]  # Remove grades too
+            self.app.repo.remove_course(course, cascade=True)  # Remove grades too
+            self.course_list.remove_item(course)
             self.app.save_data()
-            self.load_courses()
             messagebox.showinfo("Success", "Course deleted successfully!")
 
     def save_course(self):
@@ -178,16 +182,20 @@ class CourseManagementWindow:
             course = Course(code, name, credits, semester)
             if self.editing_course:
                 # Update existing
-                index = self.app.courses.index(self.editing_course)
-                self.app.courses[index] = course
+                self.app.repo.update_course(self.editing_course, course)
+                self.course_list.replace_item(self.editing_course, course)
             else:
                 # Check for duplicate code
-                if any(c.code == code for c in self.app.courses):
+                if self.app.repo.has_course(code):
                     messagebox.showerror("Error", "Course code already exists.")
                     return
-                self.app.courses.append(course)
+                self.app.repo.add_course(course)
+                if self._last_query:
+                    # Only list the new course if it matches the active search
+                    self.course_list.set_items(self.app.repo.search_courses(self._last_query))
+                else:
+                    self.course_list.append_item(course)
             self.app.save_data()
-            self.load_courses()
             self.cancel_edit()
             messagebox.showinfo("Success", "Course saved successfully!")
         except ValueError as e:
@@ -198,13 +206,17 @@ class CourseManagementWindow:
         self.form_frame.pack_forget()
         self.editing_course = None
 
-    def search_courses(self, event):
-        """Filters courses based on search query."""
-        query = self.search_entry.get().lower()
-        # Clear existing cards
-        for widget in self.scrollable_frame.winfo_children():
-            widget.destroy()
-
-        for course in self.app.courses:
-            if query in course.name.lower() or query in course.code.lower():
-                self.create_course_card(course)
+    def search_courses(self, event=None):
+        """Schedules a search once typing pauses; every keystroke restarts the delay."""
+        if self._search_job is not None:
+            self.window.after_cancel(self._search_job)
+        self._search_job = self.window.after(SEARCH_DELAY_MS, self.apply_search)
+
+    def apply_search(self):
+        """Shows the courses matching the search box, using the repository's search index."""
+        self._search_job = None
+        query = self.search_entry.get().strip()
+        if query == self._last_query:
+            return
+        self._last_query = query
+        self.course_list.set_items(self.app.repo.search_courses(query))
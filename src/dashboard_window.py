@@ -21,6 +21,7 @@ class DashboardWindow:
         # Center the window
         self.window.transient(root)
         self.window.grab_set()
+        self.window.protocol("WM_DELETE_WINDOW", self.app.exit)
 
         # Title
         self.title_label = ctk.CTkLabel(self.window, text="Academic Management Portal",
@@ -65,7 +66,7 @@ class DashboardWindow:
         self.stats_frame.pack(pady=10, padx=20, fill="x")
 
         self.stats_label = ctk.CTkLabel(self.stats_frame,
-                                       text=f"Current Statistics:\nStudents: {len(self.app.students)} | Courses: {len(self.app.courses)} | Grades: {len(self.app.grades)}",
+                                       text=f"Current Statistics:\nStudents: {self.app.repo.count_students()} | Courses: {self.app.repo.count_courses()} | Grades: {self.app.repo.count_grades()}",
                                        font=ctk.CTkFont(size=14))
         self.stats_label.pack(pady=15, padx=20)
 
@@ -76,6 +77,7 @@ class DashboardWindow:
         self.logout_btn.pack(pady=(20, 10), padx=20, fill="x")
 
     def logout(self):
-        """Logs out and returns to login."""
+        """Writes pending changes, logs out and returns to login."""
+        self.app.flush_data()
         self.window.destroy()
         self.app.show_login()
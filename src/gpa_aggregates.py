@@ -0,0 +1,114 @@
+"""
+GPA Aggregates Module
+
+This module defines the GPAAggregates class, which keeps running totals of
+Σ(points × credits) and Σ(credits) per (student, semester) and per student so that
+GPA and CGPA can be read without revisiting the student's grades.
+"""
+
+class GPAAggregates:
+    """
+    Running GPA totals maintained incrementally as grades and courses change.
+
+    Each total is a list of [weighted_points, credits, grade_count]. The grade count keeps a
+    semester listed while it still has grades, even if none of them carry credits, which matches
+    how the GPA display groups grades by semester.
+    """
+
+    def __init__(self):
+        self._semester_totals = {}
+        self._student_totals = {}
+        self._student_semesters = {}
+
+    def add(self, grade, credits):
+        """
+        Adds a grade to the totals.
+
+        Args:
+            grade (Grade): Grade being added.
+            credits (int): Credit units of the grade's course, 0 if the course is unknown.
+        """
+        self._apply(grade, grade.get_points() * credits, credits, 1)
+
+    def remove(self, grade, credits):
+        """
+        Removes a grade from the totals.
+
+        Args:
+            grade (Grade): Grade being removed.
+            credits (int): Credit units the grade was added with.
+        """
+        self._apply(grade, -grade.get_points() * credits, -credits, -1)
+
+    def change_credits(self, grade, old_credits, new_credits):
+        """
+        Re-weights a grade after its course's credit units changed.
+
+        Args:
+            grade (Grade): Affected grade.
+            old_credits (int): Credit units the grade was added with.
+            new_credits (int): New credit units.
+        """
+        delta = new_credits - old_credits
+        if delta:
+            self._apply(grade, grade.get_points() * delta, delta, 0)
+
+    def _apply(self, grade, points, credits, count):
+        """Applies a delta to the semester and student totals."""
+        semester_key = (grade.student_id, grade.semester)
+        for totals, key in ((self._semester_totals, semester_key),
+                            (self._student_totals, grade.student_id)):
+            entry = totals.setdefault(key, [0, 0, 0])
+            entry[0] += points
+            entry[1] += credits
+            entry[2] += count
+            if entry[2] == 0:
+                del totals[key]
+
+        semesters = self._student_semesters.setdefault(grade.student_id, set())
+        if semester_key in self._semester_totals:
+            semesters.add(grade.semester)
+        else:
+            semesters.discard(grade.semester)
+            if not semesters:
+                del self._student_semesters[grade.student_id]
+
+    @staticmethod
+    def _average(entry):
+        """Returns the rounded average of a totals entry, or 0.0 if it has no credits."""
+        if entry is None or entry[1] == 0:
+            return 0.0
+        return round(entry[0] / entry[1], 2)
+
+    def semester_gpa(self, student_id, semester):
+        """
+        Returns the GPA of a student in one semester.
+
+        Returns:
+            float: GPA, or 0.0 if no grades or credits.
+        """
+        return self._average(self._semester_totals.get((student_id, semester)))
+
+    def semester_gpas(self, student_id):
+        """
+        Returns the GPA of every semester a student has grades in.
+
+        Args:
+            student_id (str): Student ID.
+
+        Returns:
+            list of tuple: (semester, gpa) pairs sorted by semester.
+        """
+        return [
+            (semester, self.semester_gpa(student_id, semester))
+            for semester in sorted(self._student_semesters.get(student_id, ()))
+        ]
+
+    def cgpa(self, student_id):
+        """
+        Returns the CGPA of a student.
+
+        Returns:
+            float: CGPA, or 0.0 if no grades or credits.
+        """
+        return self._average(self._student_totals.get(student_id))
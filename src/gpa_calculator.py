@@ -5,44 +5,78 @@ This module provides functions to calculate GPA and CGPA based on the Nigerian u
 It uses the standard scale: A=5, B=4, C=3, D=2, E=1, F=0.
 """
 
-import numpy as np
+from collections.abc import Mapping
 from .grade import Grade
 
-def calculate_semester_gpa(grades, courses):
+def build_credit_map(courses):
     """
-    Calculates the GPA for a specific semester.
+    Builds a course code to credit units mapping.
 
     Args:
-        grades (list of Grade): List of Grade objects for the semester.
-        courses (list of Course): List of Course objects to get credit units.
+        courses (list of Course or dict): Course objects, or an existing code -> credit_units
+            mapping which is returned unchanged.
 
     Returns:
-        float: GPA for the semester, or 0.0 if no grades or credits.
+        dict: Mapping of course code to credit units. The first course wins if codes repeat.
+    """
+    if isinstance(courses, Mapping):
+        return courses
+    credit_map = {}
+    for course in courses:
+        credit_map.setdefault(course.code, course.credit_units)
+    return credit_map
+
+def _weighted_average(grades, credit_map, arg_name):
+    """
+    Computes the credit-weighted grade point average of a list of grades.
+
+    Grades whose course is not in credit_map are skipped.
+
+    Args:
+        grades (list of Grade): Grade objects.
+        credit_map (dict): Mapping of course code to credit units.
+        arg_name (str): Argument name used in the error message.
+
+    Returns:
+        float: Average rounded to 2 decimal places, or 0.0 if there are no credits.
 
     Raises:
-        ValueError: If grades list is empty or contains invalid data.
+        ValueError: If grades contains something other than Grade instances.
     """
-    if not grades:
-        return 0.0
-
     total_points = 0
     total_credits = 0
 
     for grade in grades:
         if not isinstance(grade, Grade):
-            raise ValueError("All items in grades must be Grade instances.")
-        course = next((c for c in courses if c.code == grade.course_code), None)
-        if course:
-            points = grade.get_points()
-            credits = course.credit_units
-            total_points += points * credits
+            raise ValueError(f"All items in {arg_name} must be Grade instances.")
+        credits = credit_map.get(grade.course_code)
+        if credits:
+            total_points += grade.get_points() * credits
             total_credits += credits
 
     if total_credits == 0:
         return 0.0
 
-    gpa = total_points / total_credits
-    return round(gpa, 2)
+    return round(total_points / total_credits, 2)
+
+def calculate_semester_gpa(grades, courses):
+    """
+    Calculates the GPA for a specific semester.
+
+    Args:
+        grades (list of Grade): List of Grade objects for the semester.
+        courses (list of Course or dict): List of Course objects, or a prebuilt
+            code -> credit_units mapping from build_credit_map.
+
+    Returns:
+        float: GPA for the semester, or 0.0 if no grades or credits.
+
+    Raises:
+        ValueError: If grades list is empty or contains invalid data.
+    """
+    if not grades:
+        return 0.0
+    return _weighted_average(grades, build_credit_map(courses), "grades")
 
 def calculate_cgpa(all_grades, courses):
     """
@@ -50,7 +84,8 @@ def calculate_cgpa(all_grades, courses):
 
     Args:
         all_grades (list of Grade): List of all Grade objects for the student.
-        courses (list of Course): List of Course objects to get credit units.
+        courses (list of Course or dict): List of Course objects, or a prebuilt
+            code -> credit_units mapping from build_credit_map.
 
     Returns:
         float: CGPA, or 0.0 if no grades or credits.
@@ -60,25 +95,114 @@ def calculate_cgpa(all_grades, courses):
     """
     if not all_grades:
         return 0.0
+    return _weighted_average(all_grades, build_credit_map(courses), "all_grades")
 
-    total_points = 0
-    total_credits = 0
+def calculate_all_cgpas(grades, courses):
+    """
+    Calculates the CGPA of every student in a single pass over the grades.
 
-    for grade in all_grades:
+    Args:
+        grades (iterable of Grade): Grades of any number of students.
+        courses (list of Course or dict): List of Course objects, or a prebuilt
+            code -> credit_units mapping.
+
+    Returns:
+        dict: Mapping of student ID to CGPA, with the same rounding as calculate_cgpa.
+    """
+    credit_map = build_credit_map(courses)
+    totals = {}
+    for grade in grades:
+        if not isinstance(grade, Grade):
+            raise ValueError("All items in grades must be Grade instances.")
+        entry = totals.setdefault(grade.student_id, [0, 0])
+        credits = credit_map.get(grade.course_code)
+        if credits:
+            entry[0] += grade.get_points() * credits
+            entry[1] += credits
+    return {
+        student_id: round(points / credits, 2) if credits else 0.0
+        for student_id, (points, credits) in totals.items()
+    }
+
+def summarize_semesters(grades, courses):
+    """
+    Summarizes a student's grades per semester in a single pass.
+
+    Grades are grouped once; each semester's GPA, credits and the running CGPA are derived
+    from the group totals, so nothing is re-filtered per semester. Grades whose course is
+    unknown are skipped, as in calculate_cgpa.
+
+    Args:
+        grades (list of Grade): Grades of one student.
+        courses (list of Course or dict): List of Course objects, or a prebuilt
+            code -> credit_units mapping.
+
+    Returns:
+        list of dict: One entry per semester in sorted order, with keys "semester", "gpa",
+            "credits_attempted", "credits_passed" and "cgpa" (running CGPA up to and including
+            the semester). The last entry's "cgpa" equals calculate_cgpa(grades, courses).
+
+    Raises:
+        ValueError: If grades contains something other than Grade instances.
+    """
+    credit_map = build_credit_map(courses)
+    totals = {}
+    for grade in grades:
         if not isinstance(grade, Grade):
-            raise ValueError("All items in all_grades must be Grade instances.")
-        course = next((c for c in courses if c.code == grade.course_code), None)
-        if course:
+            raise ValueError("All items in grades must be Grade instances.")
+        credits = credit_map.get(grade.course_code)
+        if credits:
             points = grade.get_points()
-            credits = course.credit_units
-            total_points += points * credits
-            total_credits += credits
+            entry = totals.setdefault(grade.semester, [0, 0, 0])
+            entry[0] += points * credits
+            entry[1] += credits
+            if points > 0:
+                entry[2] += credits
 
-    if total_credits == 0:
-        return 0.0
+    summary = []
+    total_points = 0
+    total_credits = 0
+    for semester in sorted(totals):
+        points, credits, passed = totals[semester]
+        total_points += points
+        total_credits += credits
+        summary.append({
+            "semester": semester,
+            "gpa": round(points / credits, 2),
+            "credits_attempted": credits,
+            "credits_passed": passed,
+            "cgpa": round(total_points / total_credits, 2),
+        })
+    return summary
+
+def calculate_student_semester_gpas(repository, student_id):
+    """
+    Returns the GPA of every semester a student has grades in.
+
+    The values are read from the repository's running totals, so the cost does not depend on
+    how many grades the student has.
+
+    Args:
+        repository (Repository): Indexed data store.
+        student_id (str): Student ID.
+
+    Returns:
+        list of tuple: (semester, gpa) pairs sorted by semester.
+    """
+    return repository.aggregates.semester_gpas(student_id)
 
-    cgpa = total_points / total_credits
-    return round(cgpa, 2)
+def calculate_student_cgpa(repository, student_id):
+    """
+    Returns the CGPA of a student from the repository's running totals.
+
+    Args:
+        repository (Repository): Indexed data store.
+        student_id (str): Student ID.
+
+    Returns:
+        float: CGPA, or 0.0 if no grades or credits.
+    """
+    return repository.aggregates.cgpa(student_id)
 
 def get_grade_distribution(grades):
     """
@@ -96,5 +220,3 @@ def get_grade_distribution(grades):
             distribution[grade.grade] += 1
     return distribution
 
-# Note: The credit_units for grades need to be accessible. In practice, this might require joining with course data.
-# For now, assuming Grade objects have a credit_units attribute or it's passed separately.
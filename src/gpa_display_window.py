@@ -6,7 +6,9 @@ This module defines the GPADisplayWindow class for displaying GPA and CGPA repor
 
 import customtkinter as ctk
 from tkinter import ttk, messagebox
-from src.gpa_calculator import calculate_semester_gpa, calculate_cgpa
+from src.gpa_calculator import calculate_student_semester_gpas, calculate_student_cgpa
+from src.student_picker import StudentPicker
+from src.task_scheduler import TaskScheduler
 
 class GPADisplayWindow:
     """
@@ -23,6 +25,8 @@ class GPADisplayWindow:
         # Center the window
         self.window.transient(root)
         self.window.grab_set()
+        self.window.protocol("WM_DELETE_WINDOW", self.close)
+        self.tasks = TaskScheduler(self.window)
 
         # Title
         self.title_label = ctk.CTkLabel(self.window, text="GPA & CGPA Display",
@@ -32,15 +36,17 @@ class GPADisplayWindow:
         # Student selection
         self.student_label = ctk.CTkLabel(self.window, text="Select Student:")
         self.student_label.pack(pady=(10, 0))
-        self.student_var = ctk.StringVar()
-        self.student_combo = ctk.CTkComboBox(self.window, variable=self.student_var,
-                                            values=[f"{s.student_id} - {s.name}" for s in self.app.students])
-        self.student_combo.pack(pady=(0, 10))
+        self.student_picker = StudentPicker(self.window, self.app.repo, command=lambda student_id: self.display_gpa(),
+                                            width=300)
+        self.student_picker.pack(pady=(0, 10))
 
         # Display button
         self.display_btn = ctk.CTkButton(self.window, text="Display GPA", command=self.display_gpa)
         self.display_btn.pack(pady=(10, 10))
 
+        # Spinner shown while the GPA table is computed in the background
+        self.spinner = ctk.CTkProgressBar(self.window, mode="indeterminate", height=6)
+
         # GPA display area
         self.gpa_frame = ctk.CTkScrollableFrame(self.window)
         self.gpa_frame.pack(pady=10, padx=20, fill="both", expand=True)
@@ -51,37 +57,48 @@ class GPADisplayWindow:
 
     def display_gpa(self):
         """Displays GPA and CGPA for the selected student."""
-        selected = self.student_var.get()
-        if not selected:
+        student_id = self.student_picker.get()
+        if not student_id:
             messagebox.showerror("Error", "Please select a student.")
             return
-        student_id = selected.split(" - ")[0]
-        student = next((s for s in self.app.students if s.student_id == student_id), None)
+        student = self.app.repo.get_student(student_id)
         if not student:
             messagebox.showerror("Error", "Student not found.")
             return
 
-        # Clear previous display
-        for widget in self.gpa_frame.winfo_children():
-            widget.destroy()
+        repo = self.app.repo
+        self.set_busy(True)
+        self.tasks.submit("gpa", lambda: (calculate_student_semester_gpas(repo, student_id),
+                                          calculate_student_cgpa(repo, student_id)),
+                          self.show_gpa, self.show_error)
+
+    def set_busy(self, busy):
+        """Shows or hides the spinner."""
+        if busy:
+            self.spinner.pack(before=self.gpa_frame, padx=40, fill="x")
+            self.spinner.start()
+        else:
+            self.spinner.stop()
+            self.spinner.pack_forget()
 
-        # Get student's grades
-        grades = [g for g in self.app.grades if g.student_id == student_id]
+    def show_error(self, error):
+        """Reports a failed GPA calculation."""
+        self.set_busy(False)
+        messagebox.showerror("Error", f"Could not calculate GPA: {error}", parent=self.window)
 
-        # Group grades by semester
-        semesters = {}
-        for grade in grades:
-            sem = grade.semester
-            if sem not in semesters:
-                semesters[sem] = []
-            semesters[sem].append(grade)
+    def show_gpa(self, result):
+        """
+        Shows the result of a background GPA calculation.
 
-        # Calculate GPA per semester
-        sem_list = sorted(semesters.keys())
-        gpa_data = []
-        for sem in sem_list:
-            gpa = calculate_semester_gpa(semesters[sem], self.app.courses)
-            gpa_data.append((sem, gpa))
+        Args:
+            result (tuple): (semester GPAs, CGPA) of the student.
+        """
+        self.set_busy(False)
+        gpa_data, cgpa = result
+
+        # Clear previous display
+        for widget in self.gpa_frame.winfo_children():
+            widget.destroy()
 
         # Display semester GPAs in a table
         if gpa_data:
@@ -102,6 +119,10 @@ class GPADisplayWindow:
             no_data_label = ctk.CTkLabel(self.gpa_frame, text="No grades available for this student.")
             no_data_label.pack(pady=20)
 
-        # Calculate and display CGPA
-        cgpa = calculate_cgpa(grades, self.app.courses)
+        # Display CGPA
         self.cgpa_label.configure(text=f"Cumulative GPA (CGPA): {cgpa:.2f}")
+
+    def close(self):
+        """Stops background work and closes the window."""
+        self.tasks.shutdown()
+        self.window.destroy()
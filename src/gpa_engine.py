@@ -0,0 +1,390 @@
+"""
+GPA Engine Module
+
+This module computes GPA and CGPA for a whole cohort at once using NumPy. Grades are encoded
+into integer arrays (student, course, semester, points, credits) and the weighted sums are
+computed per group with np.bincount instead of looping over Grade objects per student.
+
+The results match calculate_semester_gpa and calculate_cgpa in gpa_calculator exactly: the sums
+are integers (exact in float64), the division is the same IEEE division Python performs, and the
+final 2-decimal rounding uses Python's round() once per group rather than np.round, which rounds
+half-way cases differently.
+
+The cohort statistics used by the analytics charts (CGPA values, course x grade counts and
+per-semester GPA percentiles) are computed with the same grouped bincounts and one sort,
+without a Python loop over groups.
+"""
+
+import numpy as np
+from .grade import Grade
+from .gpa_calculator import build_credit_map
+
+GRADE_POINTS = {"A": 5, "B": 4, "C": 3, "D": 2, "E": 1, "F": 0}
+
+def _factorize(values):
+    """
+    Encodes a sequence of hashable values as integer codes.
+
+    Args:
+        values (iterable): Values to encode.
+
+    Returns:
+        tuple: (codes as np.ndarray of int64, list of unique values in first-seen order).
+    """
+    lookup = {}
+    codes = [lookup.setdefault(value, len(lookup)) for value in values]
+    return np.asarray(codes, dtype=np.int64), list(lookup)
+
+class EncodedGrades:
+    """
+    Integer-coded column arrays for a set of grades.
+
+    Attributes:
+        student_codes (np.ndarray): Index into student_ids for each grade.
+        course_codes (np.ndarray): Index into course_ids for each grade.
+        semester_codes (np.ndarray): Index into semesters for each grade.
+        points (np.ndarray): Grade points for each grade.
+        credits (np.ndarray): Credit units for each grade, 0 if the course is unknown.
+        student_ids (list of str): Student ID for each student code.
+        course_ids (list of str): Course code for each course code index.
+        semesters (list of str): Semester name for each semester code.
+    """
+
+    def __init__(self, student_codes, course_codes, semester_codes, points, credits,
+                 student_ids, course_ids, semesters):
+        self.student_codes = student_codes
+        self.course_codes = course_codes
+        self.semester_codes = semester_codes
+        self.points = points
+        self.credits = credits
+        self.student_ids = student_ids
+        self.course_ids = course_ids
+        self.semesters = semesters
+
+    def __len__(self):
+        return len(self.points)
+
+    @classmethod
+    def from_columns(cls, student_ids, course_codes, grade_letters, semesters, courses):
+        """
+        Encodes grades given as parallel columns of strings.
+
+        Args:
+            student_ids (sequence of str): Student ID of each grade.
+            course_codes (sequence of str): Course code of each grade.
+            grade_letters (sequence of str): Grade letter of each grade.
+            semesters (sequence of str): Semester of each grade.
+            courses (list of Course or dict): Courses, or a code -> credit_units mapping.
+
+        Returns:
+            EncodedGrades: Encoded arrays.
+        """
+        credit_map = build_credit_map(courses)
+        student_codes, student_labels = _factorize(student_ids)
+        course_index, course_labels = _factorize(course_codes)
+        semester_codes, semester_labels = _factorize(semesters)
+        letter_index, letter_labels = _factorize(grade_letters)
+
+        letter_points = np.array([GRADE_POINTS.get(str(letter).upper(), 0) for letter in letter_labels],
+                                 dtype=np.int64)
+        course_credits = np.array([credit_map.get(code, 0) or 0 for code in course_labels], dtype=np.int64)
+
+        return cls(
+            student_codes,
+            course_index,
+            semester_codes,
+            letter_points[letter_index],
+            course_credits[course_index],
+            student_labels,
+            course_labels,
+            semester_labels,
+        )
+
+    @classmethod
+    def from_table(cls, table, courses):
+        """
+        Encodes a GradeTable by reusing its interned column codes.
+
+        Args:
+            table (GradeTable): Columnar grades.
+            courses (list of Course or dict): Courses, or a code -> credit_units mapping.
+
+        Returns:
+            EncodedGrades: Encoded arrays.
+        """
+        credit_map = build_credit_map(courses)
+        letter_points = np.array([GRADE_POINTS.get(letter, 0) for letter in table.labels["grade"]], dtype=np.int64)
+        course_credits = np.array([credit_map.get(code, 0) or 0 for code in table.labels["course_code"]],
+                                  dtype=np.int64)
+        course_index = table.to_numpy("course_code").astype(np.int64)
+        return cls(
+            table.to_numpy("student_id").astype(np.int64),
+            course_index,
+            table.to_numpy("semester").astype(np.int64),
+            letter_points[table.to_numpy("grade")],
+            course_credits[course_index],
+            list(table.labels["student_id"]),
+            list(table.labels["course_code"]),
+            list(table.labels["semester"]),
+        )
+
+    @classmethod
+    def from_frame(cls, frame, courses):
+        """
+        Encodes a grades DataFrame by reusing its categorical codes.
+
+        Args:
+            frame (pandas.DataFrame): Grades as returned by storage.load_grades_frame, with
+                categorical student_id, course_code, grade and semester columns.
+            courses (list of Course, dict or pandas.DataFrame): Courses, a code -> credit_units
+                mapping, or a courses DataFrame from storage.load_courses_frame.
+
+        Returns:
+            EncodedGrades: Encoded arrays.
+        """
+        if hasattr(courses, "columns"):
+            courses = dict(zip(courses["code"], courses["credit_units"].astype(int)))
+        credit_map = build_credit_map(courses)
+
+        def codes(column):
+            return frame[column].cat.codes.to_numpy(dtype=np.int64)
+
+        def labels(column):
+            return list(frame[column].cat.categories)
+
+        letter_points = np.array([GRADE_POINTS.get(letter, 0) for letter in labels("grade")], dtype=np.int64)
+        course_credits = np.array([credit_map.get(code, 0) or 0 for code in labels("course_code")],
+                                  dtype=np.int64)
+        course_index = codes("course_code")
+        return cls(
+            codes("student_id"),
+            course_index,
+            codes("semester"),
+            letter_points[codes("grade")],
+            course_credits[course_index],
+            labels("student_id"),
+            labels("course_code"),
+            labels("semester"),
+        )
+
+    @classmethod
+    def from_grades(cls, grades, courses):
+        """
+        Encodes a list of Grade objects.
+
+        Args:
+            grades (list of Grade): Grades to encode.
+            courses (list of Course or dict): Courses, or a code -> credit_units mapping.
+
+        Returns:
+            EncodedGrades: Encoded arrays.
+
+        Raises:
+            ValueError: If grades contains something other than Grade instances.
+        """
+        if any(not isinstance(grade, Grade) for grade in grades):
+            raise ValueError("All items in grades must be Grade instances.")
+        return cls.from_columns(
+            [grade.student_id for grade in grades],
+            [grade.course_code for grade in grades],
+            [grade.grade for grade in grades],
+            [grade.semester for grade in grades],
+            courses,
+        )
+
+def _grouped_totals(group_codes, encoded, num_groups):
+    """
+    Computes the unrounded credit-weighted average for each group.
+
+    Args:
+        group_codes (np.ndarray): Group index of each grade.
+        encoded (EncodedGrades): Encoded grades.
+        num_groups (int): Number of possible groups.
+
+    Returns:
+        tuple: (np.ndarray of group indexes that have grades, np.ndarray of averages (0.0 for
+            groups without credits), np.ndarray of total credits).
+    """
+    weighted = encoded.points * encoded.credits
+    total_points = np.bincount(group_codes, weights=weighted, minlength=num_groups)
+    total_credits = np.bincount(group_codes, weights=encoded.credits, minlength=num_groups)
+    present = np.flatnonzero(np.bincount(group_codes, minlength=num_groups))
+
+    points = total_points[present]
+    credits = total_credits[present]
+    averages = np.divide(points, credits, out=np.zeros_like(points), where=credits > 0)
+    return present, averages, credits
+
+def _grouped_averages(group_codes, encoded, num_groups):
+    """
+    Computes the rounded credit-weighted average for each group.
+
+    Args:
+        group_codes (np.ndarray): Group index of each grade.
+        encoded (EncodedGrades): Encoded grades.
+        num_groups (int): Number of possible groups.
+
+    Returns:
+        tuple: (np.ndarray of group indexes that have grades, list of rounded averages).
+    """
+    present, averages, _ = _grouped_totals(group_codes, encoded, num_groups)
+    return present, [round(value, 2) for value in averages.tolist()]
+
+def compute_semester_gpas(encoded):
+    """
+    Computes the GPA of every (student, semester) pair.
+
+    Args:
+        encoded (EncodedGrades): Encoded grades.
+
+    Returns:
+        dict: Mapping of (student_id, semester) to GPA.
+    """
+    if not len(encoded):
+        return {}
+    num_semesters = len(encoded.semesters)
+    pair_codes = encoded.student_codes * num_semesters + encoded.semester_codes
+    present, gpas = _grouped_averages(pair_codes, encoded, len(encoded.student_ids) * num_semesters)
+    return {
+        (encoded.student_ids[pair // num_semesters], encoded.semesters[pair % num_semesters]): gpa
+        for pair, gpa in zip(present.tolist(), gpas)
+    }
+
+def compute_cgpas(encoded):
+    """
+    Computes the CGPA of every student.
+
+    Args:
+        encoded (EncodedGrades): Encoded grades.
+
+    Returns:
+        dict: Mapping of student_id to CGPA.
+    """
+    if not len(encoded):
+        return {}
+    present, cgpas = _grouped_averages(encoded.student_codes, encoded, len(encoded.student_ids))
+    return {encoded.student_ids[code]: cgpa for code, cgpa in zip(present.tolist(), cgpas)}
+
+def compute_cohort_gpas(grades, courses):
+    """
+    Computes semester GPAs and CGPAs for every student in one pass.
+
+    Args:
+        grades (list of Grade): Grades of the whole cohort.
+        courses (list of Course or dict): Courses, or a code -> credit_units mapping.
+
+    Returns:
+        tuple: (dict of (student_id, semester) -> GPA, dict of student_id -> CGPA).
+    """
+    encoded = EncodedGrades.from_grades(grades, courses)
+    return compute_semester_gpas(encoded), compute_cgpas(encoded)
+
+def cgpa_values(encoded):
+    """
+    Returns the CGPA of every student with credit-bearing grades, for distribution charts.
+
+    Students whose grades are all for unknown courses are left out rather than counted as 0.0.
+
+    Args:
+        encoded (EncodedGrades): Encoded grades.
+
+    Returns:
+        np.ndarray: Unrounded CGPAs, one per student.
+    """
+    if not len(encoded):
+        return np.zeros(0)
+    _, averages, credits = _grouped_totals(encoded.student_codes, encoded, len(encoded.student_ids))
+    return averages[credits > 0]
+
+def course_grade_counts(encoded):
+    """
+    Counts the grades of every course by letter.
+
+    Args:
+        encoded (EncodedGrades): Encoded grades.
+
+    Returns:
+        tuple: (list of course codes in sorted order, np.ndarray of shape
+            (num_courses, len(Grade.VALID_GRADES)) with the count of each letter, columns in
+            Grade.VALID_GRADES order).
+    """
+    letters = Grade.VALID_GRADES
+    if not len(encoded):
+        return [], np.zeros((0, len(letters)), dtype=np.int64)
+    counts = _letter_counts(encoded.course_codes, encoded, len(encoded.course_ids))
+    order = sorted(range(len(encoded.course_ids)), key=encoded.course_ids.__getitem__)
+    return [encoded.course_ids[i] for i in order], counts[order]
+
+def student_grade_counts(encoded):
+    """
+    Counts the grades of every student by letter.
+
+    Args:
+        encoded (EncodedGrades): Encoded grades.
+
+    Returns:
+        tuple: (list of student IDs in encoded order, np.ndarray of shape
+            (num_students, len(Grade.VALID_GRADES)) with the count of each letter, columns in
+            Grade.VALID_GRADES order).
+    """
+    if not len(encoded):
+        return [], np.zeros((0, len(Grade.VALID_GRADES)), dtype=np.int64)
+    return list(encoded.student_ids), _letter_counts(encoded.student_codes, encoded, len(encoded.student_ids))
+
+def _letter_counts(group_codes, encoded, num_groups):
+    """
+    Counts the grades of each group by letter with one bincount.
+
+    Args:
+        group_codes (np.ndarray): Group index of each grade.
+        encoded (EncodedGrades): Encoded grades.
+        num_groups (int): Number of possible groups.
+
+    Returns:
+        np.ndarray: Shape (num_groups, len(Grade.VALID_GRADES)), columns in Grade.VALID_GRADES order.
+    """
+    letters = Grade.VALID_GRADES
+    letter_of_points = np.zeros(max(GRADE_POINTS.values()) + 1, dtype=np.int64)
+    for index, letter in enumerate(letters):
+        letter_of_points[GRADE_POINTS[letter]] = index
+    cells = group_codes * len(letters) + letter_of_points[encoded.points]
+    return np.bincount(cells, minlength=num_groups * len(letters)).reshape(-1, len(letters))
+
+def semester_percentiles(encoded, percentiles=(10, 25, 50, 75, 90)):
+    """
+    Computes percentiles of the semester GPAs of all students, for every semester.
+
+    All (student, semester) GPAs are computed with one grouped bincount, sorted once by
+    semester and GPA, and each percentile is read from the sorted array by linear
+    interpolation (the default method of np.percentile). Pairs without credits are left out.
+
+    Args:
+        encoded (EncodedGrades): Encoded grades.
+        percentiles (sequence of float): Percentiles to compute, between 0 and 100.
+
+    Returns:
+        tuple: (list of semesters in sorted order, np.ndarray of shape
+            (num_semesters, len(percentiles))).
+    """
+    num_semesters = len(encoded.semesters)
+    if not len(encoded):
+        return [], np.zeros((0, len(percentiles)))
+    pair_codes = encoded.student_codes * num_semesters + encoded.semester_codes
+    present, gpas, credits = _grouped_totals(pair_codes, encoded, len(encoded.student_ids) * num_semesters)
+    semester_of_pair = (present % num_semesters)[credits > 0]
+    gpas = gpas[credits > 0]
+
+    # Sort by semester, then GPA; each semester is then a contiguous sorted run
+    order = np.lexsort((gpas, semester_of_pair))
+    gpas = gpas[order]
+    sizes = np.bincount(semester_of_pair, minlength=num_semesters)
+    starts = np.concatenate(([0], np.cumsum(sizes)[:-1]))
+
+    has_data = np.flatnonzero(sizes)
+    labels = sorted(has_data.tolist(), key=encoded.semesters.__getitem__)
+    rank = np.asarray(percentiles, dtype=float)[None, :] / 100 * (sizes[labels, None] - 1)
+    low = np.floor(rank).astype(np.int64)
+    high = np.minimum(low + 1, sizes[labels, None] - 1)
+    base = starts[labels, None]
+    values = gpas[base + low] + (gpas[base + high] - gpas[base + low]) * (rank - low)
+    return [encoded.semesters[i] for i in labels], values
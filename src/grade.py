@@ -15,6 +15,8 @@ class Grade:
         semester (str): Semester of the grade.
     """
 
+    __slots__ = ("student_id", "course_code", "grade", "semester")
+
     VALID_GRADES = ["A", "B", "C", "D", "E", "F"]
 
     def __init__(self, student_id, course_code, grade, semester):
@@ -5,8 +5,10 @@ This module defines the GradeEntryWindow class for entering grades.
 """
 
 import tkinter as tk
-from tkinter import messagebox, ttk
+from tkinter import filedialog, messagebox, ttk
 from src.grade import Grade
+from src.bulk_import import import_grade_sheet
+from src.student_picker import StudentPicker
 
 class GradeEntryWindow:
     """
@@ -22,11 +24,8 @@ class GradeEntryWindow:
 
         # Student selector
         tk.Label(self.window, text="Select Student:").pack(pady=5)
-        self.student_var = tk.StringVar()
-        self.student_combo = ttk.Combobox(self.window, textvariable=self.student_var)
-        self.student_combo['values'] = [f"{s.student_id} - {s.name}" for s in self.app.students]
-        self.student_combo.pack(pady=5)
-        self.student_combo.bind("<<ComboboxSelected>>", self.on_student_select)
+        self.student_picker = StudentPicker(self.window, self.app.repo, command=self.on_student_select, width=300)
+        self.student_picker.pack(pady=5)
 
         # Course selector
         tk.Label(self.window, text="Select Course:").pack(pady=5)
@@ -46,55 +45,82 @@ class GradeEntryWindow:
         self.grade_combo = ttk.Combobox(self.window, textvariable=self.grade_var, values=Grade.VALID_GRADES)
         self.grade_combo.pack(pady=5)
 
-        # Save button
-        tk.Button(self.window, text="Save Grade", command=self.save_grade).pack(pady=20)
+        # Save and import buttons
+        button_frame = tk.Frame(self.window)
+        button_frame.pack(pady=20)
+        tk.Button(button_frame, text="Save Grade", command=self.save_grade).pack(side="left", padx=5)
+        tk.Button(button_frame, text="Import Result Sheet", command=self.import_sheet).pack(side="left", padx=5)
 
         # Table for existing grades (placeholder)
         self.grade_table = tk.Text(self.window, height=10, width=50)
         self.grade_table.pack(pady=10)
 
-    def on_student_select(self, event):
+    def on_student_select(self, student_id):
         """Updates course combo based on selected student."""
-        selected = self.student_var.get()
-        if selected:
-            student_id = selected.split(" - ")[0]
-            # Filter courses (placeholder logic)
-            self.course_combo['values'] = [f"{c.code} - {c.name}" for c in self.app.courses]
+        # Filter courses (placeholder logic)
+        self.course_combo['values'] = [f"{c.code} - {c.name}" for c in self.app.repo.courses]
+        self.update_grade_table()
 
     def save_grade(self):
         """Saves the entered grade."""
-        student_str = self.student_var.get()
+        student_id = self.student_picker.get()
         course_str = self.course_var.get()
         semester = self.semester_var.get()
         grade_letter = self.grade_var.get()
 
-        if not all([student_str, course_str, semester, grade_letter]):
+        if not all([student_id, course_str, semester, grade_letter]):
             messagebox.showerror("Error", "Please fill all fields.")
             return
 
-        student_id = student_str.split(" - ")[0]
         course_code = course_str.split(" - ")[0]
 
         # Check for duplicate
-        for g in self.app.grades:
-            if g.student_id == student_id and g.course_code == course_code and g.semester == semester:
-                messagebox.showerror("Error", "Grade already exists for this student, course, and semester.")
-                return
+        if self.app.repo.has_grade(student_id, course_code, semester):
+            messagebox.showerror("Error", "Grade already exists for this student, course, and semester.")
+            return
 
         try:
             grade = Grade(student_id, course_code, grade_letter, semester)
-            self.app.grades.append(grade)
+            self.app.repo.add_grade(grade)
             self.app.save_data()
             messagebox.showinfo("Success", "Grade saved successfully!")
             self.update_grade_table()
         except ValueError as e:
             messagebox.showerror("Error", str(e))
 
+    def import_sheet(self):
+        """Imports a CSV/XLSX result sheet, using the selected course and semester as defaults."""
+        path = filedialog.askopenfilename(parent=self.window, title="Select Result Sheet",
+                                          filetypes=[("Result sheets", "*.csv *.xlsx"), ("All files", "*.*")])
+        if not path:
+            return
+
+        course_str = self.course_var.get()
+        course_code = course_str.split(" - ")[0] if course_str else None
+        try:
+            result = import_grade_sheet(path, self.app.repo, course_code=course_code,
+                                        semester=self.semester_var.get() or None)
+        except (ValueError, ImportError, OSError) as e:
+            messagebox.showerror("Error", str(e))
+            return
+
+        if result.accepted:
+            self.app.save_data()
+            self.update_grade_table()
+        message = str(result)
+        if result.rejects:
+            shown = "\n".join(f"Row {row}: {reason}" for row, reason in result.rejects[:20])
+            more = len(result.rejects) - 20
+            message += f"\n\n{shown}" + (f"\n... and {more} more" if more > 0 else "")
+            messagebox.showwarning("Import Finished", message)
+        else:
+            messagebox.showinfo("Success", message)
+
     def update_grade_table(self):
         """Updates the grade table display."""
         self.grade_table.delete(1.0, tk.END)
-        student_id = self.student_var.get().split(" - ")[0] if self.student_var.get() else None
+        student_id = self.student_picker.get()
         if student_id:
-            grades = [g for g in self.app.grades if g.student_id == student_id]
+            grades = self.app.repo.grades_for_student(student_id)
             for g in grades:
                 self.grade_table.insert(tk.END, f"{g.course_code}: {g.grade} ({g.semester})\n")
\ No newline at end of file
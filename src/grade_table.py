@@ -0,0 +1,148 @@
+"""
+Grade Table Module
+
+This module defines GradeTable, a columnar container for large numbers of grades. Each column
+is an array of integer codes into a list of interned strings, so a grade costs four machine
+integers instead of a Python object with four string references. Rows are exposed as GradeRow
+views, which behave like Grade objects (get_points, to_dict, validate, isinstance checks).
+"""
+
+import sys
+from array import array
+from .grade import Grade
+
+COLUMNS = ("student_id", "course_code", "grade", "semester")
+
+class GradeRow(Grade):
+    """
+    Read/write view of one row of a GradeTable.
+
+    Attribute access goes through to the table columns; the Grade methods work unchanged
+    because they only read the attributes.
+    """
+
+    __slots__ = ("_table", "_index")
+
+    def __init__(self, table, index):
+        """
+        Initializes a view of a table row.
+
+        Args:
+            table (GradeTable): Table holding the row.
+            index (int): Row index.
+        """
+        self._table = table
+        self._index = index
+
+def _column_property(name):
+    """Creates a property reading and writing one column of the row's table."""
+    def getter(self):
+        return self._table.get(self._index, name)
+
+    def setter(self, value):
+        if name == "grade":
+            value = value.upper()
+        self._table.set(self._index, name, value)
+
+    return property(getter, setter, doc=f"str: The row's {name} value.")
+
+for _name in COLUMNS:
+    setattr(GradeRow, _name, _column_property(_name))
+
+class GradeTable:
+    """
+    Columnar storage for grades with interned string codes.
+
+    Attributes:
+        labels (dict): Column name -> list of distinct strings; a code is an index into it.
+        codes (dict): Column name -> array('i') of codes, one per row.
+    """
+
+    def __init__(self):
+        self.labels = {name: [] for name in COLUMNS}
+        self.codes = {name: array('i') for name in COLUMNS}
+        self._lookup = {name: {} for name in COLUMNS}
+
+    def __len__(self):
+        return len(self.codes["student_id"])
+
+    def __getitem__(self, index):
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("GradeTable index out of range")
+        return GradeRow(self, index)
+
+    def __iter__(self):
+        for index in range(len(self)):
+            yield GradeRow(self, index)
+
+    @classmethod
+    def from_grades(cls, grades):
+        """
+        Builds a table from Grade objects or any iterable of them, e.g. storage.iter_grades().
+
+        Args:
+            grades (iterable of Grade): Grades to store.
+
+        Returns:
+            GradeTable: New table.
+        """
+        table = cls()
+        for grade in grades:
+            table.append(grade.student_id, grade.course_code, grade.grade, grade.semester)
+        return table
+
+    def _code(self, name, value):
+        """Returns the code of a value in a column, interning it if new."""
+        lookup = self._lookup[name]
+        code = lookup.get(value)
+        if code is None:
+            code = len(lookup)
+            lookup[value] = code
+            self.labels[name].append(sys.intern(value) if isinstance(value, str) else value)
+        return code
+
+    def append(self, student_id, course_code, grade, semester):
+        """
+        Appends a row.
+
+        Args:
+            student_id (str): Student ID.
+            course_code (str): Course code.
+            grade (str): Grade letter; stored upper-case like Grade does.
+            semester (str): Semester.
+        """
+        for name, value in zip(COLUMNS, (student_id, course_code, grade.upper(), semester)):
+            self.codes[name].append(self._code(name, value))
+
+    def get(self, index, name):
+        """Returns the value of one column in one row."""
+        return self.labels[name][self.codes[name][index]]
+
+    def set(self, index, name, value):
+        """Sets the value of one column in one row."""
+        self.codes[name][index] = self._code(name, value)
+
+    def to_numpy(self, name):
+        """
+        Returns a column's codes as a NumPy array.
+
+        The array is a copy made through the buffer protocol: a view would stop the
+        underlying array from growing while it is alive.
+
+        Args:
+            name (str): Column name.
+
+        Returns:
+            numpy.ndarray: C int codes.
+        """
+        import numpy as np
+        return np.array(self.codes[name], dtype=np.intc)
+
+    def nbytes(self):
+        """Returns the approximate memory used by the code arrays and the interned labels."""
+        size = sum(codes.itemsize * len(codes) for codes in self.codes.values())
+        for labels in self.labels.values():
+            size += sum(sys.getsizeof(label) for label in labels)
+        return size
@@ -0,0 +1,37 @@
+"""
+Loading Splash Module
+
+This module defines the LoadingSplash class, a small progress window shown while the
+application's data is still loading in the background.
+"""
+
+import customtkinter as ctk
+
+class LoadingSplash:
+    """
+    Progress window with an indeterminate progress bar and a status message.
+    """
+
+    def __init__(self, root, message="Loading data..."):
+        self.root = root
+        self.window = ctk.CTkToplevel(root)
+        self.window.title("Loading")
+        self.window.geometry("320x120")
+        self.window.resizable(False, False)
+        self.window.transient(root)
+        self.window.protocol("WM_DELETE_WINDOW", lambda: None)  # Closes itself once loading ends
+
+        self.message_label = ctk.CTkLabel(self.window, text=message, font=ctk.CTkFont(size=13))
+        self.message_label.pack(pady=(25, 10), padx=20)
+        self.progress_bar = ctk.CTkProgressBar(self.window, mode="indeterminate")
+        self.progress_bar.pack(pady=(0, 20), padx=30, fill="x")
+        self.progress_bar.start()
+
+    def set_message(self, message):
+        """Updates the status message."""
+        self.message_label.configure(text=message)
+
+    def close(self):
+        """Stops the progress bar and closes the window."""
+        self.progress_bar.stop()
+        self.window.destroy()
@@ -23,6 +23,7 @@ class LoginWindow:
         # Center the window
         self.window.transient(root)
         self.window.grab_set()
+        self.window.protocol("WM_DELETE_WINDOW", self.app.exit)
 
         # Main title
         self.title_label = ctk.CTkLabel(self.window, text="Academic Portal",
@@ -2,11 +2,18 @@
 PDF Export Dialog Module
 
 This module defines the PDFExportDialog class for exporting PDF reports.
+
+"Export All Students" snapshots the report data on the Tk thread and renders it in spawned
+worker processes, so later edits do not leak into a running export. Closing the dialog
+while it runs cancels the reports that have not started.
 """
 
+import multiprocessing
+import threading
 import customtkinter as ctk
 from tkinter import filedialog, messagebox
 from src.pdf_report import generate_student_report
+from src.student_picker import StudentPicker
 
 class PDFExportDialog:
     """
@@ -18,7 +25,7 @@ class PDFExportDialog:
         self.app = app_instance
         self.window = ctk.CTkToplevel(root)
         self.window.title("Export PDF Report")
-        self.window.geometry("400x250")
+        self.window.geometry("400x520")  # Room for the picker's match list
 
         # Center the window
         self.window.transient(root)
@@ -38,10 +45,8 @@ class PDFExportDialog:
         student_frame.pack(pady=10, padx=20, fill="x")
         student_label = ctk.CTkLabel(student_frame, text="Select Student:")
         student_label.pack(anchor="w", pady=(10, 5))
-        self.student_var = ctk.StringVar()
-        self.student_combo = ctk.CTkComboBox(student_frame, variable=self.student_var,
-                                            values=[f"{s.student_id} - {s.name}" for s in self.app.students])
-        self.student_combo.pack(fill="x", pady=(0, 10))
+        self.student_picker = StudentPicker(student_frame, self.app.repo)
+        self.student_picker.pack(fill="x", pady=(0, 10))
 
         # Filename
         filename_frame = ctk.CTkFrame(main_frame, fg_color="transparent")
@@ -54,16 +59,30 @@ class PDFExportDialog:
 
         # Export button
         export_button = ctk.CTkButton(main_frame, text="Export PDF", command=self.export_pdf, height=35)
-        export_button.pack(pady=(10, 20), padx=20, fill="x")
+        export_button.pack(pady=(10, 5), padx=20, fill="x")
+
+        # Batch export of every student, one file per student under per-department folders
+        self.batch_button = ctk.CTkButton(main_frame, text="Export All Students...",
+                                          command=self.export_all, height=35)
+        self.batch_button.pack(pady=5, padx=20, fill="x")
+        self.resume_var = ctk.BooleanVar(value=True)
+        self.resume_check = ctk.CTkCheckBox(main_frame, text="Skip reports that are up to date",
+                                            variable=self.resume_var)
+        self.resume_check.pack(pady=(0, 5), padx=20, anchor="w")
+        self.progress_label = ctk.CTkLabel(main_frame, text="")
+        self.progress_label.pack(pady=(0, 10))
+        self._batch_progress = None
+        self._batch_result = None
+        self._batch_cancel = None
+        self.window.protocol("WM_DELETE_WINDOW", self.close)
 
     def export_pdf(self):
         """Exports the PDF report."""
-        selected = self.student_var.get()
-        if not selected:
+        student_id = self.student_picker.get()
+        if not student_id:
             messagebox.showerror("Error", "Please select a student.")
             return
-        student_id = selected.split(" - ")[0]
-        student = next((s for s in self.app.students if s.student_id == student_id), None)
+        student = self.app.repo.get_student(student_id)
         if not student:
             messagebox.showerror("Error", "Student not found.")
             return
@@ -73,7 +92,62 @@ class PDFExportDialog:
             messagebox.showerror("Error", "Please enter a filename.")
             return
 
-        grades = [g for g in self.app.grades if g.student_id == student_id]
-        generate_student_report(student, grades, self.app.courses, filename)
+        grades = self.app.repo.grades_for_student(student_id)
+        generate_student_report(student, grades, self.app.repo.courses, filename,
+                                cgpa=self.app.repo.aggregates.cgpa(student_id))
         messagebox.showinfo("Success", f"PDF exported to {filename}")
         self.window.destroy()
+
+    def export_all(self):
+        """Exports a report for every student into a chosen directory in the background."""
+        from src.batch_reports import build_jobs, run_report_jobs
+        out_dir = filedialog.askdirectory(parent=self.window, title="Select Output Directory")
+        if not out_dir:
+            return
+        self.batch_button.configure(state="disabled")
+        try:
+            jobs, skipped = build_jobs(self.app.repo, out_dir, resume=self.resume_var.get())
+        except ValueError as e:
+            self.batch_button.configure(state="normal")
+            messagebox.showerror("Error", str(e), parent=self.window)
+            return
+        self._batch_progress = (len(skipped), len(jobs) + len(skipped))
+        self._batch_result = None
+        self._batch_cancel = cancel = threading.Event()
+
+        def progress(done, total):
+            self._batch_progress = (done, total)
+
+        def run():
+            try:
+                self._batch_result = run_report_jobs(out_dir, jobs, skipped, progress=progress, cancel=cancel,
+                                                     mp_context=multiprocessing.get_context("spawn"))
+            except Exception as e:
+                self._batch_result = e
+
+        threading.Thread(target=run, daemon=True).start()
+        self._poll_batch()
+
+    def close(self):
+        """Closes the dialog, cancelling a running batch export after confirmation."""
+        if self._batch_cancel is not None and self._batch_result is None:
+            if not messagebox.askyesno("Batch Export", "Reports are still being exported. Cancel the "
+                                                       "remaining reports and close?", parent=self.window):
+                return
+            self._batch_cancel.set()
+        self.window.destroy()
+
+    def _poll_batch(self):
+        """Shows batch progress and reports the outcome when the run finishes."""
+        if not self.window.winfo_exists():
+            return
+        done, total = self._batch_progress
+        self.progress_label.configure(text=f"{done}/{total} reports")
+        if self._batch_result is None:
+            self.window.after(200, self._poll_batch)
+            return
+        self.batch_button.configure(state="normal")
+        if isinstance(self._batch_result, Exception):
+            messagebox.showerror("Error", f"Batch export failed: {self._batch_result}", parent=self.window)
+        else:
+            messagebox.showinfo("Batch Export", str(self._batch_result), parent=self.window)
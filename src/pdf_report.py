@@ -2,15 +2,379 @@
 PDF Report Module
 
 This module generates PDF reports for student grades using ReportLab.
+
+ReportRenderer builds the paragraph and table styles once and looks courses up in a
+dictionary, so one renderer can produce thousands of reports without rebuilding them.
+generate_student_report keeps a shared renderer for single reports.
+
+write_combined_report puts many students into one document with a table of contents. The
+students are streamed through the document one section at a time, so only the current
+student's flowables are alive; the table of contents comes from a first layout pass that
+records the page each section starts on and discards the drawn pages.
 """
 
+import io
+from itertools import chain
+from collections.abc import Mapping
 from reportlab.lib.pagesizes import letter
 from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle
+from reportlab.pdfgen.canvas import Canvas
+from reportlab.platypus import (SimpleDocTemplate, Frame, PageTemplate, PageBreak, Paragraph,
+                                Spacer, Table, TableStyle)
 from reportlab.lib import colors
-from .gpa_calculator import calculate_semester_gpa, calculate_cgpa
+from .gpa_calculator import summarize_semesters
+
+GRADE_TABLE_HEADER = ["Course Code", "Course Name", "Grade", "Points", "Credits", "Semester"]
+SEMESTER_TABLE_HEADER = ["Semester", "Credits Attempted", "Credits Passed", "GPA", "CGPA"]
+TOC_ROWS_PER_TABLE = 100
+
+class ReportRenderer:
+    """
+    Renders student grade reports with styles built once and reused.
+
+    Attributes:
+        courses (dict): Mapping of course code to Course object.
+        credit_map (dict): Mapping of course code to credit units.
+        pagesize (tuple): Page size of the generated documents.
+    """
+
+    def __init__(self, courses=(), pagesize=letter):
+        """
+        Initializes the renderer and builds its styles.
+
+        Args:
+            courses (list of Course or dict): Course objects, or a code -> Course mapping.
+            pagesize (tuple): ReportLab page size.
+        """
+        self.pagesize = pagesize
+        self.courses = {}
+        self.credit_map = {}
+        self.set_courses(courses)
+
+        styles = getSampleStyleSheet()
+        self.normal_style = styles['Normal']
+        self.heading_style = styles['Heading2']
+        self.title_style = ParagraphStyle(name='Title', fontSize=18, alignment=1, spaceAfter=20)
+        self.toc_style = TableStyle([
+            ('FONTSIZE', (0, 0), (-1, -1), 9),
+            ('ALIGN', (1, 0), (1, -1), 'RIGHT'),
+            ('TOPPADDING', (0, 0), (-1, -1), 1),
+            ('BOTTOMPADDING', (0, 0), (-1, -1), 1),
+        ])
+        self.table_style = TableStyle([
+            ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
+            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+            ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+            ('FONTSIZE', (0, 0), (-1, 0), 14),
+            ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+            ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
+            ('GRID', (0, 0), (-1, -1), 1, colors.black)
+        ])
+        self.summary_style = TableStyle([('FONTSIZE', (0, 0), (-1, 0), 10)], parent=self.table_style)
+
+    def set_courses(self, courses):
+        """
+        Replaces the course lookup map.
+
+        Args:
+            courses (list of Course or dict): Course objects, or a code -> Course mapping.
+                The first course wins if codes repeat.
+        """
+        if isinstance(courses, Mapping):
+            lookup = courses
+        else:
+            lookup = {}
+            for course in courses:
+                lookup.setdefault(course.code, course)
+        self.courses = lookup
+        self.credit_map = {code: course.credit_units for code, course in lookup.items()}
+
+    def grade_rows(self, grades):
+        """
+        Returns the grade table rows for grades whose course is known.
+
+        Args:
+            grades (list of Grade): Grade objects.
+
+        Returns:
+            list of list: One row per grade, without the header.
+        """
+        rows = []
+        for grade in grades:
+            course = self.courses.get(grade.course_code)
+            if course:
+                rows.append([grade.course_code, course.name, grade.grade, str(grade.get_points()),
+                             str(course.credit_units), grade.semester])
+        return rows
+
+    def build_story(self, student, grades, cgpa=None):
+        """
+        Builds the flowables of a student's report.
+
+        Args:
+            student (Student): Student object.
+            grades (list of Grade): Grades of the student.
+            cgpa (float, optional): Precomputed CGPA; taken from the semester summary when
+                omitted.
+
+        Returns:
+            list: ReportLab flowables.
+        """
+        story = [Paragraph("Student Grade Report", self.title_style), Spacer(1, 12)]
+
+        # Student Info
+        story.append(Paragraph(f"Student ID: {student.student_id}", self.normal_style))
+        story.append(Paragraph(f"Name: {student.name}", self.normal_style))
+        story.append(Paragraph(f"Email: {student.email}", self.normal_style))
+        story.append(Spacer(1, 12))
+
+        # Grades Table
+        table = Table([GRADE_TABLE_HEADER] + self.grade_rows(grades))
+        table.setStyle(self.table_style)
+        story.append(table)
+        story.append(Spacer(1, 12))
+
+        # Semester GPA breakdown, from one grouping pass that also yields the CGPA
+        summary = summarize_semesters(grades, self.credit_map)
+        if summary:
+            data = [SEMESTER_TABLE_HEADER]
+            for entry in summary:
+                data.append([entry["semester"], str(entry["credits_attempted"]), str(entry["credits_passed"]),
+                             str(entry["gpa"]), str(entry["cgpa"])])
+            table = Table(data)
+            table.setStyle(self.summary_style)
+            story.append(table)
+            story.append(Spacer(1, 12))
+
+        # GPA Summary
+        if cgpa is None:
+            cgpa = summary[-1]["cgpa"] if summary else 0.0
+        story.append(Paragraph(f"Cumulative GPA (CGPA): {cgpa}", self.normal_style))
+        return story
+
+    def build_section(self, student, grades, cgpa, semester_gpas):
+        """
+        Builds one student's section of a combined report.
+
+        The grade table is ordered by semester, with a subtotal row after each semester
+        showing its credits and GPA.
+
+        Args:
+            student (Student): Student object.
+            grades (list of Grade): Grades of the student.
+            cgpa (float): CGPA of the student.
+            semester_gpas (list of tuple): (semester, gpa) pairs, e.g. from
+                GPAAggregates.semester_gpas.
+
+        Returns:
+            list: ReportLab flowables, ending with a page break.
+        """
+        heading = Paragraph(f"{student.student_id} - {student.name}", self.heading_style)
+        heading.toc_entry = f"{student.student_id} - {student.name}"
+        story = [heading, Paragraph(f"Email: {student.email}", self.normal_style), Spacer(1, 12)]
+
+        by_semester = {}
+        for grade in grades:
+            by_semester.setdefault(grade.semester, []).append(grade)
+        data = [GRADE_TABLE_HEADER]
+        subtotal_rows = []
+        for semester, gpa in semester_gpas:
+            rows = self.grade_rows(by_semester.get(semester, ()))
+            data.extend(rows)
+            credits = sum(int(row[4]) for row in rows)
+            subtotal_rows.append(len(data))
+            data.append(["", "Semester GPA", "", str(gpa), str(credits), semester])
+
+        table = Table(data, repeatRows=1)
+        table.setStyle(self.table_style)
+        for row in subtotal_rows:
+            table.setStyle([('FONTNAME', (0, row), (-1, row), 'Helvetica-Bold'),
+                            ('BACKGROUND', (0, row), (-1, row), colors.lightgrey)])
+        story.append(table)
+        story.append(Spacer(1, 12))
+        story.append(Paragraph(f"Cumulative GPA (CGPA): {cgpa}", self.normal_style))
+        story.append(PageBreak())
+        return story
+
+    def build_contents(self, entries, width):
+        """
+        Builds table of contents flowables in fixed-size chunks.
+
+        Args:
+            entries (list of tuple): (label, page) pairs.
+            width (float): Width of the frame in points.
+
+        Returns:
+            list: ReportLab flowables.
+        """
+        story = [Paragraph("Contents", self.heading_style)]
+        for start in range(0, len(entries), TOC_ROWS_PER_TABLE):
+            chunk = [[label, str(page)] for label, page in entries[start:start + TOC_ROWS_PER_TABLE]]
+            table = Table(chunk, colWidths=[width - 50, 50])
+            table.setStyle(self.toc_style)
+            story.append(table)
+        return story
+
+    def render(self, student, grades, output, cgpa=None):
+        """
+        Writes a student's report.
+
+        Args:
+            student (Student): Student object.
+            grades (list of Grade): Grades of the student.
+            output (str or file-like): Output filename, or a binary stream such as io.BytesIO.
+            cgpa (float, optional): Precomputed CGPA; taken from the semester summary when
+                omitted.
+
+        Returns:
+            str or file-like: The output argument.
+        """
+        doc = SimpleDocTemplate(output, pagesize=self.pagesize)
+        doc.build(self.build_story(student, grades, cgpa))
+        return output
+
+    def render_bytes(self, student, grades, cgpa=None):
+        """
+        Renders a student's report in memory.
+
+        Args:
+            student (Student): Student object.
+            grades (list of Grade): Grades of the student.
+            cgpa (float, optional): Precomputed CGPA; taken from the semester summary when
+                omitted.
+
+        Returns:
+            bytes: The PDF document.
+        """
+        return self.render(student, grades, io.BytesIO(), cgpa).getvalue()
+
+class _LayoutCanvas(Canvas):
+    """Canvas that lays pages out and throws them away; used to find page numbers."""
+
+    def showPage(self):
+        if self._onPage:
+            self._onPage(self._pageNumber)
+        self._startPage()
+
+    def save(self):
+        pass
+
+class CombinedReportTemplate(SimpleDocTemplate):
+    """
+    Document template that streams flowables in groups instead of building from one list.
+
+    Attributes:
+        contents (list of tuple): (label, page) of every flowable with a toc_entry, in order.
+        outline (bool): Add each toc_entry to the PDF outline (bookmarks).
+    """
+
+    def __init__(self, output, outline=True, **kwargs):
+        super().__init__(output, **kwargs)
+        self.contents = []
+        self.outline = outline
+
+    def afterFlowable(self, flowable):
+        """Records the page of section headings."""
+        label = getattr(flowable, "toc_entry", None)
+        if label is None:
+            return
+        self.contents.append((label, self.page))
+        if self.outline:
+            key = f"section{len(self.contents)}"
+            self.canv.bookmarkPage(key)
+            self.canv.addOutlineEntry(label, key, level=0)
+
+    def _draw_page_number(self, canvas, doc):
+        canvas.setFont("Helvetica", 8)
+        canvas.drawRightString(doc.pagesize[0] - doc.rightMargin, doc.bottomMargin / 2, f"Page {doc.page}")
+
+    def stream(self, groups, canvasmaker=Canvas):
+        """
+        Lays out groups of flowables one group at a time and writes the document.
+
+        Args:
+            groups (iterable of list): Flowable lists; each is dropped once laid out.
+            canvasmaker (class): Canvas class, e.g. _LayoutCanvas for a layout-only pass.
+        """
+        frame = Frame(self.leftMargin, self.bottomMargin, self.width, self.height, id='normal')
+        self.addPageTemplates([
+            PageTemplate(id='First', frames=frame, onPage=self._draw_page_number, pagesize=self.pagesize),
+            PageTemplate(id='Later', frames=frame, onPage=self._draw_page_number, pagesize=self.pagesize),
+        ])
+        self._startBuild(canvasmaker=canvasmaker)
+        self.canv._doctemplate = self
+        try:
+            for flowables in groups:
+                flowables = list(flowables)
+                while flowables:
+                    self.clean_hanging()
+                    self.handle_flowable(flowables)
+        finally:
+            del self.canv._doctemplate
+        self._endBuild()
+
+def write_combined_report(sections, output, renderer, title="Student Grade Reports"):
+    """
+    Writes many students into one PDF with a table of contents.
+
+    The document is laid out twice: a first pass finds the page each section starts on, and
+    the second writes the title, the table of contents and the sections. Each pass pulls the
+    sections from the factory one at a time.
+
+    Args:
+        sections (callable): Returns a fresh iterable of (student, grades, cgpa, semester_gpas)
+            tuples in document order; it is called once per pass.
+        output (str or file-like): Output filename, or a binary stream.
+        renderer (ReportRenderer): Renderer holding the styles and the course map.
+        title (str): Document title.
+
+    Returns:
+        list of tuple: (label, page) for every student section.
+    """
+    def section_groups():
+        for student, grades, cgpa, semester_gpas in sections():
+            yield renderer.build_section(student, grades, cgpa, semester_gpas)
+
+    def front_matter(entries, width):
+        return [Paragraph(title, renderer.title_style), Spacer(1, 12)] + \
+            renderer.build_contents(entries, width) + [PageBreak()]
+
+    # Pass 1: page of each section relative to the first section page
+    layout = CombinedReportTemplate(io.BytesIO(), outline=False, pagesize=renderer.pagesize)
+    layout.stream(section_groups(), canvasmaker=_LayoutCanvas)
+    relative = layout.contents
+
+    # Front matter length does not depend on the page numbers printed in it
+    front = CombinedReportTemplate(io.BytesIO(), outline=False, pagesize=renderer.pagesize)
+    front.stream([front_matter(relative, front.width)], canvasmaker=_LayoutCanvas)
+    offset = front.page
+    contents = [(label, page + offset) for label, page in relative]
+
+    doc = CombinedReportTemplate(output, pagesize=renderer.pagesize, title=title)
+    doc.stream(chain([front_matter(contents, doc.width)], section_groups()))
+    return doc.contents
+
+_shared_renderer = None
+
+def get_renderer(courses):
+    """
+    Returns the shared renderer with its course map set to courses.
+
+    Args:
+        courses (list of Course or dict): Course objects, or a code -> Course mapping.
+
+    Returns:
+        ReportRenderer: Renderer reused across calls.
+    """
+    global _shared_renderer
+    if _shared_renderer is None:
+        _shared_renderer = ReportRenderer(courses)
+    else:
+        _shared_renderer.set_courses(courses)
+    return _shared_renderer
 
-def generate_student_report(student, grades, courses, filename):
+def generate_student_report(student, grades, courses, filename, cgpa=None):
     """
     Generates a PDF report for a student.
 
@@ -19,48 +383,8 @@ def generate_student_report(student, grades, courses, filename):
         grades (list): List of Grade objects for the student.
         courses (list): List of Course objects.
         filename (str): Output filename.
+        cgpa (float, optional): Precomputed CGPA, e.g. from Repository.aggregates.
+            Calculated from grades when omitted.
     """
-    doc = SimpleDocTemplate(filename, pagesize=letter)
-    styles = getSampleStyleSheet()
-    story = []
-
-    # Title
-    title_style = ParagraphStyle(name='Title', fontSize=18, alignment=1, spaceAfter=20)
-    story.append(Paragraph("Student Grade Report", title_style))
-    story.append(Spacer(1, 12))
-
-    # Student Info
-    story.append(Paragraph(f"Student ID: {student.student_id}", styles['Normal']))
-    story.append(Paragraph(f"Name: {student.name}", styles['Normal']))
-    story.append(Paragraph(f"Email: {student.email}", styles['Normal']))
-    story.append(Spacer(1, 12))
-
-    # Grades Table
-    data = [["Course Code", "Course Name", "Grade", "Points", "Credits", "Semester"]]
-    for grade in grades:
-        course = next((c for c in courses if c.code == grade.course_code), None)
-        if course:
-            points = grade.get_points()
-            data.append([grade.course_code, course.name, grade.grade, str(points), str(course.credit_units), grade.semester])
-
-    table = Table(data)
-    table.setStyle(TableStyle([
-        ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
-        ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-        ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-        ('FONTSIZE', (0, 0), (-1, 0), 14),
-        ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-        ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
-        ('GRID', (0, 0), (-1, -1), 1, colors.black)
-    ]))
-    story.append(table)
-    story.append(Spacer(1, 12))
-
-    # GPA Summary
-    cgpa = calculate_cgpa(grades, courses)
-    story.append(Paragraph(f"Cumulative GPA (CGPA): {cgpa}", styles['Normal']))
-
-    # Build PDF
-    doc.build(story)
+    get_renderer(courses).render(student, grades, filename, cgpa)
     print(f"PDF report generated: {filename}")
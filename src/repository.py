@@ -0,0 +1,530 @@
+"""
+Repository Module
+
+This module defines the Repository class, an in-memory store for students, courses, and grades
+with hash indexes so that lookups used by the GUI windows do not scan the full lists.
+"""
+
+from .gpa_aggregates import GPAAggregates
+from .search_index import SearchIndex
+
+class Repository:
+    """
+    Indexed in-memory store for students, courses, and grades.
+
+    Records are kept in insertion-ordered dictionaries so that listing them preserves the order
+    they were loaded or added in. Grades are keyed by (student_id, course_code, semester), which is
+    the same uniqueness rule enforced by the grade entry window.
+
+    Indexes:
+        student_id -> Student
+        course code -> Course
+        (student_id, course_code, semester) -> Grade
+        student_id -> grades of that student
+        (student_id, semester) -> grades of that student in that semester
+        course code -> grades recorded against that course
+
+    Every mutation is also recorded as a pending ("upsert" | "delete", record) change per
+    collection; pop_changes hands them to the storage journal so a save only writes what changed.
+
+    GPA totals are maintained alongside the indexes in a GPAAggregates instance, exposed as
+    the aggregates attribute, so GPA and CGPA reads do not depend on the number of grades.
+
+    Each student also has a version number that changes whenever their record, their grades
+    or the credit units of a course they are graded in change; caches of per-student views
+    (e.g. ChartCache) use it to detect stale entries.
+
+    Text search over students (ID and name) and courses (code and name) goes through
+    SearchIndex instances that are built on first use and then kept in sync by the mutations.
+    """
+
+    def __init__(self, students=None, courses=None, grades=None):
+        """
+        Initializes the repository and builds the indexes.
+
+        Args:
+            students (list of Student): Initial students.
+            courses (list of Course): Initial courses.
+            grades (list of Grade): Initial grades. Later duplicates of the same
+                (student_id, course_code, semester) key are ignored.
+        """
+        self._students = {}
+        self._courses = {}
+        self._grades = {}
+        self._grades_by_student = {}
+        self._grades_by_student_semester = {}
+        self._grades_by_course = {}
+        self._credit_map = {}
+        self.aggregates = GPAAggregates()
+        self._version = 0
+        self._student_versions = {}
+        self._student_search = None
+        self._course_search = None
+        self._changes = None  # Not recording while the initial data is indexed
+
+        for student in students or []:
+            self._students[student.student_id] = student
+        for course in courses or []:
+            self._courses[course.code] = course
+        self._rebuild_credit_map()
+        for grade in grades or []:
+            if self.grade_key(grade) not in self._grades:
+                self._index_grade(grade)
+        self.pop_changes()
+
+    @staticmethod
+    def grade_key(grade):
+        """
+        Returns the unique key of a grade.
+
+        Args:
+            grade (Grade): Grade object.
+
+        Returns:
+            tuple: (student_id, course_code, semester).
+        """
+        return (grade.student_id, grade.course_code, grade.semester)
+
+    # Listing
+
+    @property
+    def students(self):
+        """list of Student: All students in insertion order."""
+        return list(self._students.values())
+
+    @property
+    def courses(self):
+        """list of Course: All courses in insertion order."""
+        return list(self._courses.values())
+
+    @property
+    def grades(self):
+        """list of Grade: All grades in insertion order."""
+        return list(self._grades.values())
+
+    @property
+    def credit_map(self):
+        """dict: Cached course code -> credit_units mapping, kept in sync with the courses."""
+        return self._credit_map
+
+    def count_students(self):
+        """Returns the number of students."""
+        return len(self._students)
+
+    def count_courses(self):
+        """Returns the number of courses."""
+        return len(self._courses)
+
+    def count_grades(self):
+        """Returns the number of grades."""
+        return len(self._grades)
+
+    # Students
+
+    def get_student(self, student_id):
+        """
+        Returns the student with the given ID.
+
+        Args:
+            student_id (str): Student ID.
+
+        Returns:
+            Student or None: The student, or None if not found.
+        """
+        return self._students.get(student_id)
+
+    def has_student(self, student_id):
+        """Returns True if a student with the given ID exists."""
+        return student_id in self._students
+
+    def add_student(self, student):
+        """
+        Adds a new student.
+
+        Args:
+            student (Student): Student to add.
+
+        Raises:
+            ValueError: If the student ID already exists.
+        """
+        if student.student_id in self._students:
+            raise ValueError("Student ID already exists.")
+        self._students[student.student_id] = student
+        if self._student_search is not None:
+            self._student_search.add(student)
+        self._touch_student(student.student_id)
+        self._record("students", "upsert", student)
+
+    def update_student(self, old_student, new_student):
+        """
+        Replaces an existing student, keeping its position in the listing.
+
+        Args:
+            old_student (Student): Student currently stored.
+            new_student (Student): Replacement student.
+
+        Raises:
+            ValueError: If the new ID belongs to another student.
+        """
+        old_id = old_student.student_id
+        new_id = new_student.student_id
+        if new_id != old_id and new_id in self._students:
+            raise ValueError("Student ID already exists.")
+        if new_id == old_id:
+            self._students[old_id] = new_student
+        else:
+            self._students = {
+                (new_id if key == old_id else key): (new_student if key == old_id else value)
+                for key, value in self._students.items()
+            }
+            self._record("students", "delete", old_student)
+            self._touch_student(old_id)
+        if self._student_search is not None:
+            self._student_search.replace(old_student, new_student)
+        self._touch_student(new_id)
+        self._record("students", "upsert", new_student)
+
+    def remove_student(self, student):
+        """
+        Removes a student. Their grades are left untouched, as before.
+
+        Args:
+            student (Student): Student to remove.
+        """
+        if self._students.pop(student.student_id, None) is not None:
+            if self._student_search is not None:
+                self._student_search.remove(student)
+            self._touch_student(student.student_id)
+            self._record("students", "delete", student)
+
+    def search_students(self, query, limit=None):
+        """
+        Returns the students whose ID or name contains a query, ignoring case.
+
+        Args:
+            query (str): Text to look for; an empty query matches every student.
+            limit (int, optional): Return at most this many students, stopping the search early.
+
+        Returns:
+            list of Student: Matching students in listing order.
+        """
+        if self._student_search is None:
+            self._student_search = SearchIndex(lambda s: (s.student_id, s.name), self._students.values())
+        return self._student_search.search(query, limit)
+
+    @property
+    def version(self):
+        """int: Number that changes whenever any student's version changes."""
+        return self._version
+
+    def student_version(self, student_id):
+        """
+        Returns the data version of a student.
+
+        Args:
+            student_id (str): Student ID.
+
+        Returns:
+            int: Number that changes whenever the student's record, grades or the credit
+                units of their courses change. Versions are never reused.
+        """
+        return self._student_versions.get(student_id, 0)
+
+    # Courses
+
+    def get_course(self, code):
+        """
+        Returns the course with the given code.
+
+        Args:
+            code (str): Course code.
+
+        Returns:
+            Course or None: The course, or None if not found.
+        """
+        return self._courses.get(code)
+
+    def has_course(self, code):
+        """Returns True if a course with the given code exists."""
+        return code in self._courses
+
+    def add_course(self, course):
+        """
+        Adds a new course.
+
+        Args:
+            course (Course): Course to add.
+
+        Raises:
+            ValueError: If the course code already exists.
+        """
+        if course.code in self._courses:
+            raise ValueError("Course code already exists.")
+        self._courses[course.code] = course
+        if self._course_search is not None:
+            self._course_search.add(course)
+        self._set_course_credits(course.code, course.credit_units)
+        self._record("courses", "upsert", course)
+
+    def update_course(self, old_course, new_course):
+        """
+        Replaces an existing course, keeping its position in the listing.
+
+        Args:
+            old_course (Course): Course currently stored.
+            new_course (Course): Replacement course.
+
+        Raises:
+            ValueError: If the new code belongs to another course.
+        """
+        old_code = old_course.code
+        new_code = new_course.code
+        if new_code != old_code and new_code in self._courses:
+            raise ValueError("Course code already exists.")
+        if new_code == old_code:
+            self._courses[old_code] = new_course
+        else:
+            self._courses = {
+                (new_code if key == old_code else key): (new_course if key == old_code else value)
+                for key, value in self._courses.items()
+            }
+            self._record("courses", "delete", old_course)
+        if self._course_search is not None:
+            self._course_search.replace(old_course, new_course)
+        self._record("courses", "upsert", new_course)
+        if new_code != old_code:
+            self._set_course_credits(old_code, None)
+            self._set_course_credits(new_code, new_course.credit_units)
+        elif new_course.credit_units != self._credit_map.get(old_code):
+            self._set_course_credits(old_code, new_course.credit_units)
+
+    def remove_course(self, course, cascade=True):
+        """
+        Removes a course.
+
+        Args:
+            course (Course): Course to remove.
+            cascade (bool): Also remove every grade recorded against the course.
+
+        Returns:
+            list of Grade: Grades removed by the cascade.
+        """
+        if self._courses.pop(course.code, None) is not None:
+            if self._course_search is not None:
+                self._course_search.remove(course)
+            self._record("courses", "delete", course)
+        removed = []
+        if cascade:
+            removed = list(self._grades_by_course.get(course.code, {}).values())
+            for grade in removed:
+                self._unindex_grade(grade)
+        self._set_course_credits(course.code, None)
+        return removed
+
+    def search_courses(self, query, limit=None):
+        """
+        Returns the courses whose code or name contains a query, ignoring case.
+
+        Args:
+            query (str): Text to look for; an empty query matches every course.
+            limit (int, optional): Return at most this many courses, stopping the search early.
+
+        Returns:
+            list of Course: Matching courses in listing order.
+        """
+        if self._course_search is None:
+            self._course_search = SearchIndex(lambda c: (c.code, c.name), self._courses.values())
+        return self._course_search.search(query, limit)
+
+    # Grades
+
+    def get_grade(self, student_id, course_code, semester):
+        """
+        Returns the grade for a student, course, and semester.
+
+        Returns:
+            Grade or None: The grade, or None if not recorded.
+        """
+        return self._grades.get((student_id, course_code, semester))
+
+    def has_grade(self, student_id, course_code, semester):
+        """Returns True if a grade exists for the student, course, and semester."""
+        return (student_id, course_code, semester) in self._grades
+
+    def grades_for_student(self, student_id):
+        """
+        Returns all grades of a student.
+
+        Args:
+            student_id (str): Student ID.
+
+        Returns:
+            list of Grade: The student's grades in insertion order.
+        """
+        return list(self._grades_by_student.get(student_id, {}).values())
+
+    def grades_for_student_semester(self, student_id, semester):
+        """
+        Returns the grades of a student in one semester.
+
+        Args:
+            student_id (str): Student ID.
+            semester (str): Semester.
+
+        Returns:
+            list of Grade: The matching grades in insertion order.
+        """
+        return list(self._grades_by_student_semester.get((student_id, semester), {}).values())
+
+    def semesters_for_student(self, student_id):
+        """
+        Returns the semesters in which a student has grades.
+
+        Args:
+            student_id (str): Student ID.
+
+        Returns:
+            list of str: Sorted semester names.
+        """
+        return sorted({grade.semester for grade in self._grades_by_student.get(student_id, {}).values()})
+
+    def grades_for_course(self, code):
+        """
+        Returns all grades recorded against a course.
+
+        Args:
+            code (str): Course code.
+
+        Returns:
+            list of Grade: The matching grades in insertion order.
+        """
+        return list(self._grades_by_course.get(code, {}).values())
+
+    def add_grade(self, grade):
+        """
+        Adds a new grade.
+
+        Args:
+            grade (Grade): Grade to add.
+
+        Raises:
+            ValueError: If a grade already exists for the student, course, and semester.
+        """
+        if self.grade_key(grade) in self._grades:
+            raise ValueError("Grade already exists for this student, course, and semester.")
+        self._index_grade(grade)
+
+    def add_grades(self, grades):
+        """
+        Adds a batch of new grades.
+
+        Args:
+            grades (list of Grade): Grades to add. Keys must be new and distinct.
+
+        Raises:
+            ValueError: If any key already exists; no grade is added in that case.
+        """
+        keys = {self.grade_key(grade) for grade in grades}
+        if len(keys) != len(grades) or any(key in self._grades for key in keys):
+            raise ValueError("Grade already exists for this student, course, and semester.")
+        for grade in grades:
+            self._index_grade(grade)
+
+    def update_grade(self, old_grade, new_grade):
+        """
+        Replaces an existing grade.
+
+        Args:
+            old_grade (Grade): Grade currently stored.
+            new_grade (Grade): Replacement grade.
+
+        Raises:
+            ValueError: If the new key belongs to another grade.
+        """
+        old_key = self.grade_key(old_grade)
+        new_key = self.grade_key(new_grade)
+        if new_key != old_key and new_key in self._grades:
+            raise ValueError("Grade already exists for this student, course, and semester.")
+        self._unindex_grade(old_grade)
+        self._index_grade(new_grade)
+
+    def remove_grade(self, grade):
+        """
+        Removes a grade.
+
+        Args:
+            grade (Grade): Grade to remove.
+        """
+        if self.grade_key(grade) in self._grades:
+            self._unindex_grade(grade)
+
+    def _rebuild_credit_map(self):
+        """Rebuilds the course code -> credit_units mapping from the courses."""
+        self._credit_map = {code: course.credit_units for code, course in self._courses.items()}
+
+    def pop_changes(self):
+        """
+        Returns and clears the changes recorded since the last call.
+
+        Returns:
+            dict: Mapping of collection name ("students", "courses", "grades") to a list of
+                (op, record) pairs, where op is "upsert" or "delete".
+        """
+        changes = self._changes or {"students": [], "courses": [], "grades": []}
+        self._changes = {"students": [], "courses": [], "grades": []}
+        return changes
+
+    def _record(self, collection, op, record):
+        """Records a pending change for the storage journal."""
+        if self._changes is not None:
+            self._changes[collection].append((op, record))
+
+    def _set_course_credits(self, code, credits):
+        """
+        Updates the credit units of a course code and re-weights the GPA totals of its grades.
+
+        Args:
+            code (str): Course code.
+            credits (int or None): New credit units, or None if the code no longer exists.
+        """
+        old_credits = self._credit_map.get(code, 0)
+        new_credits = credits or 0
+        if new_credits != old_credits:
+            for grade in self._grades_by_course.get(code, {}).values():
+                self.aggregates.change_credits(grade, old_credits, new_credits)
+                self._touch_student(grade.student_id)
+        if credits is None:
+            self._credit_map.pop(code, None)
+        else:
+            self._credit_map[code] = credits
+
+    def _touch_student(self, student_id):
+        """Gives a student a new data version."""
+        self._version += 1
+        self._student_versions[student_id] = self._version
+
+    def _index_grade(self, grade):
+        """Adds a grade to the primary store, all secondary indexes and the GPA totals."""
+        key = self.grade_key(grade)
+        self._grades[key] = grade
+        self.aggregates.add(grade, self._credit_map.get(grade.course_code, 0))
+        self._touch_student(grade.student_id)
+        self._record("grades", "upsert", grade)
+        self._grades_by_student.setdefault(grade.student_id, {})[key] = grade
+        self._grades_by_student_semester.setdefault((grade.student_id, grade.semester), {})[key] = grade
+        self._grades_by_course.setdefault(grade.course_code, {})[key] = grade
+
+    def _unindex_grade(self, grade):
+        """Removes a grade from the primary store, all secondary indexes and the GPA totals."""
+        key = self.grade_key(grade)
+        grade = self._grades.pop(key)
+        self.aggregates.remove(grade, self._credit_map.get(grade.course_code, 0))
+        self._touch_student(grade.student_id)
+        self._record("grades", "delete", grade)
+        for index, index_key in ((self._grades_by_student, grade.student_id),
+                                 (self._grades_by_student_semester, (grade.student_id, grade.semester)),
+                                 (self._grades_by_course, grade.course_code)):
+            bucket = index[index_key]
+            del bucket[key]
+            if not bucket:
+                del index[index_key]
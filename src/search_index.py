@@ -0,0 +1,200 @@
+"""
+Search Index Module
+
+This module defines SearchIndex, a case-insensitive substring index over a few text fields of
+each record. The searchable text of every record is case-folded once when it is indexed, and
+a trigram index narrows queries of three or more characters down to the records that contain
+every trigram of the query before the substring check runs.
+
+The index remembers the results of the previous query. When a query extends it (the usual
+case while typing), the previous results are filtered instead of searching again, because
+every record containing the longer query also contains the shorter one.
+
+A search with a limit stops once it has found that many matches. Its results are not
+remembered, since a partial list cannot be refined.
+"""
+
+import heapq
+from itertools import islice
+
+def fold(text):
+    """
+    Returns the case-folded form used for indexing and queries.
+
+    Args:
+        text (str): Text to fold.
+
+    Returns:
+        str: Case-folded text.
+    """
+    return text.casefold()
+
+def trigrams(text):
+    """
+    Returns the set of three-character substrings of a text.
+
+    Args:
+        text (str): Folded text.
+
+    Returns:
+        set of str: Trigrams; empty if the text is shorter than three characters.
+    """
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+class SearchIndex:
+    """
+    Substring index over records keyed by a unique key.
+
+    Results are returned in the order the records were added; a replaced record keeps the
+    position of the record it replaces.
+    """
+
+    def __init__(self, fields, records=(), key=None):
+        """
+        Initializes the index.
+
+        Args:
+            fields (callable): Returns the searchable strings of a record, e.g.
+                lambda s: (s.student_id, s.name).
+            records (iterable): Initial records.
+            key (callable, optional): Returns the unique key of a record; the first field by
+                default.
+        """
+        self._fields = fields
+        self._key = key or (lambda record: fields(record)[0])
+        self._records = {}  # key -> record, in listing order
+        self._texts = {}  # key -> folded searchable text
+        self._order = {}  # key -> position for sorting trigram candidates
+        self._grams = {}  # trigram -> set of keys
+        self._next_order = 0
+        self._last = None  # (folded query, matching keys in order)
+        for record in records:
+            self.add(record)
+
+    def __len__(self):
+        return len(self._records)
+
+    def add(self, record):
+        """
+        Adds a record at the end of the listing.
+
+        Args:
+            record: Record to index.
+        """
+        key = self._key(record)
+        text = self._text(record)
+        self._records[key] = record
+        self._texts[key] = text
+        self._order[key] = self._next_order
+        self._next_order += 1
+        self._index_grams(key, text)
+        self._last = None
+
+    def remove(self, record):
+        """
+        Removes a record if it is indexed.
+
+        Args:
+            record: Record to remove; matched by key.
+        """
+        key = self._key(record)
+        if key not in self._records:
+            return
+        self._unindex_grams(key, self._texts[key])
+        del self._records[key]
+        del self._texts[key]
+        del self._order[key]
+        self._last = None
+
+    def replace(self, old_record, new_record):
+        """
+        Replaces a record, keeping its position in the listing.
+
+        Args:
+            old_record: Record currently indexed.
+            new_record: Replacement record; its key may differ.
+        """
+        old_key = self._key(old_record)
+        new_key = self._key(new_record)
+        if old_key not in self._records:
+            self.add(new_record)
+            return
+        self._unindex_grams(old_key, self._texts[old_key])
+        text = self._text(new_record)
+        if new_key == old_key:
+            self._records[old_key] = new_record
+            self._texts[old_key] = text
+        else:
+            self._records = {(new_key if k == old_key else k): (new_record if k == old_key else v)
+                             for k, v in self._records.items()}
+            self._texts = {(new_key if k == old_key else k): (text if k == old_key else v)
+                           for k, v in self._texts.items()}
+            self._order[new_key] = self._order.pop(old_key)
+        self._index_grams(new_key, text)
+        self._last = None
+
+    def search(self, query, limit=None):
+        """
+        Returns the records whose fields contain a query, ignoring case.
+
+        Args:
+            query (str): Text to look for; an empty query matches every record.
+            limit (int, optional): Return at most this many records, stopping the search early.
+
+        Returns:
+            list: Matching records in listing order.
+        """
+        folded = fold(query)
+        records = self._records
+        if not folded:
+            self._last = None
+            return list(islice(records.values(), limit))
+
+        texts = self._texts
+        if self._last is not None and self._last[0] in folded:
+            keys = (key for key in self._last[1] if folded in texts[key])
+        elif len(folded) >= 3:
+            candidates = (key for key in self._trigram_candidates(folded) if folded in texts[key])
+            if limit is not None:
+                return [records[key] for key in heapq.nsmallest(limit, candidates, key=self._order.__getitem__)]
+            keys = sorted(candidates, key=self._order.__getitem__)
+        else:
+            keys = (key for key, text in texts.items() if folded in text)
+        if limit is not None:
+            return [records[key] for key in islice(keys, limit)]
+        keys = list(keys)
+        self._last = (folded, keys)
+        return [records[key] for key in keys]
+
+    def _trigram_candidates(self, folded):
+        """Returns the keys of records containing every trigram of a query."""
+        buckets = []
+        for gram in trigrams(folded):
+            bucket = self._grams.get(gram)
+            if not bucket:
+                return set()
+            buckets.append(bucket)
+        buckets.sort(key=len)
+        return buckets[0].intersection(*buckets[1:])
+
+    def _text(self, record):
+        """Returns the folded searchable text of a record; fields are separated by newlines."""
+        return "\n".join(fold(value) for value in self._fields(record))
+
+    def _index_grams(self, key, text):
+        """Adds a key to the buckets of its text's trigrams."""
+        grams = self._grams
+        for gram in trigrams(text):
+            bucket = grams.get(gram)
+            if bucket is None:
+                grams[gram] = {key}
+            else:
+                bucket.add(key)
+
+    def _unindex_grams(self, key, text):
+        """Removes a key from the buckets of its text's trigrams."""
+        for gram in trigrams(text):
+            bucket = self._grams[gram]
+            bucket.discard(key)
+            if not bucket:
+                del self._grams[gram]
@@ -0,0 +1,240 @@
+"""
+SQLite Storage Module
+
+This module implements the StorageBackend interface on top of the standard library sqlite3
+module. Each change is written as a single-row upsert or delete, and the grades table is indexed
+for the lookups the application performs.
+
+SQLiteBackend.semester_gpas and cgpa compute GPAs with SQL aggregates, for scripts that query
+a database directly without loading it. The application does not use them: every window works
+on the in-memory Repository, so it still loads all grades even with this backend, and it reads
+GPAs from the Repository's aggregates, which also reflect edits the autosaver has not written
+yet.
+
+Run as a script to migrate the existing CSV files into a database:
+
+    python -m src.sqlite_storage data/grades.db --from-csv data
+"""
+
+import argparse
+import sqlite3
+from .student import Student
+from .course import Course
+from .grade import Grade
+from .storage import StorageBackend, load_students, load_courses, load_grades
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS students (
+    student_id TEXT PRIMARY KEY,
+    name TEXT NOT NULL,
+    email TEXT NOT NULL,
+    department TEXT NOT NULL DEFAULT ''
+);
+CREATE TABLE IF NOT EXISTS courses (
+    code TEXT PRIMARY KEY,
+    name TEXT NOT NULL,
+    credit_units INTEGER NOT NULL,
+    semester TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS grades (
+    student_id TEXT NOT NULL,
+    course_code TEXT NOT NULL,
+    grade TEXT NOT NULL,
+    semester TEXT NOT NULL,
+    PRIMARY KEY (student_id, course_code, semester)
+);
+CREATE INDEX IF NOT EXISTS idx_grades_student ON grades (student_id);
+CREATE INDEX IF NOT EXISTS idx_grades_course ON grades (course_code);
+CREATE INDEX IF NOT EXISTS idx_grades_student_semester ON grades (student_id, semester);
+"""
+
+# Points for each grade letter, matching Grade.get_points.
+POINTS_SQL = "CASE g.grade WHEN 'A' THEN 5 WHEN 'B' THEN 4 WHEN 'C' THEN 3 WHEN 'D' THEN 2 WHEN 'E' THEN 1 ELSE 0 END"
+
+UPSERT_SQL = {
+    "students": ("INSERT INTO students (student_id, name, email, department) VALUES (?, ?, ?, ?) "
+                 "ON CONFLICT (student_id) DO UPDATE SET name = excluded.name, email = excluded.email, "
+                 "department = excluded.department"),
+    "courses": ("INSERT INTO courses (code, name, credit_units, semester) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT (code) DO UPDATE SET name = excluded.name, "
+                "credit_units = excluded.credit_units, semester = excluded.semester"),
+    "grades": ("INSERT INTO grades (student_id, course_code, grade, semester) VALUES (?, ?, ?, ?) "
+               "ON CONFLICT (student_id, course_code, semester) DO UPDATE SET grade = excluded.grade"),
+}
+
+DELETE_SQL = {
+    "students": ("DELETE FROM students WHERE student_id = ?", ("student_id",)),
+    "courses": ("DELETE FROM courses WHERE code = ?", ("code",)),
+    "grades": ("DELETE FROM grades WHERE student_id = ? AND course_code = ? AND semester = ?",
+               ("student_id", "course_code", "semester")),
+}
+
+class SQLiteBackend(StorageBackend):
+    """
+    Storage backend backed by a SQLite database file.
+
+    Attributes:
+        path (str): Path of the database file.
+    """
+
+    def __init__(self, path):
+        """
+        Opens (and if needed creates) the database.
+
+        Args:
+            path (str): Path of the database file, or ":memory:".
+        """
+        self.path = path
+        # The app loads on a worker thread and later saves from the autosave thread; the
+        # AutoSaver serializes its writes and loading finishes before it starts, so the
+        # connection may be shared between threads.
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.executescript(SCHEMA)
+        self._upgrade_schema()
+
+    def _upgrade_schema(self):
+        """Adds columns introduced after a database was created."""
+        columns = {row[1] for row in self.conn.execute("PRAGMA table_info(students)")}
+        if "department" not in columns:
+            with self.conn:
+                self.conn.execute("ALTER TABLE students ADD COLUMN department TEXT NOT NULL DEFAULT ''")
+
+    def load_students(self):
+        rows = self.conn.execute("SELECT student_id, name, email, department FROM students ORDER BY rowid")
+        return [Student(*row) for row in rows]
+
+    def load_courses(self):
+        rows = self.conn.execute("SELECT code, name, credit_units, semester FROM courses ORDER BY rowid")
+        return [Course(*row) for row in rows]
+
+    def load_grades(self):
+        rows = self.conn.execute("SELECT student_id, course_code, grade, semester FROM grades ORDER BY rowid")
+        return [Grade(*row) for row in rows]
+
+    def iter_grades(self, student_id=None, semester=None, predicate=None):
+        clauses = []
+        params = []
+        if student_id is not None:
+            clauses.append("student_id = ?")
+            params.append(student_id)
+        if semester is not None:
+            clauses.append("semester = ?")
+            params.append(semester)
+        where = f" WHERE {' AND '.join(clauses)}" if clauses else ""
+        # A separate cursor streams rows without fetching them all
+        cursor = self.conn.cursor()
+        cursor.execute(f"SELECT student_id, course_code, grade, semester FROM grades{where} ORDER BY rowid", params)
+        for row in cursor:
+            grade = Grade(*row)
+            if predicate is None or predicate(grade):
+                yield grade
+
+    def take_changes(self, repository):
+        return repository.pop_changes(), {}  # Per-record writes never need the full lists
+
+    def write_changes(self, changes, records):
+        self.apply_changes(changes)
+
+    def apply_changes(self, changes):
+        """
+        Writes recorded changes as per-record upserts and deletes in one transaction.
+
+        Args:
+            changes (dict): Mapping of collection name to (op, record) pairs,
+                as returned by Repository.pop_changes.
+        """
+        with self.conn:
+            for collection, entries in changes.items():
+                for op, record in entries:
+                    data = record.to_dict()
+                    if op == "delete":
+                        sql, key_fields = DELETE_SQL[collection]
+                        self.conn.execute(sql, [data[field] for field in key_fields])
+                    else:
+                        self.conn.execute(UPSERT_SQL[collection], list(data.values()))
+
+    def insert_all(self, students, courses, grades):
+        """
+        Bulk-inserts records in a single transaction, replacing existing keys.
+
+        Args:
+            students (list of Student): Students to insert.
+            courses (list of Course): Courses to insert.
+            grades (list of Grade): Grades to insert.
+        """
+        with self.conn:
+            for collection, records in (("students", students), ("courses", courses), ("grades", grades)):
+                self.conn.executemany(UPSERT_SQL[collection],
+                                      (list(record.to_dict().values()) for record in records))
+
+    def semester_gpas(self, student_id):
+        """
+        Computes a student's GPA per semester with a SQL aggregate.
+
+        Args:
+            student_id (str): Student ID.
+
+        Returns:
+            list of tuple: (semester, gpa) pairs sorted by semester, rounded like
+                calculate_semester_gpa.
+        """
+        rows = self.conn.execute(
+            f"SELECT g.semester, SUM({POINTS_SQL} * c.credit_units), SUM(c.credit_units) "
+            "FROM grades g LEFT JOIN courses c ON c.code = g.course_code "
+            "WHERE g.student_id = ? GROUP BY g.semester ORDER BY g.semester",
+            (student_id,),
+        )
+        return [(semester, round(points / credits, 2) if credits else 0.0) for semester, points, credits in rows]
+
+    def cgpa(self, student_id):
+        """
+        Computes a student's CGPA with a SQL aggregate.
+
+        Args:
+            student_id (str): Student ID.
+
+        Returns:
+            float: CGPA, or 0.0 if no grades or credits.
+        """
+        points, credits = self.conn.execute(
+            f"SELECT SUM({POINTS_SQL} * c.credit_units), SUM(c.credit_units) "
+            "FROM grades g LEFT JOIN courses c ON c.code = g.course_code WHERE g.student_id = ?",
+            (student_id,),
+        ).fetchone()
+        return round(points / credits, 2) if credits else 0.0
+
+    def close(self):
+        self.conn.close()
+
+def migrate_csv_to_sqlite(db_path, data_dir=None):
+    """
+    Copies the CSV data (with journals replayed) into a SQLite database.
+
+    Args:
+        db_path (str): Path of the database file to create or update.
+        data_dir (str, optional): Directory holding the CSV files, DATA_DIR by default.
+
+    Returns:
+        tuple: (number of students, number of courses, number of grades) migrated.
+    """
+    students = load_students(data_dir)
+    courses = load_courses(data_dir)
+    grades = load_grades(data_dir)
+    backend = SQLiteBackend(db_path)
+    try:
+        backend.insert_all(students, courses, grades)
+    finally:
+        backend.close()
+    return len(students), len(courses), len(grades)
+
+def main(argv=None):
+    """Command-line entry point for the CSV to SQLite migration."""
+    parser = argparse.ArgumentParser(description="Migrate CSV data files into a SQLite database.")
+    parser.add_argument("database", help="SQLite database file to create or update")
+    parser.add_argument("--from-csv", dest="data_dir", default=None, help="directory with the CSV files")
+    args = parser.parse_args(argv)
+    counts = migrate_csv_to_sqlite(args.database, args.data_dir)
+    print("Migrated {} students, {} courses, {} grades.".format(*counts))
+
+if __name__ == "__main__":
+    main()
@@ -15,9 +15,12 @@ class Student:
         student_id (str): Unique identifier for the student.
         name (str): Full name of the student.
         email (str): Email address of the student.
+        department (str): Department of the student, empty if not assigned.
     """
 
-    def __init__(self, student_id, name, email):
+    __slots__ = ("student_id", "name", "email", "department")
+
+    def __init__(self, student_id, name, email, department=""):
         """
         Initializes a Student instance.
 
@@ -25,10 +28,12 @@ class Student:
             student_id (str): Unique student ID.
             name (str): Student's full name.
             email (str): Student's email address.
+            department (str): Student's department (optional).
         """
         self.student_id = student_id
         self.name = name
         self.email = email
+        self.department = department
 
     def __str__(self):
         """
@@ -55,6 +60,8 @@ class Student:
             raise ValueError("Name must be a non-empty string.")
         if not self.email or not isinstance(self.email, str) or "@" not in self.email:
             raise ValueError("Email must be a valid string containing '@'.")
+        if not isinstance(self.department, str):
+            raise ValueError("Department must be a string.")
         return True
 
     def to_dict(self):
@@ -67,7 +74,8 @@ class Student:
         return {
             "student_id": self.student_id,
             "name": self.name,
-            "email": self.email
+            "email": self.email,
+            "department": self.department
         }
 
     @classmethod
@@ -76,9 +84,10 @@ class Student:
         Creates a Student instance from a dictionary.
 
         Args:
-            data (dict): Dictionary containing student data.
+            data (dict): Dictionary containing student data. The department key is optional
+                so files written before it was added still load.
 
         Returns:
             Student: New Student instance.
         """
-        return cls(data["student_id"], data["name"], data["email"])
+        return cls(data["student_id"], data["name"], data["email"], data.get("department") or "")
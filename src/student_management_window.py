@@ -8,6 +8,9 @@ import tkinter as tk
 import customtkinter as ctk
 from tkinter import messagebox, simpledialog
 from src.student import Student
+from src.virtual_list import VirtualCardList
+
+SEARCH_DELAY_MS = 150  # Search once typing pauses for this long
 
 class StudentManagementWindow:
     """
@@ -48,9 +51,10 @@ class StudentManagementWindow:
         self.search_entry.pack(side="left", fill="x", expand=True)
         self.search_entry.bind('<KeyRelease>', self.search_students)
 
-        # Scrollable frame for students
-        self.scrollable_frame = ctk.CTkScrollableFrame(self.scrollable_main, height=400)
-        self.scrollable_frame.pack(pady=10, padx=20, fill="both", expand=True)
+        # Virtualized list of student cards
+        self.student_list = VirtualCardList(self.scrollable_main, self.create_student_card, self.bind_student_card,
+                                            row_height=110, height=400)
+        self.student_list.pack(pady=10, padx=20, fill="both", expand=True)
 
         # Form frame (hidden initially)
         self.form_frame = ctk.CTkFrame(self.scrollable_main)
@@ -71,7 +75,12 @@ class StudentManagementWindow:
         self.email_label = ctk.CTkLabel(self.form_frame, text="Email:")
         self.email_label.pack(anchor="w", padx=20)
         self.email_entry = ctk.CTkEntry(self.form_frame, height=35)
-        self.email_entry.pack(pady=(0, 15), padx=20, fill="x")
+        self.email_entry.pack(pady=(0, 10), padx=20, fill="x")
+
+        self.department_label = ctk.CTkLabel(self.form_frame, text="Department (optional):")
+        self.department_label.pack(anchor="w", padx=20)
+        self.department_entry = ctk.CTkEntry(self.form_frame, height=35)
+        self.department_entry.pack(pady=(0, 15), padx=20, fill="x")
 
         button_frame = ctk.CTkFrame(self.form_frame, fg_color="transparent")
         button_frame.pack(pady=(10, 15))
@@ -85,6 +94,9 @@ class StudentManagementWindow:
                                        font=ctk.CTkFont(size=12, weight="bold"))
         self.cancel_btn.pack(side="left", padx=10)
 
+        self._search_job = None
+        self._last_query = ""
+
         # Load students
         self.load_students()
 
@@ -92,36 +104,34 @@ class StudentManagementWindow:
         self.editing_student = None
 
     def load_students(self):
-        """Loads students into the scrollable frame as cards."""
-        # Clear existing cards
-        for widget in self.scrollable_frame.winfo_children():
-            widget.destroy()
-
-        for student in self.app.students:
-            self.create_student_card(student)
+        """Loads all students into the card list."""
+        self.student_list.set_items(self.app.repo.students)
 
-    def create_student_card(self, student):
-        """Creates a card for a student."""
-        card_frame = ctk.CTkFrame(self.scrollable_frame, corner_radius=10, border_width=1)
-        card_frame.pack(pady=5, padx=10, fill="x")
+    def create_student_card(self, parent):
+        """Creates an empty card; bind_student_card fills it with a student."""
+        card_frame = ctk.CTkFrame(parent, corner_radius=10, border_width=1)
 
         # Student info
-        info_label = ctk.CTkLabel(card_frame, text=f"ID: {student.student_id}\nName: {student.name}\nEmail: {student.email}",
-                                 font=ctk.CTkFont(size=12))
-        info_label.pack(side="left", padx=15, pady=10, fill="x", expand=True)
+        card_frame.info_label = ctk.CTkLabel(card_frame, text="", font=ctk.CTkFont(size=12))
+        card_frame.info_label.pack(side="left", padx=15, pady=10, fill="x", expand=True)
 
-        # Buttons
+        # Buttons act on whichever student the card currently shows
         button_frame = ctk.CTkFrame(card_frame, fg_color="transparent")
         button_frame.pack(side="right", padx=10, pady=10)
 
-        edit_btn = ctk.CTkButton(button_frame, text="Edit", command=lambda: self.show_edit_form(student),
+        edit_btn = ctk.CTkButton(button_frame, text="Edit", command=lambda: self.show_edit_form(card_frame.item),
                                 width=60, height=30, font=ctk.CTkFont(size=11))
         edit_btn.pack(pady=2)
 
-        delete_btn = ctk.CTkButton(button_frame, text="Delete", command=lambda: self.delete_student(student),
+        delete_btn = ctk.CTkButton(button_frame, text="Delete", command=lambda: self.delete_student(card_frame.item),
                                   width=60, height=30, fg_color="red", hover_color="darkred",
                                   font=ctk.CTkFont(size=11))
         delete_btn.pack(pady=2)
+        return card_frame
+
+    def bind_student_card(self, card, student):
+        """Shows a student on a card."""
+        card.info_label.configure(text=f"ID: {student.student_id}\nName: {student.name}\nEmail: {student.email}\nDepartment: {student.department or '-'}")
 
     def show_add_form(self):
         """Shows the form for adding a new student."""
@@ -129,6 +139,7 @@ class StudentManagementWindow:
         self.id_entry.delete(0, "end")
         self.name_entry.delete(0, "end")
         self.email_entry.delete(0, "end")
+        self.department_entry.delete(0, "end")
         self.editing_student = None
         self.form_frame.pack(pady=10, padx=20, fill="x")
         self.scrollable_main._parent_canvas.yview_moveto(1.0)  # Scroll to bottom
@@ -142,6 +153,8 @@ class StudentManagementWindow:
         self.name_entry.insert(0, student.name)
         self.email_entry.delete(0, "end")
         self.email_entry.insert(0, student.email)
+        self.department_entry.delete(0, "end")
+        self.department_entry.insert(0, student.department)
         self.editing_student = student
         self.form_frame.pack(pady=10, padx=20, fill="x")
         self.scrollable_main._parent_canvas.yview_moveto(1.0)  # Scroll to bottom
@@ -151,6 +164,7 @@ class StudentManagementWindow:
         student_id = self.id_entry.get().strip()
         name = self.name_entry.get().strip()
         email = self.email_entry.get().strip()
+        department = self.department_entry.get().strip()
 
         if not student_id or not name or not email:
             messagebox.showerror("Error", "All fields are required.")
@@ -158,20 +172,24 @@ class StudentManagementWindow:
 
         try:
             from src.student import Student
-            student = Student(student_id, name, email)
+            student = Student(student_id, name, email, department)
             student.validate()
             if self.editing_student:
                 # Update existing
-                index = self.app.students.index(self.editing_student)
-                self.app.students[index] = student
+                self.app.repo.update_student(self.editing_student, student)
+                self.student_list.replace_item(self.editing_student, student)
             else:
                 # Check for duplicate ID
-                if any(s.student_id == student_id for s in self.app.students):
+                if self.app.repo.has_student(student_id):
                     messagebox.showerror("Error", "Student ID already exists.")
                     return
-                self.app.students.append(student)
+                self.app.repo.add_student(student)
+                if self._last_query:
+                    # Only list the new student if it matches the active search
+                    self.student_list.set_items(self.app.repo.search_students(self._last_query))
+                else:
+                    self.student_list.append_item(student)
             self.app.save_data()
-            self.load_students()
             self.cancel_edit()
             messagebox.showinfo("Success", "Student saved successfully!")
         except ValueError as e:
@@ -185,18 +203,22 @@ class StudentManagementWindow:
     def delete_student(self, student):
         """Deletes the selected student."""
         if messagebox.askyesno("Confirm", f"Are you sure you want to delete student {student.name}?"):
-            self.app.students.remove(student)
+            self.app.repo.remove_student(student)
+            self.student_list.remove_item(student)
             self.app.save_data()
-            self.load_students()
             messagebox.showinfo("Success", "Student deleted successfully!")
 
-    def search_students(self, event):
-        """Filters students based on search query."""
-        query = self.search_entry.get().lower()
-        # Clear existing cards
-        for widget in self.scrollable_frame.winfo_children():
-            widget.destroy()
-
-        for student in self.app.students:
-            if query in student.name.lower() or query in student.student_id.lower():
-                self.create_student_card(student)
+    def search_students(self, event=None):
+        """Schedules a search once typing pauses; every keystroke restarts the delay."""
+        if self._search_job is not None:
+            self.window.after_cancel(self._search_job)
+        self._search_job = self.window.after(SEARCH_DELAY_MS, self.apply_search)
+
+    def apply_search(self):
+        """Shows the students matching the search box, using the repository's search index."""
+        self._search_job = None
+        query = self.search_entry.get().strip()
+        if query == self._last_query:
+            return
+        self._last_query = query
+        self.student_list.set_items(self.app.repo.search_students(query))
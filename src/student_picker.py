@@ -0,0 +1,149 @@
+"""
+Student Picker Module
+
+This module defines StudentPicker, a type-ahead student selector shared by the windows that
+work on one student at a time. Typing queries the repository's student search index once
+typing pauses and lists the best few matches under the entry; the caller gets the chosen
+student's ID rather than a display string.
+"""
+
+import tkinter as tk
+import customtkinter as ctk
+
+PICKER_DELAY_MS = 120  # Search once typing pauses for this long
+PICKER_RESULTS = 8  # Matches listed under the entry
+
+class StudentPicker(ctk.CTkFrame):
+    """
+    Entry with a list of matching students that appears while typing.
+
+    A student is chosen by clicking a match, or with the arrow keys and Return. Typing an
+    exact student ID and pressing Return also chooses that student.
+    """
+
+    def __init__(self, master, repository, command=None, max_results=PICKER_RESULTS, **kwargs):
+        """
+        Initializes the picker.
+
+        Args:
+            master: Parent widget.
+            repository (Repository): Data store whose search_students answers the queries.
+            command (callable, optional): Called as command(student_id) when a student is chosen.
+            max_results (int): Number of matches listed.
+        """
+        kwargs.setdefault("fg_color", "transparent")
+        super().__init__(master, **kwargs)
+        self.repository = repository
+        self.command = command
+        self.max_results = max_results
+        self._student_id = None
+        self._matches = []
+        self._search_job = None
+        self._text = ""
+
+        self.entry = ctk.CTkEntry(self, width=kwargs.get("width", 200), placeholder_text="Type a student ID or name...")
+        self.entry.pack(fill="x")
+        self.listbox = tk.Listbox(self, height=max_results, activestyle="none", exportselection=False)
+        self.listbox.bind("<<ListboxSelect>>", self._on_click)
+
+        self.entry.bind("<KeyRelease>", self._on_key)
+        self.entry.bind("<Down>", lambda event: self._move(1))
+        self.entry.bind("<Up>", lambda event: self._move(-1))
+        self.entry.bind("<Return>", self._on_return)
+        self.entry.bind("<Escape>", lambda event: self._hide())
+
+    def get(self):
+        """
+        Returns the chosen student.
+
+        Returns:
+            str or None: The student ID, or None if no student is chosen.
+        """
+        if self._student_id is None:
+            typed = self.entry.get().strip()
+            if typed and self.repository.has_student(typed):
+                return typed
+        return self._student_id
+
+    def set(self, student_id):
+        """
+        Chooses a student without calling the command.
+
+        Args:
+            student_id (str or None): Student ID, or None to clear the picker.
+        """
+        student = self.repository.get_student(student_id) if student_id is not None else None
+        self._student_id = student.student_id if student else None
+        self.entry.delete(0, "end")
+        if student:
+            self.entry.insert(0, f"{student.student_id} - {student.name}")
+        self._text = self.entry.get()
+        self._hide()
+
+    def _choose(self, student):
+        """Chooses a student and notifies the caller."""
+        self.set(student.student_id)
+        if self.command:
+            self.command(student.student_id)
+
+    def _on_key(self, event):
+        """Restarts the search delay after the text changes; other keys are ignored."""
+        text = self.entry.get()
+        if text == self._text:
+            return
+        self._text = text
+        self._student_id = None
+        if self._search_job is not None:
+            self.after_cancel(self._search_job)
+        self._search_job = self.after(PICKER_DELAY_MS, self._search)
+
+    def _search(self):
+        """Lists the first matches of the typed query."""
+        self._search_job = None
+        query = self.entry.get().strip()
+        self._matches = self.repository.search_students(query, self.max_results) if query else []
+        self.listbox.delete(0, "end")
+        if not self._matches:
+            self._hide()
+            return
+        for student in self._matches:
+            self.listbox.insert("end", f"{student.student_id} - {student.name}")
+        self.listbox.configure(height=len(self._matches))
+        self.listbox.pack(fill="x")
+
+    def _move(self, step):
+        """Moves the highlighted match up or down."""
+        if not self._matches:
+            return "break"
+        current = self.listbox.curselection()
+        index = (current[0] + step) % len(self._matches) if current else (0 if step > 0 else len(self._matches) - 1)
+        self.listbox.selection_clear(0, "end")
+        self.listbox.selection_set(index)
+        self.listbox.see(index)
+        return "break"
+
+    def _on_return(self, event):
+        """Chooses the highlighted match, or the student whose ID was typed exactly."""
+        if self._search_job is not None:
+            self.after_cancel(self._search_job)
+            self._search()
+        current = self.listbox.curselection()
+        if current and self._matches:
+            self._choose(self._matches[current[0]])
+        elif self.repository.has_student(self.entry.get().strip()):
+            self._choose(self.repository.get_student(self.entry.get().strip()))
+        elif len(self._matches) == 1:
+            self._choose(self._matches[0])
+        return "break"
+
+    def _on_click(self, event):
+        """Chooses the clicked match."""
+        current = self.listbox.curselection()
+        if current and current[0] < len(self._matches):
+            self._choose(self._matches[current[0]])
+
+    def _hide(self):
+        """Hides the list of matches."""
+        self._matches = []
+        self.listbox.selection_clear(0, "end")
+        self.listbox.pack_forget()
@@ -0,0 +1,99 @@
+"""
+Task Scheduler Module
+
+This module defines TaskScheduler, which runs slow computations of a window (GPA tables,
+chart rendering) on a small thread pool and hands the results back on the Tk event loop.
+
+Tasks are submitted under a key such as "charts". Submitting a new task under a key that
+already has one supersedes it: the old task is cancelled if it has not started yet, and its
+result is discarded if it has, so a window only ever shows the result of the latest request.
+Completed tasks are collected by polling with widget.after, the same way the application
+polls its background loader, so callbacks always run on the Tk thread.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+
+TASK_POLL_MS = 50
+
+class TaskScheduler:
+    """
+    Thread pool whose results are delivered on the Tk event loop, one live task per key.
+    """
+
+    def __init__(self, widget, max_workers=2):
+        """
+        Initializes the scheduler.
+
+        Args:
+            widget: Tk widget whose after method schedules the polling.
+            max_workers (int): Number of worker threads.
+        """
+        self.widget = widget
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="ui-task")
+        self._current = {}  # key -> Future of the latest task
+        self._callbacks = {}  # Future -> (key, on_done, on_error)
+        self._polling = False
+        self._closed = False
+
+    def submit(self, key, fn, on_done, on_error=None):
+        """
+        Runs fn() on a worker thread and calls on_done(result) on the Tk thread.
+
+        Args:
+            key (str): Task slot; a pending task with the same key is superseded.
+            fn (callable): Computation to run; must not touch Tk widgets.
+            on_done (callable): Called with the result unless the task was superseded.
+            on_error (callable, optional): Called with the exception if fn raises.
+
+        Returns:
+            concurrent.futures.Future: The task.
+        """
+        if self._closed:
+            raise RuntimeError("TaskScheduler is shut down.")
+        self.cancel(key)
+        future = self._executor.submit(fn)
+        self._current[key] = future
+        self._callbacks[future] = (key, on_done, on_error)
+        if not self._polling:
+            self._polling = True
+            self.widget.after(TASK_POLL_MS, self._poll)
+        return future
+
+    def cancel(self, key):
+        """
+        Cancels the task under a key; a task that is already running finishes unseen.
+
+        Args:
+            key (str): Task slot.
+        """
+        future = self._current.pop(key, None)
+        if future is not None:
+            future.cancel()
+            self._callbacks.pop(future, None)
+
+    def shutdown(self):
+        """Cancels every task and stops the worker threads without waiting for them."""
+        self._closed = True
+        for key in list(self._current):
+            self.cancel(key)
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def _poll(self):
+        """Delivers finished tasks and keeps polling while any are outstanding."""
+        self._polling = False
+        if self._closed:
+            return
+        finished = [(future, self._callbacks.pop(future)) for future in list(self._callbacks) if future.done()]
+        for future, (key, _, _) in finished:
+            del self._current[key]
+        if self._callbacks:
+            self._polling = True
+            self.widget.after(TASK_POLL_MS, self._poll)
+        for future, (_, on_done, on_error) in finished:
+            error = future.exception()
+            if error is None:
+                on_done(future.result())
+            elif on_error:
+                on_error(error)
+            else:
+                raise error
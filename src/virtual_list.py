@@ -0,0 +1,205 @@
+"""
+Virtual List Module
+
+This module defines VirtualCardList, a scrollable list of cards that only creates widgets for
+the rows in view. A small pool of card widgets is placed on a canvas and re-bound to other
+records as the list scrolls, so the number of Tk widgets does not grow with the number of
+records. All rows have the same height, which lets the visible rows be computed directly from
+the scroll position. The position of every record is kept in a map keyed by id(), so updating
+or removing one record does not scan the list.
+"""
+
+import tkinter as tk
+import customtkinter as ctk
+
+def visible_range(top, height, row_height, count, buffer=2):
+    """
+    Returns the rows that intersect the viewport, widened by a buffer on both sides.
+
+    Args:
+        top (float): Canvas y coordinate at the top of the viewport.
+        height (float): Viewport height in pixels.
+        row_height (int): Height of one row in pixels.
+        count (int): Number of rows.
+        buffer (int): Extra rows kept bound above and below the viewport.
+
+    Returns:
+        tuple: (first, stop) row indices, with stop exclusive.
+    """
+    first = max(int(top // row_height) - buffer, 0)
+    stop = min(int((top + height) // row_height) + 1 + buffer, count)
+    return first, max(stop, first)
+
+class VirtualCardList(ctk.CTkFrame):
+    """
+    Scrollable list of equally tall cards backed by a recycled widget pool.
+
+    The caller supplies two functions: create_card(parent) builds an empty card widget, and
+    bind_card(card, item) fills a card with a record. A bound card's record is available as
+    card.item, so button commands can read it at click time instead of capturing it.
+
+    Attributes:
+        items (list): Records in display order.
+        row_height (int): Height of one row in pixels, including the gap between cards.
+    """
+
+    def __init__(self, master, create_card, bind_card, row_height=100, buffer=2, height=400, **kwargs):
+        """
+        Initializes an empty list.
+
+        Args:
+            master: Parent widget.
+            create_card (callable): Called as create_card(parent) to build a pooled card.
+            bind_card (callable): Called as bind_card(card, item) to show a record on a card.
+            row_height (int): Height of one row in pixels, including the gap between cards.
+            buffer (int): Extra rows kept bound above and below the viewport.
+            height (int): Initial viewport height in pixels.
+        """
+        super().__init__(master, height=height, **kwargs)
+        self.items = []
+        self._positions = {}  # id(item) -> index in items
+        self.row_height = row_height
+        self.buffer = buffer
+        self._create_card = create_card
+        self._bind_card = bind_card
+        self._pool = []  # (canvas window id, card)
+        self._width = 1
+
+        self.canvas = tk.Canvas(self, height=height, highlightthickness=0, borderwidth=0,
+                                bg=self._apply_appearance_mode(self.cget("fg_color")))
+        self.scrollbar = ctk.CTkScrollbar(self, command=self.canvas.yview)
+        self.canvas.configure(yscrollcommand=self._on_scroll)
+        self.scrollbar.pack(side="right", fill="y")
+        self.canvas.pack(side="left", fill="both", expand=True)
+        self.canvas.bind("<Configure>", self._on_configure)
+        self._bind_wheel(self.canvas)
+
+    def set_items(self, items):
+        """
+        Replaces the records and scrolls back to the top.
+
+        Args:
+            items (iterable): Records to show.
+        """
+        self.items = list(items)
+        self._reindex()
+        self._update_scrollregion()
+        self.canvas.yview_moveto(0)
+        self.refresh()
+
+    def append_item(self, item):
+        """Adds a record at the end of the list."""
+        self._positions[id(item)] = len(self.items)
+        self.items.append(item)
+        self._update_scrollregion()
+        self.refresh()
+
+    def replace_item(self, old_item, new_item):
+        """
+        Replaces a record in place, re-binding only its card if it is in view.
+
+        Args:
+            old_item: Record currently in the list.
+            new_item: Record to show instead.
+        """
+        index = self._index_of(old_item)
+        if index is None:
+            return
+        self.items[index] = new_item
+        del self._positions[id(old_item)]
+        self._positions[id(new_item)] = index
+        for _, card in self._pool:
+            if card.index == index:
+                self._bind(card, index)
+
+    def remove_item(self, item):
+        """Removes a record; cards below it move up by one row."""
+        index = self._index_of(item)
+        if index is None:
+            return
+        del self.items[index]
+        del self._positions[id(item)]
+        self._reindex(index)
+        self._update_scrollregion()
+        self.refresh()
+
+    def refresh(self):
+        """Places and binds pooled cards for the rows currently in view."""
+        height = self.canvas.winfo_height()
+        if height <= 1:
+            height = int(self.canvas.cget("height"))
+        first, stop = visible_range(self.canvas.canvasy(0), height, self.row_height, len(self.items), self.buffer)
+        while len(self._pool) < stop - first:
+            self._grow_pool()
+
+        gap = self.row_height // 20
+        for slot, (window, card) in enumerate(self._pool):
+            index = first + slot
+            if index < stop:
+                self.canvas.coords(window, 0, index * self.row_height + gap)
+                if card.index != index or card.item is not self.items[index]:
+                    self._bind(card, index)
+            elif card.index is not None:
+                self.canvas.coords(window, 0, -2 * self.row_height)
+                card.index = card.item = None
+
+    def _bind(self, card, index):
+        """Shows row index on a card."""
+        card.index = index
+        card.item = self.items[index]
+        self._bind_card(card, card.item)
+
+    def _grow_pool(self):
+        """Creates one more pooled card, initially off-screen."""
+        card = self._create_card(self.canvas)
+        card.index = card.item = None
+        window = self.canvas.create_window(0, -2 * self.row_height, anchor="nw", window=card,
+                                           width=self._width, height=self.row_height - 2 * (self.row_height // 20))
+        self._bind_wheel(card)
+        self._pool.append((window, card))
+
+    def _index_of(self, item):
+        """Returns the position of a record by identity, or None."""
+        return self._positions.get(id(item))
+
+    def _reindex(self, start=0):
+        """Records the positions of the records from start on, after a removal or a reload."""
+        if start == 0:
+            self._positions = {}
+        for index in range(start, len(self.items)):
+            self._positions[id(self.items[index])] = index
+
+    def _update_scrollregion(self):
+        self.canvas.configure(scrollregion=(0, 0, self._width, len(self.items) * self.row_height))
+
+    def _on_scroll(self, first, last):
+        """Keeps the scrollbar in sync and re-binds cards after every scroll."""
+        self.scrollbar.set(first, last)
+        self.refresh()
+
+    def _on_configure(self, event):
+        """Stretches the cards to the canvas width and fills a taller viewport."""
+        self._width = event.width
+        for window, _ in self._pool:
+            self.canvas.itemconfigure(window, width=event.width)
+        self._update_scrollregion()
+        self.refresh()
+
+    def _on_wheel(self, event):
+        """Scrolls the list, not an enclosing scrollable frame."""
+        if getattr(event, "num", None) == 4 or event.delta > 0:
+            self.canvas.yview_scroll(-1, "units")
+        else:
+            self.canvas.yview_scroll(1, "units")
+        return "break"
+
+    def _bind_wheel(self, widget):
+        """Routes mouse-wheel events over a widget and its descendants to this list."""
+        for sequence in ("<MouseWheel>", "<Button-4>", "<Button-5>"):
+            widget.bind(sequence, self._on_wheel, add="+")
+        for child in widget.winfo_children():
+            self._bind_wheel(child)
+
+    def _set_appearance_mode(self, mode_string):
+        super()._set_appearance_mode(mode_string)
+        self.canvas.configure(bg=self._apply_appearance_mode(self.cget("fg_color")))
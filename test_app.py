@@ -3,7 +3,8 @@ Simple test script to verify application functionality.
 """
 
 from src.storage import load_students, load_courses, load_grades
-from src.gpa_calculator import calculate_semester_gpa, calculate_cgpa
+from src.gpa_calculator import (calculate_semester_gpa, calculate_cgpa, build_credit_map, calculate_all_cgpas,
+                                summarize_semesters)
 from src.student import Student
 from src.course import Course
 from src.grade import Grade
@@ -63,8 +64,41 @@ def test_edge_cases():
     cgpa = calculate_cgpa([], [])
     print(f"CGPA with no grades: {cgpa} (should be 0.0)")
 
+def test_credit_map():
+    """Test that a prebuilt credit map gives the same results as a course list."""
+    courses = [Course("ICT323", "Intro to ICT", 3, "Sem1"), Course("CSC101", "Computer Science", 2, "Sem1")]
+    grades = [
+        Grade("1", "ICT323", "A", "Sem1"),
+        Grade("1", "CSC101", "C", "Sem1"),
+        Grade("1", "MTH101", "F", "Sem1"),
+        Grade("2", "CSC101", "B", "Sem1"),
+    ]
+    credit_map = build_credit_map(courses)
+    assert calculate_semester_gpa(grades[:3], credit_map) == calculate_semester_gpa(grades[:3], courses) == 4.2
+    assert calculate_cgpa(grades[3:], credit_map) == calculate_cgpa(grades[3:], courses) == 4.0
+    assert calculate_all_cgpas(grades, credit_map) == {"1": 4.2, "2": 4.0}
+
+def test_semester_summary():
+    """Test the per-semester breakdown against the semester GPA and CGPA functions."""
+    courses = [Course("ICT323", "Intro to ICT", 3, "Sem1"), Course("CSC101", "Computer Science", 2, "Sem1")]
+    grades = [
+        Grade("1", "ICT323", "A", "Sem2"),
+        Grade("1", "CSC101", "F", "Sem2"),
+        Grade("1", "ICT323", "C", "Sem1"),
+        Grade("1", "MTH101", "B", "Sem1"),
+    ]
+    summary = summarize_semesters(grades, courses)
+    assert [entry["semester"] for entry in summary] == ["Sem1", "Sem2"]
+    assert summary[0] == {"semester": "Sem1", "gpa": 3.0, "credits_attempted": 3, "credits_passed": 3, "cgpa": 3.0}
+    assert summary[1]["gpa"] == calculate_semester_gpa(grades[:2], courses) == 3.0
+    assert (summary[1]["credits_attempted"], summary[1]["credits_passed"]) == (5, 3)
+    assert summary[1]["cgpa"] == calculate_cgpa(grades, courses)
+    assert summarize_semesters([], courses) == []
+
 if __name__ == "__main__":
     test_data_loading()
     test_gpa_calculation()
     test_validation()
+    test_credit_map()
+    test_semester_summary()
     print("Basic tests completed.")
@@ -0,0 +1,122 @@
+"""
+Test the report renderer and batch PDF report generation.
+"""
+
+import os
+import tempfile
+import io
+import multiprocessing
+import threading
+from src.batch_reports import (build_jobs, run_report_jobs, generate_cohort_reports, generate_combined_report,
+                               report_path)
+from src.pdf_report import ReportRenderer
+from src.repository import Repository
+from src.student import Student
+from src.course import Course
+from src.grade import Grade
+
+def make_repository():
+    """Builds a repository with students in two departments and one without a department."""
+    students = [
+        Student("1", "Ada", "ada@example.com", "Computer Science"),
+        Student("2", "Ben", "ben@example.com", "Computer Science"),
+        Student("3", "Cy", "cy@example.com", "Mathematics"),
+        Student("4", "Di", "di@example.com"),
+    ]
+    courses = [Course("ICT323", "Intro to ICT", 3, "Sem1"), Course("MTH101", "Calculus", 2, "Sem1")]
+    grades = [Grade(s.student_id, c.code, "B", "Sem1") for s in students for c in courses]
+    return Repository(students, courses, grades)
+
+def test_report_renderer():
+    """Test that one renderer writes reports to memory and skips grades of unknown courses."""
+    repo = make_repository()
+    renderer = ReportRenderer(repo.courses)
+    grades = repo.grades_for_student("1") + [Grade("1", "NOPE", "A", "Sem1")]
+    assert [row[0] for row in renderer.grade_rows(grades)] == ["ICT323", "MTH101"]
+    first = renderer.render_bytes(repo.get_student("1"), grades)
+    second = renderer.render_bytes(repo.get_student("2"), repo.grades_for_student("2"), cgpa=4.0)
+    assert first.startswith(b"%PDF") and second.startswith(b"%PDF")
+
+def test_cohort_reports_and_resume():
+    """Test per-department output, progress reporting and resuming after a partial run."""
+    repo = make_repository()
+    with tempfile.TemporaryDirectory() as tmp:
+        calls = []
+        result = generate_cohort_reports(repo, tmp, student_ids=["1", "3"], workers=2,
+                                         progress=lambda done, total: calls.append((done, total)))
+        assert sorted(result.generated) == ["1", "3"] and not result.failed
+        assert calls[-1] == (2, 2)
+
+        result = generate_cohort_reports(repo, tmp, workers=2)
+        assert sorted(result.skipped) == ["1", "3"]
+        assert sorted(result.generated) == ["2", "4"]
+        for student in repo.students:
+            path = report_path(tmp, student)
+            assert os.path.getsize(path) > 0
+            assert not os.path.exists(path + ".part")
+        assert os.path.isfile(os.path.join(tmp, "Computer_Science", "1.pdf"))
+        assert os.path.isfile(os.path.join(tmp, "Unassigned", "4.pdf"))
+
+def test_snapshot_jobs_in_spawned_workers():
+    """Test that jobs snapshot the repository, render in spawned workers and stop when cancelled."""
+    repo = make_repository()
+    with tempfile.TemporaryDirectory() as tmp:
+        jobs, skipped = build_jobs(repo, tmp, student_ids=["1", "2"])
+        repo.remove_student(repo.get_student("2"))  # Edits after the snapshot do not affect the run
+        result = run_report_jobs(tmp, jobs, skipped, workers=1, mp_context=multiprocessing.get_context("spawn"))
+        assert sorted(result.generated) == ["1", "2"] and not result.failed
+
+        cancel = threading.Event()
+        cancel.set()
+        jobs, skipped = build_jobs(repo, tmp)
+        result = run_report_jobs(tmp, jobs, skipped, workers=1, cancel=cancel)
+        assert sorted(result.skipped) == ["1"] and not result.generated
+        assert sorted(result.cancelled) == ["3", "4"] and "Cancelled" in str(result)
+        assert not os.path.exists(report_path(tmp, repo.get_student("3")))
+
+def test_report_names_do_not_collide():
+    """Test that IDs that clean up to the same name get distinct files, and true clashes fail."""
+    students = [Student("12/3", "Ada", "ada@example.com"), Student("12 3", "Ben", "ben@example.com"),
+                Student("12_3", "Cy", "cy@example.com")]
+    repo = Repository(students, [], [])
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = {report_path(tmp, student) for student in students}
+        assert len(paths) == 3 and report_path(tmp, students[2]).endswith("12_3.pdf")
+        result = generate_cohort_reports(repo, tmp, workers=1)
+        assert sorted(result.generated) == ["12 3", "12/3", "12_3"]
+
+        repo = Repository([Student("AB", "Ada", "ada@example.com"), Student("ab", "Ben", "ben@example.com")], [], [])
+        try:
+            build_jobs(repo, tmp)
+            assert False, "IDs differing only in case should be rejected"
+        except ValueError as e:
+            assert "AB" in str(e) and "ab" in str(e)
+
+def test_resume_regenerates_changed_reports():
+    """Test that resuming skips only reports rendered from the student's current data."""
+    repo = make_repository()
+    with tempfile.TemporaryDirectory() as tmp:
+        generate_cohort_reports(repo, tmp, workers=1)
+        repo.add_grade(Grade("2", "ICT323", "A", "Sem2"))
+        result = generate_cohort_reports(repo, tmp, workers=1)
+        assert result.generated == ["2"] and sorted(result.skipped) == ["1", "3", "4"]
+        assert sorted(generate_cohort_reports(repo, tmp, workers=1, resume=False).generated) == ["1", "2", "3", "4"]
+
+def test_combined_report():
+    """Test that a combined report lists each selected student once, in order, after the contents."""
+    repo = make_repository()
+    repo.add_grade(Grade("2", "ICT323", "A", "Sem2"))
+    output = io.BytesIO()
+    contents = generate_combined_report(repo, output, department="Computer Science")
+    assert [label for label, _ in contents] == ["1 - Ada", "2 - Ben"]
+    assert 1 < contents[0][1] < contents[1][1]
+    assert output.getvalue().startswith(b"%PDF")
+
+if __name__ == "__main__":
+    test_report_renderer()
+    test_cohort_reports_and_resume()
+    test_snapshot_jobs_in_spawned_workers()
+    test_report_names_do_not_collide()
+    test_resume_regenerates_changed_reports()
+    test_combined_report()
+    print("Batch report tests completed.")
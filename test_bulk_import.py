@@ -0,0 +1,135 @@
+"""
+Test bulk import of result sheets.
+"""
+
+import csv
+import os
+import tempfile
+import time
+from src.bulk_import import import_grade_sheet
+from src.repository import Repository
+from src.student import Student
+from src.course import Course
+from src.grade import Grade
+
+def make_repository(num_students=3):
+    """Builds a repository with students 0..n-1, two courses and one existing grade."""
+    students = [Student(str(i), f"Student {i}", f"s{i}@example.com") for i in range(num_students)]
+    courses = [Course("ICT323", "Intro to ICT", 3, "Sem1"), Course("CSC101", "Computer Science", 2, "Sem1")]
+    return Repository(students, courses, [Grade("0", "ICT323", "A", "Sem1")])
+
+def write_csv(path, header, rows):
+    """Writes a CSV result sheet."""
+    with open(path, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(header)
+        writer.writerows(rows)
+
+def test_import_reports_all_rejects():
+    """Test that valid rows are added and every bad row is reported."""
+    repo = make_repository()
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "results.csv")
+        write_csv(path, ["Student ID", "Grade"], [
+            ["1", "b"],   # ok
+            ["2", "G"],   # invalid grade
+            ["9", "A"],   # unknown student
+            ["0", "C"],   # already graded
+            ["1", "A"],   # duplicate within sheet
+            ["", ""],     # blank line, skipped
+            ["2", "F"],   # ok
+        ])
+        result = import_grade_sheet(path, repo, course_code="ICT323", semester="Sem1")
+
+    assert [(g.student_id, g.grade) for g in result.accepted] == [("1", "B"), ("2", "F")]
+    assert [row for row, _ in result.rejects] == [3, 4, 5, 6]
+    assert repo.count_grades() == 3
+    assert len(repo.pop_changes()["grades"]) == 2
+
+def test_import_xlsx_all_or_nothing():
+    """Test XLSX sheets and the all-or-nothing mode."""
+    from openpyxl import Workbook
+    repo = make_repository()
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "results.xlsx")
+        workbook = Workbook()
+        sheet = workbook.active
+        sheet.append(["student_id", "course_code", "grade", "semester"])
+        sheet.append([1, "CSC101", "A", "Sem1"])
+        sheet.append([2, "NOPE", "A", "Sem1"])
+        workbook.save(path)
+
+        result = import_grade_sheet(path, repo, all_or_nothing=True)
+        assert result.accepted == [] and len(result.rejects) == 1
+        assert repo.count_grades() == 1
+
+        result = import_grade_sheet(path, repo)
+        assert [g.student_id for g in result.accepted] == ["1"]
+
+def test_import_100k_rows():
+    """Test that a 100k-row sheet imports in a few seconds."""
+    repo = make_repository(num_students=50000)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "results.csv")
+        write_csv(path, ["student_id", "course_code", "grade", "semester"],
+                  ([str(i % 50000), ("ICT323", "CSC101")[i // 50000], "ABCDEF"[i % 6], "Sem2"] for i in range(100000)))
+        start = time.perf_counter()
+        result = import_grade_sheet(path, repo)
+        elapsed = time.perf_counter() - start
+    assert len(result.accepted) == 100000 and not result.rejects
+    assert elapsed < 10, f"import took {elapsed:.1f}s"
+
+def test_import_checks_header():
+    """Test BOM-prefixed CSVs, up-front column checks and ignored columns."""
+    repo = make_repository()
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "results.csv")
+        with open(path, "w", newline="", encoding="utf-8-sig") as f:  # Excel's "CSV UTF-8"
+            f.write("Student ID,Name,Grade\r\n1,Student 1,A\r\n")
+        result = import_grade_sheet(path, repo, course_code="ICT323", semester="Sem1")
+        assert [g.student_id for g in result.accepted] == ["1"] and not result.rejects
+        assert result.ignored_columns == ["name"] and "Ignored columns: name" in str(result)
+
+        write_csv(path, ["Student ID", "Grade"], [["2", "A"]])
+        try:
+            import_grade_sheet(path, repo)
+            assert False, "A sheet without course and semester columns needs defaults"
+        except ValueError as e:
+            assert "course_code, semester" in str(e)
+    assert repo.count_grades() == 2
+
+def test_import_numeric_cells_and_bad_files():
+    """Test numeric XLSX IDs, and that unreadable sheets raise ValueError."""
+    from openpyxl import Workbook
+    students = [Student("00123", "Ada", "ada@example.com"), Student("7", "Ben", "ben@example.com")]
+    repo = Repository(students, [Course("ICT323", "Intro to ICT", 3, "Sem1")], [])
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "results.xlsx")
+        workbook = Workbook()
+        sheet = workbook.active
+        sheet.append(["student_id", "course_code", "grade", "semester"])
+        sheet.append([123, "ICT323", "A", "Sem1"])
+        sheet["A2"].number_format = "00000"  # How Excel keeps the leading zeros of a numeric ID
+        sheet.append([7.0, "ICT323", "B", "Sem1"])
+        workbook.save(path)
+        result = import_grade_sheet(path, repo)
+        assert [g.student_id for g in result.accepted] == ["00123", "7"] and not result.rejects
+
+        with open(path, "wb") as f:
+            f.write(b"not a workbook")
+        csv_path = os.path.join(tmp, "results.csv")
+        write_csv(csv_path, ["student_id", "course_code", "grade", "semester"], [["7", "x" * 200000, "A", "Sem1"]])
+        for bad in (path, csv_path):
+            try:
+                import_grade_sheet(bad, repo)
+                assert False, f"{bad} should raise ValueError"
+            except ValueError as e:
+                assert "Could not read" in str(e)
+
+if __name__ == "__main__":
+    test_import_reports_all_rejects()
+    test_import_xlsx_all_or_nothing()
+    test_import_100k_rows()
+    test_import_checks_header()
+    test_import_numeric_cells_and_bad_files()
+    print("Bulk import tests completed.")
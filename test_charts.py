@@ -0,0 +1,139 @@
+"""
+Test headless chart rendering.
+"""
+
+import io
+import os
+import tempfile
+import threading
+from matplotlib.figure import Figure
+from src.chart_cache import ChartCache
+from src import storage
+from src.chart_export import export_charts, build_payloads, build_frame_payloads, export_payloads, chart_paths
+from src.repository import Repository
+from src.student import Student
+from src.charts import (plot_gpa_trend, plot_gpa_series, plot_grade_distribution, plot_cgpa_histogram,
+                        plot_course_grade_heatmap, plot_semester_percentile_bands)
+from src.gpa_engine import EncodedGrades, cgpa_values, course_grade_counts, semester_percentiles
+from src.course import Course
+from src.grade import Grade
+
+COURSES = [Course("ICT323", "Intro to ICT", 3, "Sem1"), Course("CSC101", "Computer Science", 2, "Sem1")]
+GRADES = [
+    Grade("1", "ICT323", "A", "Sem1"),
+    Grade("1", "CSC101", "C", "Sem1"),
+    Grade("1", "ICT323", "B", "Sem2"),
+]
+
+def test_charts_return_figures():
+    """Test that charts are returned as Figures with the expected data."""
+    fig = plot_gpa_trend(GRADES, "Ada", COURSES)
+    assert isinstance(fig, Figure)
+    line = fig.axes[0].lines[0]
+    assert list(line.get_ydata()) == [4.2, 4.0]
+    assert [bar.get_height() for bar in plot_grade_distribution(GRADES, "Ada").axes[0].patches] == [1, 1, 1, 0, 0, 0]
+    assert fig.axes[0].get_title() == plot_gpa_series([], "Ada").axes[0].get_title()
+
+def test_cohort_charts():
+    """Test that the cohort charts draw the engine's statistics."""
+    encoded = EncodedGrades.from_grades(GRADES + [Grade("2", "CSC101", "B", "Sem1")], COURSES)
+    histogram = plot_cgpa_histogram(cgpa_values(encoded))
+    assert sum(patch.get_height() for patch in histogram.axes[0].patches) == 2
+    heatmap = plot_course_grade_heatmap(*course_grade_counts(encoded))
+    assert heatmap.axes[0].images[0].get_array().shape == (2, 6)
+    bands = plot_semester_percentile_bands(*semester_percentiles(encoded))
+    assert list(bands.axes[0].lines[0].get_ydata()) == [4.1, 4.0]
+    empty = EncodedGrades.from_grades([], COURSES)
+    assert plot_cgpa_histogram(cgpa_values(empty)).axes[0].texts
+
+def test_render_in_threads():
+    """Test that charts can be rendered to PNG from several threads at once."""
+    results = []
+
+    def render():
+        buffer = io.BytesIO()
+        plot_grade_distribution(GRADES, "Ada").savefig(buffer, format="png")
+        results.append(buffer.getvalue())
+
+    threads = [threading.Thread(target=render) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(results) == 4 and all(png.startswith(b"\x89PNG") for png in results)
+
+def test_chart_cache():
+    """Test version checks, LRU eviction and the byte budget."""
+    cache = ChartCache(max_bytes=10)
+    renders = []
+
+    def render(data):
+        renders.append(data)
+        return data
+
+    assert cache.get_or_render("1", "gpa_trend", 1, lambda: render(b"aaaa")) == b"aaaa"
+    assert cache.get_or_render("1", "gpa_trend", 1, lambda: render(b"xxxx")) == b"aaaa"
+    assert cache.get("1", "gpa_trend", 2) is None
+    assert cache.get_or_render("1", "gpa_trend", 2, lambda: render(b"bbbb")) == b"bbbb"
+    assert len(cache) == 1 and cache.nbytes == 4
+
+    cache.put("2", "gpa_trend", 1, b"cccc")
+    cache.get("1", "gpa_trend", 2)  # 1 is now more recent than 2
+    cache.put("3", "gpa_trend", 1, b"dddd")
+    assert cache.get("2", "gpa_trend", 1) is None and cache.get("1", "gpa_trend", 2) == b"bbbb"
+    assert cache.nbytes == 8 <= cache.max_bytes
+    cache.put("4", "gpa_trend", 1, b"too large for the budget")
+    assert cache.get("4", "gpa_trend", 1) is None
+    assert renders == [b"aaaa", b"bbbb"] and (cache.hits, cache.misses) == (3, 5)
+
+def test_bulk_export_skips_unchanged():
+    """Test that a second export only re-renders students whose chart data changed."""
+    students = [Student("1", "Ada", "ada@example.com"), Student("2", "Ben", "ben@example.com")]
+    repo = Repository(students, COURSES, GRADES + [Grade("2", "CSC101", "B", "Sem1")])
+    with tempfile.TemporaryDirectory() as tmp:
+        result = export_charts(repo, tmp, formats=("png", "svg"), workers=2)
+        assert sorted(result.generated) == ["1", "2"] and not result.failed
+        assert all(os.path.getsize(path) > 0 for path in chart_paths(tmp, "1", ("png", "svg")))
+
+        repo.add_grade(Grade("2", "ICT323", "A", "Sem2"))
+        result = export_charts(repo, tmp, formats=("png", "svg"), workers=2)
+        assert result.generated == ["2"] and result.skipped == ["1"]
+
+        assert chart_paths(tmp, "12/3", ("png",)) != chart_paths(tmp, "12 3", ("png",))
+        os.remove(chart_paths(tmp, "1", ("png",))[0])
+        assert export_charts(repo, tmp, formats=("png", "svg"), workers=1).generated == ["1"]
+
+def test_bulk_export_cancel():
+    """Test that a cancelled export starts no students and keeps the manifest of earlier runs."""
+    students = [Student("1", "Ada", "ada@example.com"), Student("2", "Ben", "ben@example.com")]
+    repo = Repository(students, COURSES, GRADES)
+    with tempfile.TemporaryDirectory() as tmp:
+        assert export_payloads(build_payloads(repo, ["1"]), tmp, workers=1).generated == ["1"]
+        cancel = threading.Event()
+        cancel.set()
+        result = export_payloads(build_payloads(repo), tmp, workers=1, cancel=cancel)
+        assert result.skipped == ["1"] and result.cancelled == ["2"] and not result.generated
+        assert not os.path.exists(chart_paths(tmp, "2", ("png",))[0])
+
+def test_frame_payloads_match_repository():
+    """Test that payloads built from the grade frame equal those built from a Repository."""
+    students = [Student("1", "Ada", "ada@example.com"), Student("2", "Ben", "ben@example.com"),
+                Student("3", "Cy", "cy@example.com")]
+    grades = GRADES + [Grade("2", "CSC101", "b", "Sem1"), Grade("2", "NOPE", "A", "Sem1")]
+    repo = Repository(students, COURSES, grades)
+    with tempfile.TemporaryDirectory() as tmp:
+        storage.save_courses(COURSES, tmp)
+        storage.save_grades(grades, tmp)
+        frames = storage.load_grades_frame(tmp), storage.load_courses_frame(tmp)
+    assert build_frame_payloads(students, *frames) == build_payloads(repo)
+    assert build_frame_payloads(students, *frames, student_ids=["2"]) == build_payloads(repo, ["2"])
+
+if __name__ == "__main__":
+    test_charts_return_figures()
+    test_cohort_charts()
+    test_render_in_threads()
+    test_chart_cache()
+    test_bulk_export_skips_unchanged()
+    test_bulk_export_cancel()
+    test_frame_payloads_match_repository()
+    print("Chart tests completed.")
@@ -0,0 +1,101 @@
+"""
+Test the vectorized cohort GPA engine against the per-student calculator.
+"""
+
+import random
+import numpy as np
+from src.course import Course
+from src.grade import Grade
+from src.gpa_calculator import calculate_semester_gpa, calculate_cgpa
+from src.gpa_engine import (EncodedGrades, compute_cohort_gpas, compute_semester_gpas, compute_cgpas,
+                            cgpa_values, course_grade_counts, semester_percentiles)
+from src.grade_table import GradeTable
+
+def make_cohort(num_students=200, seed=7):
+    """Builds random courses and grades, including grades for an unknown course."""
+    rng = random.Random(seed)
+    courses = [Course(f"C{i}", f"Course {i}", rng.randint(1, 6), "Sem1") for i in range(30)]
+    codes = [c.code for c in courses] + ["UNKNOWN"]
+    semesters = [f"2023/2024 Semester {i}" for i in (1, 2)] + ["2024/2025 Semester 1"]
+    grades = []
+    for s in range(num_students):
+        for _ in range(rng.randint(0, 15)):
+            grades.append(Grade(str(s), rng.choice(codes), rng.choice(Grade.VALID_GRADES), rng.choice(semesters)))
+    return courses, grades
+
+def test_matches_calculator():
+    """Test that every semester GPA and CGPA matches the reference functions."""
+    courses, grades = make_cohort()
+    semester_gpas, cgpas = compute_cohort_gpas(grades, courses)
+
+    by_student = {}
+    for grade in grades:
+        by_student.setdefault(grade.student_id, []).append(grade)
+
+    assert set(cgpas) == set(by_student)
+    for student_id, student_grades in by_student.items():
+        assert cgpas[student_id] == calculate_cgpa(student_grades, courses)
+        semesters = {g.semester for g in student_grades}
+        for semester in semesters:
+            expected = calculate_semester_gpa([g for g in student_grades if g.semester == semester], courses)
+            assert semester_gpas[(student_id, semester)] == expected
+
+def test_unknown_courses_only():
+    """Test that a student whose grades have no known course gets 0.0."""
+    encoded = EncodedGrades.from_columns(["1"], ["NOPE"], ["a"], ["Sem1"], {})
+    assert compute_semester_gpas(encoded) == {("1", "Sem1"): 0.0}
+    assert compute_cohort_gpas([], []) == ({}, {})
+
+def test_grade_table():
+    """Test GradeTable row views and encoding straight from its columns."""
+    courses, grades = make_cohort(num_students=50)
+    table = GradeTable.from_grades(grades)
+    assert len(table) == len(grades)
+    for row, grade in zip(table, grades):
+        assert isinstance(row, Grade)
+        assert row.to_dict() == grade.to_dict()
+        assert row.get_points() == grade.get_points()
+    table[0].grade = "f"
+    assert table[0].grade == "F" and table[0].validate()
+
+    grades[0] = Grade(grades[0].student_id, grades[0].course_code, "F", grades[0].semester)
+    assert compute_cgpas(EncodedGrades.from_table(table, courses)) == compute_cohort_gpas(grades, courses)[1]
+    assert compute_semester_gpas(EncodedGrades.from_table(table, courses)) == compute_cohort_gpas(grades, courses)[0]
+
+def test_cohort_statistics():
+    """Test the vectorized cohort statistics against per-group Python computations."""
+    courses, grades = make_cohort()
+    encoded = EncodedGrades.from_grades(grades, courses)
+    credit_map = {c.code: c.credit_units for c in courses}
+
+    def average(group):
+        credits = sum(credit_map.get(g.course_code, 0) for g in group)
+        return sum(g.get_points() * credit_map.get(g.course_code, 0) for g in group) / credits if credits else None
+
+    by_student, by_pair = {}, {}
+    for grade in grades:
+        by_student.setdefault(grade.student_id, []).append(grade)
+        by_pair.setdefault((grade.student_id, grade.semester), []).append(grade)
+
+    expected = sorted(v for v in map(average, by_student.values()) if v is not None)
+    assert np.allclose(np.sort(cgpa_values(encoded)), expected)
+
+    codes, counts = course_grade_counts(encoded)
+    assert codes == sorted({g.course_code for g in grades})
+    row = codes.index("C3")
+    assert counts[row].tolist() == [sum(1 for g in grades if g.course_code == "C3" and g.grade == letter)
+                                    for letter in Grade.VALID_GRADES]
+
+    semesters, values = semester_percentiles(encoded, (0, 25, 50, 90, 100))
+    assert semesters == sorted({g.semester for g in grades})
+    for semester, row in zip(semesters, values):
+        gpas = [v for (_, sem), group in by_pair.items() if sem == semester
+                for v in [average(group)] if v is not None]
+        assert np.allclose(row, np.percentile(gpas, (0, 25, 50, 90, 100)))
+
+if __name__ == "__main__":
+    test_matches_calculator()
+    test_unknown_courses_only()
+    test_grade_table()
+    test_cohort_statistics()
+    print("GPA engine tests completed.")
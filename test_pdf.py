@@ -2,6 +2,8 @@
 Test PDF generation.
 """
 
+import os
+import tempfile
 from src.student import Student
 from src.grade import Grade
 from src.course import Course
@@ -18,5 +20,6 @@ courses = [
     Course("CSC101", "Computer Science", 3, "2023/2024 Semester 1")
 ]
 
-generate_student_report(student, grades, courses, "test_report.pdf")
+with tempfile.TemporaryDirectory() as tmp:
+    generate_student_report(student, grades, courses, os.path.join(tmp, "test_report.pdf"))
 print("PDF test completed.")
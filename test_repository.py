@@ -0,0 +1,150 @@
+"""
+Test the indexed in-memory repository.
+"""
+
+from src.repository import Repository
+from src.student import Student
+from src.course import Course
+from src.grade import Grade
+from src.gpa_calculator import calculate_semester_gpa, calculate_cgpa
+
+def assert_aggregates_match(repo):
+    """Checks the running GPA totals against a full recalculation."""
+    for student_id in {g.student_id for g in repo.grades} | {"1", "2"}:
+        grades = repo.grades_for_student(student_id)
+        assert repo.aggregates.cgpa(student_id) == calculate_cgpa(grades, repo.courses)
+        expected = [(sem, calculate_semester_gpa(repo.grades_for_student_semester(student_id, sem), repo.courses))
+                    for sem in repo.semesters_for_student(student_id)]
+        assert repo.aggregates.semester_gpas(student_id) == expected
+
+def make_repository():
+    """Builds a small repository for the tests."""
+    students = [Student("1", "Ada", "ada@example.com"), Student("2", "Bola", "bola@example.com")]
+    courses = [Course("ICT323", "Intro to ICT", 3, "Sem1"), Course("CSC101", "Computer Science", 2, "Sem1")]
+    grades = [
+        Grade("1", "ICT323", "A", "Sem1"),
+        Grade("1", "CSC101", "B", "Sem1"),
+        Grade("1", "ICT323", "C", "Sem2"),
+        Grade("2", "CSC101", "F", "Sem1"),
+    ]
+    return Repository(students, courses, grades)
+
+def test_lookups():
+    """Test indexed lookups."""
+    repo = make_repository()
+    assert repo.get_student("2").name == "Bola"
+    assert repo.get_course("CSC101").credit_units == 2
+    assert repo.has_grade("1", "ICT323", "Sem2")
+    assert len(repo.grades_for_student("1")) == 3
+    assert len(repo.grades_for_student_semester("1", "Sem1")) == 2
+    assert repo.semesters_for_student("1") == ["Sem1", "Sem2"]
+    assert len(repo.grades_for_course("CSC101")) == 2
+
+def test_mutations_keep_indexes():
+    """Test that add, update and delete keep every index correct."""
+    repo = make_repository()
+    repo.add_grade(Grade("2", "ICT323", "B", "Sem2"))
+    assert repo.semesters_for_student("2") == ["Sem1", "Sem2"]
+
+    old = repo.get_grade("1", "ICT323", "Sem2")
+    repo.update_grade(old, Grade("1", "ICT323", "B", "Sem3"))
+    assert not repo.has_grade("1", "ICT323", "Sem2")
+    assert repo.grades_for_student_semester("1", "Sem3")[0].grade == "B"
+
+    removed = repo.remove_course(repo.get_course("ICT323"))
+    assert len(removed) == 3
+    assert repo.grades_for_course("ICT323") == []
+    assert repo.semesters_for_student("2") == ["Sem1"]
+    assert repo.count_grades() == 2
+
+    repo.update_student(repo.get_student("1"), Student("9", "Ada", "ada@example.com"))
+    assert [s.student_id for s in repo.students] == ["9", "2"]
+
+def test_duplicates_rejected():
+    """Test that duplicate keys raise ValueError."""
+    repo = make_repository()
+    for action in (lambda: repo.add_student(Student("1", "X", "x@example.com")),
+                   lambda: repo.add_course(Course("ICT323", "X", 1, "Sem1")),
+                   lambda: repo.add_grade(Grade("1", "ICT323", "B", "Sem1"))):
+        try:
+            action()
+            assert False, "duplicate should raise ValueError"
+        except ValueError:
+            pass
+
+def test_aggregates_follow_changes():
+    """Test that running GPA totals stay correct through grade and course changes."""
+    repo = make_repository()
+    assert_aggregates_match(repo)
+
+    repo.add_grade(Grade("2", "MTH101", "A", "Sem2"))
+    assert_aggregates_match(repo)
+    repo.add_course(Course("MTH101", "Mathematics", 4, "Sem2"))
+    assert_aggregates_match(repo)
+
+    repo.update_course(repo.get_course("ICT323"), Course("ICT323", "Intro to ICT", 6, "Sem1"))
+    assert_aggregates_match(repo)
+    repo.update_course(repo.get_course("CSC101"), Course("CSC102", "Computer Science", 2, "Sem1"))
+    assert_aggregates_match(repo)
+
+    repo.update_grade(repo.get_grade("1", "ICT323", "Sem1"), Grade("1", "ICT323", "E", "Sem1"))
+    assert_aggregates_match(repo)
+    repo.remove_course(repo.get_course("ICT323"))
+    assert_aggregates_match(repo)
+    repo.remove_grade(repo.get_grade("2", "MTH101", "Sem2"))
+    assert_aggregates_match(repo)
+    assert repo.aggregates.semester_gpas("2") == [("Sem1", 0.0)]
+
+def test_student_versions():
+    """Test that a student's version changes only with their own data."""
+    repo = make_repository()
+    v1, v2 = repo.student_version("1"), repo.student_version("2")
+
+    repo.add_grade(Grade("2", "ICT323", "B", "Sem2"))
+    assert repo.student_version("1") == v1 and repo.student_version("2") > v2
+    v2 = repo.student_version("2")
+
+    repo.update_course(repo.get_course("ICT323"), Course("ICT323", "Intro to ICT", 4, "Sem1"))
+    assert repo.student_version("1") > v1 and repo.student_version("2") > v2
+    v1 = repo.student_version("1")
+
+    repo.update_course(repo.get_course("ICT323"), Course("ICT323", "ICT Basics", 4, "Sem1"))
+    assert repo.student_version("1") == v1  # Same code and credits leave the GPA totals alone
+
+    repo.update_student(repo.get_student("1"), Student("1", "Ada L.", "ada@example.com"))
+    assert repo.student_version("1") > v1
+
+def test_search_follows_changes():
+    """Test that the search indexes match like the old substring scan and follow mutations."""
+    repo = make_repository()
+    repo.add_student(Student("10", "Adaeze Okafor", "adaeze@example.com"))
+    assert [s.student_id for s in repo.search_students("ADA")] == ["1", "10"]
+    assert [s.student_id for s in repo.search_students("adae")] == ["10"]  # Refines the previous result
+    assert [s.student_id for s in repo.search_students("1")] == ["1", "10"]
+    assert len(repo.search_students("")) == 3
+    assert len(repo.search_students("", limit=2)) == 2
+    assert [s.student_id for s in repo.search_students("a", limit=1)] == ["1"]
+    assert [s.student_id for s in repo.search_students("ADA", limit=1)] == ["1"]
+    assert [s.student_id for s in repo.search_students("adae", limit=5)] == ["10"]  # Not refined from a partial list
+
+    repo.update_student(repo.get_student("1"), Student("11", "Tunde", "tunde@example.com"))
+    assert [s.student_id for s in repo.search_students("1")] == ["11", "10"]  # Keeps its position
+    assert repo.search_students("ada")[0].student_id == "10"
+    repo.remove_student(repo.get_student("10"))
+    assert repo.search_students("okafor") == []
+
+    assert [c.code for c in repo.search_courses("sci")] == ["CSC101"]
+    repo.update_course(repo.get_course("CSC101"), Course("CSC102", "Data Science", 2, "Sem1"))
+    repo.add_course(Course("MTH101", "Mathematics", 3, "Sem1"))
+    assert [c.code for c in repo.search_courses("c")] == ["ICT323", "CSC102", "MTH101"]
+    repo.remove_course(repo.get_course("ICT323"))
+    assert [c.code for c in repo.search_courses("ict")] == []
+
+if __name__ == "__main__":
+    test_lookups()
+    test_mutations_keep_indexes()
+    test_duplicates_rejected()
+    test_aggregates_follow_changes()
+    test_student_versions()
+    test_search_follows_changes()
+    print("Repository tests completed.")
@@ -0,0 +1,99 @@
+"""
+Test that application startup stays fast by deferring the heavy modules.
+"""
+
+import os
+import queue
+import subprocess
+import sys
+import threading
+import time
+
+HEAVY_MODULES = ("numpy", "pandas", "matplotlib", "seaborn", "reportlab", "openpyxl")
+LAZY_MODULES = ("src.charts", "src.charts_window", "src.pdf_report", "src.pdf_export_dialog",
+                "matplotlib", "reportlab")
+LOGIN_BUDGET_SECONDS = 3.0  # Generous, so slow CI machines do not fail it
+
+def run_python(code, env=None):
+    """Runs code in a fresh interpreter from the repository root and returns its stdout."""
+    root = os.path.dirname(os.path.abspath(__file__))
+    completed = subprocess.run([sys.executable, "-c", code], cwd=root, capture_output=True, text=True,
+                               check=True, env=env)
+    return completed.stdout.strip()
+
+def test_startup_skips_heavy_modules():
+    """Test that importing main loads none of the chart, data frame or PDF libraries."""
+    loaded = run_python(f"import sys, main; print(','.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))")
+    assert loaded == "", f"loaded at startup: {loaded}"
+
+def test_login_within_budget():
+    """Test that importing main and building the login window fit in the budget (import only without a display)."""
+    code = (
+        "import time; start = time.perf_counter()\n"
+        "import main\n"
+        "if DISPLAY:\n"
+        "    app = main.App(); app.root.update()\n"
+        "print(time.perf_counter() - start)\n"
+    )
+    has_display = bool(os.environ.get("DISPLAY")) or sys.platform in ("win32", "darwin")
+    env = dict(os.environ, GRADE_PREWARM="0")
+    start = time.perf_counter()
+    elapsed = float(run_python(f"DISPLAY = {has_display}\n" + code, env))
+    assert elapsed < LOGIN_BUDGET_SECONDS, \
+        f"startup took {elapsed:.2f}s (process {time.perf_counter() - start:.2f}s)"
+
+def test_login_skips_chart_and_pdf_modules():
+    """Test that the chart and PDF modules are not loaded up to the login window (import only without a display)."""
+    code = (
+        "import sys\n"
+        "import main\n"
+        "if DISPLAY:\n"
+        "    app = main.App(); app.root.update()\n"
+        f"print(','.join(m for m in {LAZY_MODULES!r} if m in sys.modules))\n"
+    )
+    has_display = bool(os.environ.get("DISPLAY")) or sys.platform in ("win32", "darwin")
+    env = dict(os.environ, GRADE_PREWARM="0")
+    loaded = run_python(f"DISPLAY = {has_display}\n" + code, env)
+    assert loaded == "", f"loaded before login: {loaded}"
+
+def test_background_load_messages():
+    """Test that the loader thread posts progress messages and then the repository."""
+    import main
+    from src.sqlite_storage import SQLiteBackend
+    from src.student import Student
+
+    app = main.App.__new__(main.App)  # No Tk root needed for the loader itself
+    app.storage = SQLiteBackend(":memory:")
+    app.storage.conn.execute("INSERT INTO students (student_id, name, email) VALUES ('1', 'Ada', 'ada@example.com')")
+    app._load_queue = queue.Queue()
+    worker = threading.Thread(target=app._load_data)
+    worker.start()
+    worker.join()
+
+    messages = []
+    while not app._load_queue.empty():
+        messages.append(app._load_queue.get())
+    assert [kind for kind, _ in messages] == ["progress"] * 5 + ["done"]
+    repo = messages[-1][1]
+    assert repo.count_students() == 1
+
+    # The connection opened on this thread and used by the loader is still usable here
+    repo.add_student(Student("2", "Ben", "ben@example.com"))
+    app.storage.save(repo)
+    assert [s.student_id for s in app.storage.load_students()] == ["1", "2"]
+
+def test_prewarm_starts_once():
+    """Test that logging in again does not start another pre-warming thread."""
+    import main
+    app = main.App.__new__(main.App)
+    first = app.prewarm_imports()
+    assert app.prewarm_imports() is first
+    first.join()
+
+if __name__ == "__main__":
+    test_startup_skips_heavy_modules()
+    test_login_within_budget()
+    test_login_skips_chart_and_pdf_modules()
+    test_background_load_messages()
+    test_prewarm_starts_once()
+    print("Startup tests completed.")
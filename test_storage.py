@@ -0,0 +1,289 @@
+"""
+Test CSV persistence with the append-only journal.
+"""
+
+import os
+import tempfile
+from src import storage
+from src.repository import Repository
+from src.student import Student
+from src.course import Course
+from src.grade import Grade
+from src.gpa_calculator import calculate_semester_gpa, calculate_cgpa
+from src.sqlite_storage import migrate_csv_to_sqlite
+from src.autosave import AutoSaver
+from src.gpa_engine import EncodedGrades, compute_cohort_gpas, compute_semester_gpas, compute_cgpas
+
+def use_temp_data_dir(test):
+    """Runs a test with storage.DATA_DIR pointed at a temporary directory."""
+    def wrapper():
+        original = storage.DATA_DIR
+        with tempfile.TemporaryDirectory() as tmp:
+            storage.DATA_DIR = tmp
+            try:
+                test()
+            finally:
+                storage.DATA_DIR = original
+    wrapper.__name__ = test.__name__
+    wrapper.__doc__ = test.__doc__
+    return wrapper
+
+@use_temp_data_dir
+def test_journal_replay():
+    """Test that journaled changes are replayed on load."""
+    storage.save_students([Student("1", "Ada", "ada@example.com"), Student("2", "Bola", "bola@example.com")])
+    storage.save_courses([Course("ICT323", "Intro to ICT", 3, "Sem1")])
+    storage.save_grades([Grade("1", "ICT323", "A", "Sem1"), Grade("2", "ICT323", "B", "Sem1")])
+
+    repo = Repository(storage.load_students(), storage.load_courses(), storage.load_grades())
+    repo.update_student(repo.get_student("1"), Student("1", "Ada Lovelace", "ada@example.com"))
+    repo.add_student(Student("3", "Chidi", "chidi@example.com"))
+    repo.add_course(Course("CSC101", "Computer Science", 2, "Sem1"))
+    repo.add_grade(Grade("3", "CSC101", "C", "Sem1"))
+    repo.remove_course(repo.get_course("ICT323"))
+    for collection, changes in repo.pop_changes().items():
+        storage.append_journal(collection, changes)
+
+    students = storage.load_students()
+    assert [(s.student_id, s.name) for s in students] == [("1", "Ada Lovelace"), ("2", "Bola"), ("3", "Chidi")]
+    assert [c.code for c in storage.load_courses()] == ["CSC101"]
+    assert [(g.student_id, g.course_code) for g in storage.load_grades()] == [("3", "CSC101")]
+
+    storage.save_grades(storage.load_grades())
+    assert not os.path.exists(os.path.join(storage.DATA_DIR, "grades.journal.csv"))
+    assert len(storage.load_grades()) == 1
+
+@use_temp_data_dir
+def test_torn_journal_row_skipped():
+    """Test that a partially written journal row is ignored."""
+    storage.append_journal("grades", [("upsert", Grade("1", "ICT323", "A", "Sem1"))])
+    with open(os.path.join(storage.DATA_DIR, "grades.journal.csv"), "a") as f:
+        f.write("upsert,2,ICT323,B,Se")
+    assert [g.student_id for g in storage.load_grades()] == ["1"]
+
+@use_temp_data_dir
+def test_append_after_torn_row():
+    """Test that a change appended after a torn row is not merged into it and lost."""
+    storage.append_journal("grades", [("upsert", Grade("1", "ICT323", "A", "Sem1"))])
+    with open(os.path.join(storage.DATA_DIR, "grades.journal.csv"), "a") as f:
+        f.write("upsert,2,ICT323,B,Se")
+    storage.append_journal("grades", [("upsert", Grade("3", "ICT323", "C", "Sem1"))])
+    assert [g.student_id for g in storage.load_grades()] == ["1", "3"]
+
+    # A torn header is cut back to nothing and written afresh
+    with open(os.path.join(storage.DATA_DIR, "courses.journal.csv"), "w") as f:
+        f.write("op,co")
+    storage.append_journal("courses", [("upsert", Course("ICT323", "Intro to ICT", 3, "Sem1"))])
+    assert [c.code for c in storage.load_courses()] == ["ICT323"]
+
+@use_temp_data_dir
+def test_iter_grades():
+    """Test streaming grades with filters, journal replay and chunking."""
+    storage.save_grades([Grade(str(i % 5), f"C{i}", "ABCDEF"[i % 6], f"Sem{i % 2}") for i in range(50)])
+    storage.append_journal("grades", [("delete", Grade("0", "C0", "A", "Sem0")),
+                                      ("upsert", Grade("0", "C10", "F", "Sem0")),
+                                      ("upsert", Grade("0", "NEW", "B", "Sem0"))])
+    expected = [g for g in storage.load_grades() if g.student_id == "0" and g.semester == "Sem0"]
+    streamed = list(storage.iter_grades(student_id="0", semester="Sem0"))
+    assert [g.to_dict() for g in streamed] == [g.to_dict() for g in expected]
+    assert streamed[0].course_code == "C10" and streamed[0].grade == "F"
+    assert streamed[-1].course_code == "NEW"
+
+    passed = list(storage.iter_grades(predicate=lambda g: g.get_points() > 0))
+    assert all(g.grade != "F" for g in passed)
+    chunks = list(storage.iter_grade_chunks(chunk_size=20))
+    assert [len(c) for c in chunks] == [20, 20, 10]
+
+@use_temp_data_dir
+def test_frame_ingest():
+    """Test the pandas ingest path against the object loaders and the GPA engine."""
+    storage.save_courses([Course("ICT323", "Intro to ICT", 3, "Sem1"), Course("CSC101", "Computer Science", 2, "Sem1")])
+    storage.save_grades([Grade(str(i % 7), ("ICT323", "CSC101", "MTH101")[i % 3], "abcdef"[i % 6], f"Sem{i % 2}")
+                         for i in range(60)])
+    storage.append_journal("grades", [("delete", Grade("0", "ICT323", "A", "Sem0")),
+                                      ("upsert", Grade("1", "CSC101", "A", "Sem1")),
+                                      ("upsert", Grade("NA", "ICT323", "B", "Sem9"))])
+    storage.append_journal("courses", [("upsert", Course("MTH101", "Mathematics", 4, "Sem1"))])
+
+    frame = storage.load_grades_frame()
+    courses_frame = storage.load_courses_frame()
+    grades = storage.load_grades()
+    courses = storage.load_courses()
+    assert len(frame) == len(grades)
+    assert sorted(map(tuple, frame.astype(str).to_numpy().tolist())) == sorted(
+        tuple(g.to_dict().values()) for g in grades)
+
+    encoded = EncodedGrades.from_frame(frame, courses_frame)
+    assert (compute_semester_gpas(encoded), compute_cgpas(encoded)) == compute_cohort_gpas(grades, courses)
+
+    storage.save_courses([Course("BAD", "Bad", 9, "Sem1")])
+    try:
+        storage.load_courses_frame()
+        assert False, "credit units above 6 should raise ValueError"
+    except ValueError:
+        pass
+
+@use_temp_data_dir
+def test_sqlite_backend():
+    """Test CSV migration, per-record saves and SQL GPA aggregates."""
+    storage.save_students([Student("1", "Ada", "ada@example.com")])
+    storage.save_courses([Course("ICT323", "Intro to ICT", 3, "Sem1"), Course("CSC101", "Computer Science", 2, "Sem1")])
+    storage.save_grades([Grade("1", "ICT323", "A", "Sem1"), Grade("1", "CSC101", "C", "Sem2"),
+                         Grade("1", "MTH101", "B", "Sem2")])
+    db_path = os.path.join(storage.DATA_DIR, "grades.db")
+    assert migrate_csv_to_sqlite(db_path) == (1, 2, 3)
+
+    backend = storage.get_backend("sqlite", db_path)
+    try:
+        repo = Repository(backend.load_students(), backend.load_courses(), backend.load_grades())
+        repo.add_grade(Grade("1", "CSC101", "B", "Sem1"))
+        repo.update_course(repo.get_course("CSC101"), Course("CSC101", "Computer Science", 4, "Sem1"))
+        repo.remove_grade(repo.get_grade("1", "CSC101", "Sem2"))
+        backend.save(repo)
+
+        grades = backend.load_grades()
+        courses = backend.load_courses()
+        assert [(g.course_code, g.semester) for g in grades] == [("ICT323", "Sem1"), ("MTH101", "Sem2"), ("CSC101", "Sem1")]
+        assert backend.cgpa("1") == calculate_cgpa(grades, courses) == repo.aggregates.cgpa("1")
+        assert backend.semester_gpas("1") == [
+            ("Sem1", calculate_semester_gpa([grades[0], grades[2]], courses)), ("Sem2", 0.0)]
+        assert [g.course_code for g in backend.iter_grades(semester="Sem1")] == ["ICT323", "CSC101"]
+    finally:
+        backend.close()
+
+class ManualTimer:
+    """Stands in for a Tk widget: after() stores callbacks that the test fires by hand."""
+
+    def __init__(self):
+        self.jobs = {}
+
+    def after(self, ms, callback):
+        job = f"after#{len(self.jobs)}"
+        self.jobs[job] = callback
+        return job
+
+    def after_cancel(self, job):
+        self.jobs.pop(job, None)
+
+    def fire(self):
+        for job in list(self.jobs):
+            self.jobs.pop(job)()
+
+@use_temp_data_dir
+def test_autosave_coalesces_edits():
+    """Test that a burst of edits becomes one background write of the changed collection only."""
+    backend = storage.CSVBackend()
+    repo = Repository()
+    timer = ManualTimer()
+    saver = AutoSaver(timer, backend, repo)
+    for i in range(5):
+        repo.add_student(Student(str(i), f"Student {i}", f"s{i}@example.com"))
+        saver.schedule()
+    assert len(timer.jobs) == 1 and saver.pending
+
+    timer.fire()  # Quiet period over: starts the writer thread
+    saver._writer.join()
+    timer.fire()  # Collects the finished writer
+    assert saver.writes == 1 and not saver.pending
+    assert os.listdir(storage.DATA_DIR) == ["students.journal.csv"]
+    assert [s.student_id for s in backend.load_students()] == ["0", "1", "2", "3", "4"]
+
+    # A failed write keeps its changes; the next flush writes them with the newer ones
+    write_changes = backend.write_changes
+    backend.write_changes = lambda changes, records: 1 / 0
+    repo.add_course(Course("ICT323", "Intro to ICT", 3, "Sem1"))
+    saver.schedule()
+    try:
+        saver.flush()
+        assert False, "The failing write should raise"
+    except ZeroDivisionError:
+        pass
+    backend.write_changes = write_changes
+    repo.add_grade(Grade("1", "ICT323", "A", "Sem1"))
+    saver.flush()
+    assert [c.code for c in backend.load_courses()] == ["ICT323"] and len(backend.load_grades()) == 1
+    assert saver.last_error is None and not timer.jobs
+
+@use_temp_data_dir
+def test_autosave_failed_write_stays_pending():
+    """Test that a failed background write is reported, stays pending and is written later."""
+    backend = storage.CSVBackend()
+    repo = Repository()
+    timer = ManualTimer()
+    errors = []
+    saver = AutoSaver(timer, backend, repo, on_error=errors.append)
+    write_changes = backend.write_changes
+    backend.write_changes = lambda changes, records: 1 / 0
+
+    repo.add_student(Student("1", "Ada", "ada@example.com"))
+    saver.schedule()
+    timer.fire()
+    saver._writer.join()
+    timer.fire()
+    assert isinstance(errors[0], ZeroDivisionError)
+    assert saver.pending and not timer.jobs  # Nothing scheduled, but the changes are not lost
+
+    backend.write_changes = write_changes
+    saver.flush()
+    assert not saver.pending and [s.student_id for s in backend.load_students()] == ["1"]
+
+    repo.add_student(Student("2", "Ben", "ben@example.com"))
+    saver.schedule()
+    saver.discard()
+    assert not saver.pending and not repo.pop_changes()["students"]
+
+@use_temp_data_dir
+def test_snapshot_only_for_compaction():
+    """Test that a save copies a collection only once its journal is due for compaction."""
+    backend = storage.CSVBackend()
+    repo = Repository()
+    original = storage.JOURNAL_MAX_BYTES
+    storage.JOURNAL_MAX_BYTES = 200
+    try:
+        repo.add_student(Student("1", "Ada", "ada@example.com"))
+        changes, records = backend.take_changes(repo)
+        assert records == {}
+        backend.write_changes(changes, records)
+        for i in range(2, 6):
+            repo.add_student(Student(str(i), f"Student {i}", f"s{i}@example.com"))
+        backend.save(repo)  # Journal grows past the limit; compaction waits for the next save
+
+        repo.add_course(Course("ICT323", "Intro to ICT", 3, "Sem1"))
+        repo.add_student(Student("6", "Ben", "ben@example.com"))
+        changes, records = backend.take_changes(repo)
+        assert list(records) == ["students"] and len(records["students"]) == 6
+        backend.write_changes(changes, records)
+        assert not os.path.exists(os.path.join(storage.DATA_DIR, "students.journal.csv"))
+        assert [s.student_id for s in backend.load_students()] == ["1", "2", "3", "4", "5", "6"]
+    finally:
+        storage.JOURNAL_MAX_BYTES = original
+
+@use_temp_data_dir
+def test_autosave_flush_after_root_destroyed():
+    """Test that a save still scheduled when the Tk root is gone is written by flush."""
+    import tkinter as tk
+
+    class DestroyedTimer(ManualTimer):
+        def after_cancel(self, job):
+            raise tk.TclError("can't invoke \"after\" command: application has been destroyed")
+
+    backend = storage.CSVBackend()
+    repo = Repository()
+    saver = AutoSaver(DestroyedTimer(), backend, repo)
+    repo.add_student(Student("1", "Ada", "ada@example.com"))
+    saver.schedule()
+    saver.flush()
+    assert not saver.pending and [s.student_id for s in backend.load_students()] == ["1"]
+
+if __name__ == "__main__":
+    test_journal_replay()
+    test_torn_journal_row_skipped()
+    test_append_after_torn_row()
+    test_iter_grades()
+    test_frame_ingest()
+    test_sqlite_backend()
+    test_autosave_coalesces_edits()
+    test_autosave_failed_write_stays_pending()
+    test_snapshot_only_for_compaction()
+    test_autosave_flush_after_root_destroyed()
+    print("Storage tests completed.")
@@ -0,0 +1,63 @@
+"""
+Test the background task scheduler used by the GPA and chart windows.
+"""
+
+import threading
+import time
+from src.task_scheduler import TaskScheduler
+
+class FakeWidget:
+    """Stands in for a Tk widget: after() queues callbacks that the test runs."""
+
+    def __init__(self):
+        self.pending = []
+
+    def after(self, ms, callback):
+        self.pending.append(callback)
+
+    def run_until_idle(self, timeout=5):
+        deadline = time.time() + timeout
+        while self.pending and time.time() < deadline:
+            callback = self.pending.pop(0)
+            callback()
+            time.sleep(0.001)
+
+def test_superseded_results_are_dropped():
+    """Test that only the latest task per key is delivered, on the polling thread."""
+    widget = FakeWidget()
+    tasks = TaskScheduler(widget, max_workers=1)
+    release = threading.Event()
+    delivered = []
+
+    tasks.submit("charts", lambda: release.wait(5) and "old", delivered.append)
+    tasks.submit("charts", lambda: "queued", delivered.append)  # Cancelled before it starts
+    tasks.submit("charts", lambda: threading.current_thread().name, delivered.append)
+    tasks.submit("gpa", lambda: 3.5, delivered.append)
+    release.set()
+    widget.run_until_idle()
+
+    assert len(delivered) == 2 and 3.5 in delivered
+    assert [name for name in delivered if name != 3.5][0].startswith("ui-task")
+    tasks.shutdown()
+
+def test_errors_go_to_handler():
+    """Test that a failing task reports its exception to the error callback."""
+    widget = FakeWidget()
+    tasks = TaskScheduler(widget)
+    errors = []
+    tasks.submit("gpa", lambda: 1 / 0, lambda result: None, errors.append)
+    widget.run_until_idle()
+    assert isinstance(errors[0], ZeroDivisionError)
+
+    tasks.shutdown()
+    tasks.cancel("gpa")
+    try:
+        tasks.submit("gpa", lambda: 1, lambda result: None)
+        assert False, "Submitting after shutdown should fail"
+    except RuntimeError:
+        pass
+
+if __name__ == "__main__":
+    test_superseded_results_are_dropped()
+    test_errors_go_to_handler()
+    print("Task scheduler tests completed.")
@@ -0,0 +1,126 @@
+"""
+Test the row range computation and the card recycling of the virtualized card list.
+"""
+
+from src.virtual_list import VirtualCardList, visible_range
+
+class FakeCanvas:
+    """Stands in for the Tk canvas: records card positions and scrolls by setting top."""
+
+    def __init__(self, height):
+        self.height = height
+        self.top = 0
+        self.positions = {}
+        self.windows = 0
+
+    def winfo_height(self):
+        return self.height
+
+    def cget(self, option):
+        return self.height
+
+    def canvasy(self, y):
+        return self.top + y
+
+    def yview_moveto(self, fraction):
+        self.top = 0
+
+    def configure(self, **options):
+        pass
+
+    def create_window(self, x, y, **options):
+        self.windows += 1
+        self.positions[self.windows] = y
+        return self.windows
+
+    def coords(self, window, x, y):
+        self.positions[window] = y
+
+class FakeCard:
+    """Stands in for a card widget."""
+
+    def bind(self, sequence, func, add=None):
+        pass
+
+    def winfo_children(self):
+        return []
+
+def make_list(height=300, row_height=100, buffer=1):
+    """Builds a VirtualCardList on a fake canvas; returns it and the list of (card, item) binds."""
+    binds = []
+    cards = VirtualCardList.__new__(VirtualCardList)  # No Tk display is needed for the pool logic
+    cards.items = []
+    cards._positions = {}
+    cards.row_height = row_height
+    cards.buffer = buffer
+    cards._create_card = lambda parent: FakeCard()
+    cards._bind_card = lambda card, item: binds.append((card, item))
+    cards._pool = []
+    cards._width = 1
+    cards.canvas = FakeCanvas(height)
+    return cards, binds
+
+def bound_items(cards):
+    """Returns the items of the cards in view, in row order."""
+    return [card.item for _, card in sorted(cards._pool, key=lambda entry: entry[1].index or 0)
+            if card.index is not None]
+
+def test_visible_range():
+    """Test that only the rows in view plus the buffer are bound."""
+    assert visible_range(0, 400, 100, 20000, buffer=2) == (0, 7)
+    assert visible_range(1050, 400, 100, 20000, buffer=2) == (8, 17)
+    assert visible_range(1999950, 400, 100, 20000, buffer=2) == (19997, 20000)
+    assert visible_range(0, 400, 100, 3, buffer=2) == (0, 3)
+    assert visible_range(0, 400, 100, 0) == (0, 0)
+
+def test_cards_are_recycled():
+    """Test that scrolling re-binds the same pool of cards instead of creating new ones."""
+    cards, binds = make_list()
+    cards.set_items([f"row {i}" for i in range(1000)])
+    assert len(cards._pool) == 5 and bound_items(cards) == ["row 0", "row 1", "row 2", "row 3", "row 4"]
+
+    cards.canvas.top = 50000  # Mid-list the buffer applies above and below: six rows
+    cards.refresh()
+    pool = [card for _, card in cards._pool]
+    assert len(pool) == 6 and bound_items(cards)[0] == "row 499"
+    assert cards.canvas.positions[cards._pool[0][0]] == 499 * 100 + 5
+
+    cards.canvas.top = 90000
+    cards.refresh()
+    assert [card for _, card in cards._pool] == pool and cards.canvas.windows == 6
+    assert bound_items(cards) == [f"row {i}" for i in range(899, 905)]
+
+    binds.clear()
+    cards.refresh()
+    assert binds == []  # Cards already showing their rows are left alone
+
+def test_replace_and_remove_items():
+    """Test that updates re-bind only the changed card and removals shift the rows below."""
+    cards, binds = make_list()
+    items = [[i] for i in range(10)]  # Distinct objects; the list finds records by identity
+    cards.set_items(items)
+    binds.clear()
+
+    new_item = [2]
+    cards.replace_item(items[2], new_item)
+    assert [item for _, item in binds] == [new_item] and cards.items[2] is new_item
+    cards.replace_item(items[2], [99])  # No longer in the list
+    assert len(binds) == 1 and cards._index_of(new_item) == 2
+
+    cards.remove_item(items[0])
+    assert cards.items[:3] == [[1], [2], [3]] and bound_items(cards)[0] is items[1]
+    assert cards._index_of(items[9]) == 8 and cards._index_of(items[0]) is None
+    cards.remove_item(items[0])
+    assert len(cards.items) == 9
+
+    appended = [10]
+    cards.append_item(appended)
+    assert cards._index_of(appended) == 9
+    cards.remove_item(new_item)
+    assert [cards._index_of(item) for item in cards.items] == list(range(9))
+
+if __name__ == "__main__":
+    test_visible_range()
+    test_cards_are_recycled()
+    test_replace_and_remove_items()
+    print("Virtual list tests completed.")